@@ -0,0 +1,99 @@
+"""
+Concurrent-request throughput benchmark for the hot read endpoints.
+
+Run the same app twice with the same worker count and point this script at
+each one, e.g. with 2 workers:
+
+    # sync stack (current production setup)
+    gunicorn quivix_internships.wsgi:application -w 2 -b 127.0.0.1:8001
+
+    # async stack
+    ASYNC_READ_VIEWS=True gunicorn quivix_internships.asgi:application \
+        -k uvicorn_worker.UvicornWorker -w 2 -b 127.0.0.1:8002
+
+    python bench_async_views.py http://127.0.0.1:8001 --token <access>
+    python bench_async_views.py http://127.0.0.1:8002 --token <access>
+
+Only the standard library is used so it can run from any machine.
+"""
+
+import argparse
+import statistics
+import threading
+import time
+import urllib.error
+import urllib.request
+
+DEFAULT_PATHS = [
+    "/api/internships/",
+    "/api/internships/my-internships/",
+    "/api/notifications/",
+]
+
+
+def worker(base_url, paths, token, deadline, latencies, errors, lock):
+    headers = {"Authorization": f"Bearer {token}"} if token else {}
+    i = 0
+    while time.perf_counter() < deadline:
+        path = paths[i % len(paths)]
+        i += 1
+        request = urllib.request.Request(base_url + path, headers=headers)
+        start = time.perf_counter()
+        try:
+            with urllib.request.urlopen(request, timeout=30) as response:
+                response.read()
+            elapsed = time.perf_counter() - start
+            with lock:
+                latencies.append(elapsed)
+        except (urllib.error.URLError, TimeoutError):
+            with lock:
+                errors.append(path)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("base_url", help="e.g. http://127.0.0.1:8000")
+    parser.add_argument("--token", help="JWT access token for the protected endpoints")
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--duration", type=float, default=20.0, help="Seconds")
+    parser.add_argument("--path", action="append", dest="paths")
+    args = parser.parse_args()
+
+    paths = args.paths or DEFAULT_PATHS
+    if not args.token:
+        paths = [p for p in paths if p == "/api/internships/"]
+
+    latencies, errors, lock = [], [], threading.Lock()
+    deadline = time.perf_counter() + args.duration
+    threads = [
+        threading.Thread(
+            target=worker,
+            args=(args.base_url, paths, args.token, deadline, latencies, errors, lock),
+        )
+        for _ in range(args.concurrency)
+    ]
+
+    print(f"Benchmarking {args.base_url} with {args.concurrency} concurrent clients")
+    print(f"Paths: {', '.join(paths)}")
+    started = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    wall = time.perf_counter() - started
+
+    if not latencies:
+        print(f"❌ No successful requests ({len(errors)} errors).")
+        return
+
+    latencies.sort()
+    p95 = latencies[int(len(latencies) * 0.95) - 1]
+    print(f"Requests:    {len(latencies)} ok, {len(errors)} errors")
+    print(f"Throughput:  {len(latencies) / wall:.1f} req/s")
+    print(f"Latency p50: {statistics.median(latencies) * 1000:.1f} ms")
+    print(f"Latency p95: {p95 * 1000:.1f} ms")
+    print(f"Latency max: {latencies[-1] * 1000:.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
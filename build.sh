@@ -6,7 +6,15 @@ pip install -r requirements.txt
 
 python manage.py collectstatic --no-input
 python manage.py migrate
+# Renders step Markdown that is new or stale since the last deploy.
+python manage.py render_step_content
+# Hashes project links of submissions written without one (cheap when none).
+python manage.py backfill_link_hashes
 
 # --- ADD THIS LINE, MY LOVE! ---
 # This will run our new command to create the admin user.
-python manage.py create_prod_superuser
\ No newline at end of file
+python manage.py create_prod_superuser
+
+# Wake the database and prime caches so the first request after a deploy
+# doesn't pay for cold connections. Never fails the build.
+python manage.py warmup
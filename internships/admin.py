@@ -1,6 +1,10 @@
 # internships/admin.py
 
 from django.contrib import admin
+from django.db.models import Count, Exists, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+from quivix_internships.paginators import EstimatedCountPaginator
+from .links import forget_links
 from .models import (
     Internship,
     InternshipStep,
@@ -26,20 +30,85 @@ class InternshipAdmin(admin.ModelAdmin):
     """
 
     inlines = [InternshipStepInline]  # Updated inline
-    list_display = ("title", "field", "length_days", "created_at")
+    list_display = (
+        "title",
+        "field",
+        "length_days",
+        "created_at",
+        "get_enrolled_count",
+        "get_completion_rate",
+        "get_acceptance_rate",
+    )
     list_filter = ("field",)
+    list_select_related = ("stats",)
     search_fields = ("title", "description")
 
+    # --- Analytics columns, read from the InternshipStats rollup ---
+    @admin.display(description="Enrolled", ordering="stats__enrolled_count")
+    def get_enrolled_count(self, obj):
+        stats = getattr(obj, "stats", None)
+        return stats.enrolled_count if stats else 0
+
+    @admin.display(description="Completion")
+    def get_completion_rate(self, obj):
+        stats = getattr(obj, "stats", None)
+        return _format_rate(stats.completion_rate if stats else None)
+
+    @admin.display(description="Acceptance")
+    def get_acceptance_rate(self, obj):
+        stats = getattr(obj, "stats", None)
+        return _format_rate(stats.acceptance_rate if stats else None)
+
+
+def _format_rate(rate):
+    return "-" if rate is None else f"{rate:.0%}"
+
+
+def shared_link(submissions):
+    """
+    Submissions from other enrollments with the same project link as the
+    outer row, found through submission_link_hash_idx.
+    """
+    return (
+        submissions.filter(project_link_hash=OuterRef("project_link_hash"))
+        .exclude(project_link_hash="")
+        .exclude(user_internship=OuterRef("user_internship"))
+        .order_by()
+    )
+
+
+class SharedLinkFilter(admin.SimpleListFilter):
+    title = "shared link"
+    parameter_name = "shared_link"
+
+    def lookups(self, request, model_admin):
+        return [("yes", "Shared with another enrollment"), ("no", "Unique")]
+
+    def queryset(self, request, queryset):
+        shared = Exists(shared_link(Submission.objects.all()))
+        if self.value() == "yes":
+            return queryset.filter(shared)
+        if self.value() == "no":
+            return queryset.exclude(shared)
+        return queryset
+
 
 @admin.register(Submission)
 class SubmissionAdmin(admin.ModelAdmin):
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
+    list_select_related = ("user_internship__user", "user_internship__internship")
     list_display = (
         "get_user_email",
         "get_internship_title",
         "submitted_at",
         "difficulty_rating",
+        "link_status",
+        "shared_link_count",
     )
     list_filter = (
+        "link_status",
+        SharedLinkFilter,
         "difficulty_rating",
         "fully_completed",
         "user_internship__internship__field",
@@ -55,22 +124,53 @@ class SubmissionAdmin(admin.ModelAdmin):
         "experience_feedback",
         "difficulty_rating",
         "submitted_at",
+        "link_status",
+        "link_status_code",
+        "link_checked_at",
     )
     fields = (
         "user_internship",
         "project_link",
+        ("link_status", "link_status_code", "link_checked_at"),
         "fully_completed",
         "experience_feedback",
         "difficulty_rating",
         "submitted_at",
         "evaluation_reason",
     )
+    actions = ["recheck_links"]
 
     def get_queryset(self, request):
         return (
             super()
             .get_queryset(request)
             .select_related("user_internship__user", "user_internship__internship")
+            .annotate(
+                shared_link_count=Coalesce(
+                    Subquery(
+                        shared_link(Submission.objects.all())
+                        .values("project_link_hash")
+                        .annotate(count=Count("user_internship", distinct=True))
+                        .values("count")
+                    ),
+                    0,
+                )
+            )
+        )
+
+    @admin.display(
+        description="Other enrollments with this link", ordering="shared_link_count"
+    )
+    def shared_link_count(self, obj):
+        return obj.shared_link_count
+
+    @admin.action(description="Recheck project links")
+    def recheck_links(self, request, queryset):
+        # The cached results are dropped too, or the job would reuse them.
+        forget_links(set(queryset.values_list("project_link", flat=True)))
+        updated = queryset.update(link_status=Submission.LinkStatus.PENDING)
+        self.message_user(
+            request, f"{updated} link(s) will be checked on the next run."
         )
 
     @admin.display(description="User Email", ordering="user_internship__user__email")
@@ -86,10 +186,25 @@ class SubmissionAdmin(admin.ModelAdmin):
 
 @admin.register(UserInternship)
 class UserInternshipAdmin(admin.ModelAdmin):
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
     list_display = ("user", "internship", "status", "enrollment_date")
     list_filter = ("status", "internship__field")
+    list_select_related = ("user", "internship")
     search_fields = ("user__email", "internship__title")
     list_editable = ("status",)
+    autocomplete_fields = ("user", "internship")
+
+    def formfield_for_manytomany(self, db_field, request, **kwargs):
+        # Only offer the enrollment's own internship steps, with the
+        # internship joined since InternshipStep.__str__ uses its title.
+        if db_field.name == "completed_steps":
+            object_id = request.resolver_match.kwargs.get("object_id")
+            queryset = InternshipStep.objects.select_related("internship")
+            if object_id:
+                queryset = queryset.filter(internship__userinternship__pk=object_id)
+            kwargs["queryset"] = queryset
+        return super().formfield_for_manytomany(db_field, request, **kwargs)
 
     def save_model(self, request, obj, form, change):
         super().save_model(request, obj, form, change)
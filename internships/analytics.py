@@ -0,0 +1,151 @@
+# internships/analytics.py
+
+from django.db import transaction
+from django.db.models import Count, F, Q
+from django.db.models.functions import Greatest
+from django.utils import timezone
+
+from .models import Internship, InternshipStats, Submission, UserInternship
+
+STATUS_COUNTERS = {
+    UserInternship.Status.IN_PROGRESS: "in_progress_count",
+    UserInternship.Status.AWAITING_EVALUATION: "awaiting_evaluation_count",
+    UserInternship.Status.ACCEPTED: "accepted_count",
+    UserInternship.Status.REJECTED: "rejected_count",
+}
+
+DIFFICULTY_COUNTERS = {
+    Submission.Difficulty.EASY: "difficulty_easy_count",
+    Submission.Difficulty.MID: "difficulty_mid_count",
+    Submission.Difficulty.HARD: "difficulty_hard_count",
+}
+
+
+def apply_deltas(internship_id, *deltas):
+    """
+    Applies one or more counter-delta dicts to a rollup row with a single
+    UPDATE. A missing row (e.g. the internship is being deleted) is left
+    alone; the rebuild command is the repair path for any drift. Decrements
+    stop at zero so a drifted counter can't fail the delete that caused them.
+    """
+    merged = {}
+    for part in deltas:
+        for field, delta in part.items():
+            if field and delta:
+                merged[field] = merged.get(field, 0) + delta
+    if not merged:
+        return
+    InternshipStats.objects.filter(internship_id=internship_id).update(
+        updated_at=timezone.now(),
+        **{field: _add(field, delta) for field, delta in merged.items()},
+    )
+
+
+def _add(field, delta):
+    if delta > 0:
+        return F(field) + delta
+    return Greatest(F(field) + delta, 0)
+
+
+def enrollment_deltas(status, delta=1):
+    return {"enrolled_count": delta, STATUS_COUNTERS.get(status): delta}
+
+
+def status_change_deltas(old_status, new_status):
+    if old_status is None or old_status == new_status:
+        return {}
+    return {STATUS_COUNTERS.get(old_status): -1, STATUS_COUNTERS.get(new_status): 1}
+
+
+def submission_deltas(difficulty, fully_completed, delta=1):
+    return {
+        "submission_count": delta,
+        "fully_completed_count": delta if fully_completed else 0,
+        DIFFICULTY_COUNTERS.get(difficulty): delta,
+    }
+
+
+def record_enrollment(internship_id, status, delta=1):
+    apply_deltas(internship_id, enrollment_deltas(status, delta))
+
+
+def record_status_change(internship_id, old_status, new_status):
+    apply_deltas(internship_id, status_change_deltas(old_status, new_status))
+
+
+def record_submission(internship_id, difficulty, fully_completed, delta=1):
+    apply_deltas(internship_id, submission_deltas(difficulty, fully_completed, delta))
+
+
+def rebuild_stats(internship_ids=None):
+    """
+    Recomputes the rollup rows from the fact tables with two grouped queries
+    and one upsert. Returns the number of rows written.
+
+    The rollup rows are locked for the whole rebuild. Incremental updates
+    wait for it to commit instead of being overwritten by counts read before
+    they happened, and the counts are read after any in-flight update that
+    already holds a row has committed.
+    """
+    with transaction.atomic():
+        return _rebuild_stats(internship_ids)
+
+
+def _rebuild_stats(internship_ids):
+    internships = Internship.objects.all()
+    if internship_ids is not None:
+        internships = internships.filter(pk__in=internship_ids)
+    ids = list(internships.values_list("pk", flat=True))
+    list(
+        InternshipStats.objects.filter(internship_id__in=ids)
+        .order_by("pk")
+        .select_for_update()
+        .values_list("pk", flat=True)
+    )
+
+    enrollment_totals = {
+        row.pop("internship_id"): row
+        for row in UserInternship.objects.filter(internship_id__in=ids)
+        .values("internship_id")
+        .annotate(
+            enrolled_count=Count("id"),
+            **{
+                field: Count("id", filter=Q(status=status))
+                for status, field in STATUS_COUNTERS.items()
+            },
+        )
+    }
+    submission_totals = {
+        row.pop("user_internship__internship_id"): row
+        for row in Submission.objects.filter(user_internship__internship_id__in=ids)
+        .order_by()
+        .values("user_internship__internship_id")
+        .annotate(
+            submission_count=Count("id"),
+            fully_completed_count=Count("id", filter=Q(fully_completed=True)),
+            **{
+                field: Count("id", filter=Q(difficulty_rating=difficulty))
+                for difficulty, field in DIFFICULTY_COUNTERS.items()
+            },
+        )
+    }
+
+    rows = [
+        InternshipStats(
+            internship_id=pk,
+            **enrollment_totals.get(pk, {}),
+            **submission_totals.get(pk, {}),
+        )
+        for pk in ids
+    ]
+    update_fields = [
+        f.name for f in InternshipStats._meta.concrete_fields if not f.primary_key
+    ]
+    InternshipStats.objects.bulk_create(
+        rows,
+        batch_size=500,
+        update_conflicts=True,
+        unique_fields=["internship"],
+        update_fields=update_fields,
+    )
+    return len(rows)
@@ -0,0 +1,76 @@
+# internships/async_views.py
+
+from asgiref.sync import sync_to_async
+from django.http import Http404
+from django.utils import timezone
+from django.utils.decorators import method_decorator
+from rest_framework.filters import SearchFilter
+
+from quivix_internships.async_api import AsyncAPIView
+from . import fast_serializers, sync
+from .models import Internship, Tombstone, UserInternship
+from .serializers import InternshipDetailSerializer
+from .catalog import filter_catalog, get_facets
+from .views import (
+    InternshipListView,
+    conditional_internship,
+    internship_detail_queryset,
+    wants_facets,
+)
+
+# Async variants of the hot read endpoints in views.py. They return the same
+# JSON, but the ORM round-trips run on the event loop instead of tying up a
+# worker thread. Enabled with ASYNC_READ_VIEWS=True (see internships/urls.py).
+
+
+class AsyncInternshipListView(AsyncAPIView):
+    search_fields = InternshipListView.search_fields
+
+    async def get(self, request):
+        queryset = SearchFilter().filter_queryset(
+            self.drf_request(request),
+            filter_catalog(
+                Internship.objects.all().order_by("-created_at"), request.GET
+            ),
+            self,
+        )
+        data = await fast_serializers.aserialize_internships(queryset)
+        if wants_facets(request.GET):
+            data = {"results": data, "facets": await sync_to_async(get_facets)()}
+        return self.render(data)
+
+
+@method_decorator(conditional_internship, name="get")
+class AsyncInternshipDetailView(AsyncAPIView):
+    login_required = True
+
+    async def get(self, request, pk):
+        try:
+            internship = await internship_detail_queryset(request.user).aget(pk=pk)
+        except Internship.DoesNotExist:
+            raise Http404("No Internship matches the given query.")
+        return self.render(InternshipDetailSerializer(internship).data)
+
+
+class AsyncMyInternshipsView(AsyncAPIView):
+    login_required = True
+
+    async def get(self, request):
+        queryset = UserInternship.objects.filter(user=request.user).order_by(
+            "-enrollment_date"
+        )
+        since = sync.parse_changed_since(request.GET)
+        if since is None:
+            return self.render(await fast_serializers.aserialize_enrollments(queryset))
+
+        server_time = timezone.now()
+        queryset = sync.changed_enrollments(queryset, since)
+        enrollments = await fast_serializers.aserialize_enrollments(queryset)
+        deleted = sync.deleted_ids(request.user, Tombstone.Kind.USER_INTERNSHIP, since)
+        return self.render(
+            sync.sync_payload(
+                enrollments,
+                [object_id async for object_id in deleted],
+                server_time,
+            )
+        )
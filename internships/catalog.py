@@ -0,0 +1,93 @@
+# internships/catalog.py
+
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Count, Q
+
+from users.cache import cache_is_shared
+
+from .models import FIELD_CHOICES, Internship
+
+CATALOG_VERSION_KEY = "internships:catalog_version"
+FACETS_KEY = "internships:facets:{version}"
+
+# (label, min days, max days) - max None means open-ended.
+LENGTH_BUCKETS = [
+    ("1-14", 1, 14),
+    ("15-30", 15, 30),
+    ("31-60", 31, 60),
+    ("61+", 61, None),
+]
+
+
+def get_catalog_version():
+    """
+    An opaque token that changes whenever an internship is added, edited or
+    removed. Anything derived from the catalog (suggest index, facets, ...)
+    can be cached against it.
+    """
+    version = cache.get(CATALOG_VERSION_KEY)
+    if version is None:
+        version = time.time_ns()
+        if not cache.add(CATALOG_VERSION_KEY, version, timeout=None):
+            version = cache.get(CATALOG_VERSION_KEY, version)
+    return version
+
+
+def bump_catalog_version():
+    cache.set(CATALOG_VERSION_KEY, time.time_ns(), timeout=None)
+
+
+def filter_catalog(queryset, query_params):
+    """
+    Applies the exact-match catalog filters (currently `?field=`), which
+    are served by the (field, -created_at) index.
+    """
+    field = query_params.get("field")
+    if field:
+        queryset = queryset.filter(field=field)
+    return queryset
+
+
+def get_facets():
+    """
+    Internship counts per field and per length bucket, cached for the
+    current catalog version. Without a shared cache, other workers' version
+    bumps aren't seen, so entries only live CATALOG_FACETS_MAX_AGE seconds.
+    """
+    key = FACETS_KEY.format(version=get_catalog_version())
+    facets = cache.get(key)
+    if facets is None:
+        facets = compute_facets()
+        timeout = 60 * 60 * 24 if cache_is_shared() else settings.CATALOG_FACETS_MAX_AGE
+        cache.set(key, facets, timeout=timeout)
+    return facets
+
+
+def compute_facets():
+    # One grouped query: a row per field with its bucket counts as columns.
+    buckets = {}
+    for label, low, high in LENGTH_BUCKETS:
+        condition = Q(length_days__gte=low)
+        if high is not None:
+            condition &= Q(length_days__lte=high)
+        buckets[f"bucket_{len(buckets)}"] = Count("id", filter=condition)
+    rows = (
+        Internship.objects.order_by()
+        .values("field")
+        .annotate(total=Count("id"), **buckets)
+    )
+
+    field_counts = {value: 0 for value, _ in FIELD_CHOICES}
+    length_counts = {label: 0 for label, _, _ in LENGTH_BUCKETS}
+    for row in rows:
+        field_counts[row["field"]] = row["total"]
+        for i, (label, _, _) in enumerate(LENGTH_BUCKETS):
+            length_counts[label] += row[f"bucket_{i}"]
+
+    return {
+        "field": [{"value": v, "count": c} for v, c in field_counts.items()],
+        "length": [{"value": v, "count": c} for v, c in length_counts.items()],
+    }
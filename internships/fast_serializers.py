@@ -0,0 +1,160 @@
+# internships/fast_serializers.py
+
+from functools import lru_cache
+
+from cloudinary.utils import cloudinary_url
+from rest_framework import serializers
+
+from .models import Submission, UserInternship
+
+# Read-only fast path for the big list endpoints. Instead of building a
+# model instance and a serializer field tree per row, rows are fetched with
+# .values_list() and mapped to dicts by a fixed list of (name, column,
+# transform) accessors built once at import time. The output is the same
+# JSON as InternshipListSerializer / UserInternshipSerializer, which
+# internships/tests.py checks field for field; keep them in step.
+
+# Shares DRF's own formatting (ISO 8601, current time zone, "Z" for UTC).
+_datetime = serializers.DateTimeField().to_representation
+
+
+@lru_cache(maxsize=4096)
+def _thumbnail_url(public_id):
+    return cloudinary_url(public_id)[0]
+
+
+def _thumbnail(value):
+    # Same rule as InternshipListSerializer.get_thumbnail; URLs are memoized
+    # because the same thumbnails repeat across rows and requests.
+    if value and hasattr(value, "public_id"):
+        return _thumbnail_url(value.public_id)
+    return None
+
+
+class ValuesSerializer:
+    """
+    Maps .values_list() tuples to dicts. `fields` is a list of
+    (output name, column lookup, transform or None).
+    """
+
+    def __init__(self, fields, prefix=""):
+        self.fields = fields
+        self.prefix = prefix
+        self.names = [name for name, _, _ in fields]
+        self.columns = [prefix + column for _, column, _ in fields]
+        self.transforms = [
+            (name, transform) for name, _, transform in fields if transform
+        ]
+
+    def nested(self, prefix):
+        return ValuesSerializer(self.fields, prefix)
+
+    def to_representation(self, row):
+        item = dict(zip(self.names, row))
+        for name, transform in self.transforms:
+            item[name] = transform(item[name])
+        return item
+
+    def many(self, rows):
+        return [self.to_representation(row) for row in rows]
+
+    def values(self, queryset):
+        # prefetch_related() can't apply to tuples, so it's dropped here.
+        return queryset.prefetch_related(None).values_list(*self.columns)
+
+
+internship_list = ValuesSerializer(
+    [
+        ("id", "id", None),
+        ("title", "title", None),
+        ("thumbnail", "thumbnail", _thumbnail),
+        ("field", "field", None),
+        ("length_days", "length_days", None),
+        ("created_at", "created_at", _datetime),
+    ]
+)
+
+submission = ValuesSerializer(
+    [
+        ("id", "id", None),
+        ("project_link", "project_link", None),
+        ("fully_completed", "fully_completed", None),
+        ("experience_feedback", "experience_feedback", None),
+        ("difficulty_rating", "difficulty_rating", None),
+        ("submitted_at", "submitted_at", _datetime),
+        ("evaluation_reason", "evaluation_reason", None),
+    ]
+)
+
+_enrollment_columns = ["id", "enrollment_date", "status", "is_started"]
+_enrollment_internship = internship_list.nested("internship__")
+
+
+def enrollment_querysets(queryset):
+    """
+    The three queries behind an enrollment list: the enrollments joined to
+    their internship, completed step ids, and each enrollment's latest
+    submission. They only depend on `queryset` (as a subquery), so they can
+    be run in any order, sync or async.
+    """
+    ids = queryset.order_by().values("id")
+    rows = queryset.prefetch_related(None).values_list(
+        *_enrollment_columns, *_enrollment_internship.columns
+    )
+    # Ordered like the step model's default ordering, as the prefetch is.
+    steps = (
+        UserInternship.completed_steps.through.objects.filter(userinternship_id__in=ids)
+        .order_by("internshipstep__order", "internshipstep_id")
+        .values_list("userinternship_id", "internshipstep_id")
+    )
+    latest = (
+        Submission.objects.filter(user_internship_id__in=ids)
+        .order_by("user_internship_id", "-submitted_at")
+        .distinct("user_internship_id")
+        .values_list("user_internship_id", *submission.columns)
+    )
+    return rows, steps, latest
+
+
+def build_enrollments(rows, steps, latest):
+    """
+    Assembles UserInternshipSerializer-shaped dicts from the results of
+    enrollment_querysets().
+    """
+    completed = {}
+    for enrollment_id, step_id in steps:
+        completed.setdefault(enrollment_id, []).append(step_id)
+    submissions = {row[0]: submission.to_representation(row[1:]) for row in latest}
+
+    split = len(_enrollment_columns)
+    return [
+        {
+            "id": row[0],
+            "internship": _enrollment_internship.to_representation(row[split:]),
+            "enrollment_date": _datetime(row[1]),
+            "status": row[2],
+            "is_started": row[3],
+            "completed_steps": completed.get(row[0], []),
+            "latest_submission": submissions.get(row[0]),
+        }
+        for row in rows
+    ]
+
+
+def serialize_enrollments(queryset):
+    return build_enrollments(*(list(qs) for qs in enrollment_querysets(queryset)))
+
+
+def serialize_internships(queryset):
+    return internship_list.many(internship_list.values(queryset))
+
+
+async def aserialize_enrollments(queryset):
+    results = []
+    for qs in enrollment_querysets(queryset):
+        results.append([row async for row in qs])
+    return build_enrollments(*results)
+
+
+async def aserialize_internships(queryset):
+    return internship_list.many([row async for row in internship_list.values(queryset)])
@@ -0,0 +1,69 @@
+# internships/jobs.py
+
+from datetime import timedelta
+
+from django.conf import settings
+from django.db.models import Q
+from django.utils import timezone
+from maintenance.registry import delete_in_batches, job
+from .analytics import rebuild_stats
+from .links import check_links, normalize_link
+from .models import IdempotencyKey, Submission, Tombstone
+
+
+@job(interval=timedelta(days=1))
+def rebuild_internship_stats():
+    # Repairs any drift in the incrementally maintained rollup.
+    return rebuild_stats()
+
+
+@job(interval=timedelta(days=1))
+def purge_tombstones():
+    # Clients with an older changed_since cursor get 410 and resync anyway.
+    window = timedelta(days=settings.SYNC_TOMBSTONE_RETENTION_DAYS)
+    return delete_in_batches(
+        Tombstone.objects.filter(deleted_at__lt=timezone.now() - window)
+    )
+
+
+@job(interval=timedelta(minutes=5))
+def check_project_links():
+    """
+    Checks the links of new submissions, and retries failed checks after
+    LINK_CHECK_RETRY_MINUTES. One batch per run.
+    """
+    now = timezone.now()
+    retry_before = now - timedelta(minutes=settings.LINK_CHECK_RETRY_MINUTES)
+    submissions = list(
+        Submission.objects.filter(
+            Q(link_status=Submission.LinkStatus.PENDING)
+            | Q(
+                link_status=Submission.LinkStatus.ERROR,
+                link_checked_at__lt=retry_before,
+            )
+        )
+        .only("id", "project_link")
+        .order_by("id")[: settings.LINK_CHECK_BATCH_SIZE]
+    )
+    if not submissions:
+        return 0
+    results = check_links([submission.project_link for submission in submissions])
+    for submission in submissions:
+        status, code = results[normalize_link(submission.project_link)]
+        submission.link_status = status
+        submission.link_status_code = code
+        submission.link_checked_at = now
+    # bulk_update: no post_save, so the analytics signals don't see these,
+    # and updated_at is untouched since clients never see the link status.
+    Submission.objects.bulk_update(
+        submissions, ["link_status", "link_status_code", "link_checked_at"]
+    )
+    return len(submissions)
+
+
+@job(interval=timedelta(hours=1))
+def purge_idempotency_keys():
+    # Retries come within minutes; a day is plenty.
+    return delete_in_batches(
+        IdempotencyKey.objects.filter(created_at__lt=timezone.now() - timedelta(days=1))
+    )
@@ -0,0 +1,237 @@
+# internships/links.py
+
+import asyncio
+import hashlib
+import ipaddress
+import socket
+from urllib.parse import urlsplit
+
+from django.conf import settings
+from django.core.cache import cache
+
+from .models import Submission
+from .normalize import DEFAULT_PORTS, normalize_link
+
+# Checks that submitted project links resolve, so evaluators can filter out
+# dead links and private repositories in the admin instead of opening every
+# one. The check_project_links job (internships/jobs.py) feeds pending
+# submissions through check_links() in batches.
+#
+# Requests go out from one asyncio event loop: at most
+# LINK_CHECK_CONCURRENCY in flight, and requests to the same host spaced
+# LINK_CHECK_HOST_INTERVAL seconds apart so a batch of GitHub links doesn't
+# trip GitHub's rate limits. Results are cached per normalized URL, so a
+# link submitted by a whole cohort (or resubmitted) is fetched once.
+
+Status = Submission.LinkStatus
+
+USER_AGENT = "Quivix-LinkChecker/1.0"
+
+
+class BlockedHost(Exception):
+    pass
+
+
+def classify(status_code):
+    if status_code < 400:
+        return Status.OK
+    if status_code in (401, 403):
+        return Status.RESTRICTED
+    if status_code == 429 or status_code >= 500:
+        return Status.ERROR
+    return Status.BROKEN
+
+
+def _cache_key(url):
+    return f"linkcheck:{hashlib.sha256(url.encode()).hexdigest()[:32]}"
+
+
+def check_links(urls, checker=None):
+    """
+    Returns {normalized url: (status, status code or None)} for `urls`,
+    from the cache where possible. Failed checks (Status.ERROR) are not
+    cached, so they are retried on the next run.
+    """
+    wanted = {normalize_link(url) for url in urls}
+    keys = {url: _cache_key(url) for url in wanted}
+    cached = cache.get_many(keys.values())
+    results = {url: tuple(cached[key]) for url, key in keys.items() if key in cached}
+
+    to_fetch = wanted - results.keys()
+    if to_fetch:
+        fetched = asyncio.run((checker or LinkChecker()).check_many(to_fetch))
+        cache.set_many(
+            {
+                keys[url]: result
+                for url, result in fetched.items()
+                if result[0] != Status.ERROR
+            },
+            timeout=settings.LINK_CHECK_CACHE_TIMEOUT,
+        )
+        results.update(fetched)
+    return results
+
+
+def forget_links(urls):
+    """
+    Drops the cached results for `urls`, so the next check fetches them.
+    """
+    cache.delete_many([_cache_key(normalize_link(url)) for url in urls])
+
+
+class LinkChecker:
+    """
+    One pass over a set of URLs. Settings can be overridden per instance.
+    Hosts that resolve to private, loopback or link-local addresses are
+    refused (including after redirects) unless allow_private_hosts is set;
+    see PinnedTransport.
+    """
+
+    def __init__(
+        self,
+        concurrency=None,
+        host_interval=None,
+        timeout=None,
+        allow_private_hosts=None,
+    ):
+        self.concurrency = concurrency or settings.LINK_CHECK_CONCURRENCY
+        self.host_interval = (
+            settings.LINK_CHECK_HOST_INTERVAL
+            if host_interval is None
+            else host_interval
+        )
+        self.timeout = timeout or settings.LINK_CHECK_TIMEOUT
+        self.allow_private_hosts = (
+            settings.LINK_CHECK_ALLOW_PRIVATE_HOSTS
+            if allow_private_hosts is None
+            else allow_private_hosts
+        )
+
+    async def check_many(self, urls):
+        import httpx
+
+        self._semaphore = asyncio.Semaphore(self.concurrency)
+        self._next_slot = {}
+        async with httpx.AsyncClient(
+            timeout=self.timeout,
+            follow_redirects=True,
+            headers={"User-Agent": USER_AGENT},
+            transport=PinnedTransport(self),
+        ) as client:
+            urls = list(urls)
+            results = await asyncio.gather(*(self.check(client, url) for url in urls))
+        return dict(zip(urls, results))
+
+    async def check(self, client, url):
+        import httpx
+
+        host = urlsplit(url).hostname
+        if urlsplit(url).scheme not in DEFAULT_PORTS or not host:
+            return Status.BROKEN, None
+        await self._wait_for_host(host)
+        async with self._semaphore:
+            try:
+                response = await client.head(url)
+                if response.status_code in (405, 501):
+                    # Some hosts don't implement HEAD; only the headers of
+                    # the GET are read.
+                    async with client.stream("GET", url) as response:
+                        pass
+            except BlockedHost:
+                return Status.BROKEN, None
+            except httpx.HTTPError:
+                return Status.ERROR, None
+        return classify(response.status_code), response.status_code
+
+    async def _wait_for_host(self, host):
+        # Reserves the host's next free slot before sleeping, so concurrent
+        # tasks for the same host queue up behind each other.
+        loop = asyncio.get_running_loop()
+        now = loop.time()
+        start = max(now, self._next_slot.get(host, now))
+        self._next_slot[host] = start + self.host_interval
+        if start > now:
+            await asyncio.sleep(start - now)
+
+    async def resolve(self, host, port):
+        """
+        Returns the address to connect to for `host`, raising BlockedHost if
+        it doesn't resolve or (unless allow_private_hosts) if any of its
+        addresses isn't globally routable.
+        """
+        try:
+            # IP literals need no lookup.
+            addresses = [str(ipaddress.ip_address(host))]
+        except ValueError:
+            try:
+                answers = await asyncio.get_running_loop().getaddrinfo(
+                    host, port, type=socket.SOCK_STREAM
+                )
+            except socket.gaierror:
+                raise BlockedHost(host)
+            addresses = [sockaddr[0] for *_, sockaddr in answers]
+        if not addresses:
+            raise BlockedHost(host)
+        if not self.allow_private_hosts:
+            for address in addresses:
+                # IPv6 link-local addresses come back with a "%scope" suffix.
+                if not ipaddress.ip_address(address.split("%")[0]).is_global:
+                    raise BlockedHost(host)
+        return addresses[0]
+
+
+class PinnedTransport:
+    """
+    httpx transport that resolves each request's host through
+    LinkChecker.resolve() and connects to exactly the address that was
+    checked. Resolving in a hook and letting httpx resolve again would let
+    a DNS answer that changes in between (DNS rebinding) point the request
+    at an internal address. The Host header and the TLS server name keep
+    the original hostname, so virtual hosts and certificates still match.
+    """
+
+    def __init__(self, checker):
+        import httpx
+
+        self.checker = checker
+        # Loading the CA bundle is slow; it's done once and shared.
+        self.ssl_context = httpx.create_ssl_context()
+        # Connections are pooled by address once pinned, so each hostname
+        # gets its own pool: a TLS connection verified for one name must
+        # not be reused for another name on the same address.
+        self.transports = {}
+
+    async def handle_async_request(self, request):
+        import httpx
+
+        url = request.url
+        port = url.port or DEFAULT_PORTS.get(url.scheme)
+        if port is None:
+            raise BlockedHost(url.host)
+        address = await self.checker.resolve(url.host, port)
+        # The client keeps the original request on the response, so
+        # redirects are still resolved against the hostname.
+        pinned = httpx.Request(
+            request.method,
+            url.copy_with(host=address),
+            headers=request.headers,
+            stream=request.stream,
+            extensions={**request.extensions, "sni_hostname": url.host},
+        )
+        transport = self.transports.get(url.host)
+        if transport is None:
+            transport = self.transports[url.host] = httpx.AsyncHTTPTransport(
+                verify=self.ssl_context
+            )
+        return await transport.handle_async_request(pinned)
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *args):
+        await self.aclose()
+
+    async def aclose(self):
+        for transport in self.transports.values():
+            await transport.aclose()
+        self.transports.clear()
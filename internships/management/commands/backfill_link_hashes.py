@@ -0,0 +1,51 @@
+# internships/management/commands/backfill_link_hashes.py
+
+from django.core.management.base import BaseCommand
+from internships.models import Submission
+from internships.normalize import link_hash
+
+
+class Command(BaseCommand):
+    """
+    Fills Submission.project_link_hash for rows written before the column
+    existed. With --all every row is re-hashed, which is needed after a
+    change to normalize.link_fingerprint().
+    """
+
+    help = "Computes missing (or with --all, every) project link hash."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=1000)
+        parser.add_argument(
+            "--all",
+            action="store_true",
+            help="Re-hash every submission, not just those without a hash.",
+        )
+
+    def handle(self, *args, **options):
+        batch_size = options["batch_size"]
+        submissions = Submission.objects.only("id", "project_link", "project_link_hash")
+        if not options["all"]:
+            submissions = submissions.filter(project_link_hash="")
+        updated = checked = 0
+        last_id = 0
+        while True:
+            batch = list(submissions.filter(id__gt=last_id).order_by("id")[:batch_size])
+            if not batch:
+                break
+            last_id = batch[-1].id
+            checked += len(batch)
+            changed = []
+            for submission in batch:
+                digest = link_hash(submission.project_link)
+                if submission.project_link_hash != digest:
+                    submission.project_link_hash = digest
+                    changed.append(submission)
+            # bulk_update, so neither updated_at nor the analytics signals
+            # are touched.
+            Submission.objects.bulk_update(changed, ["project_link_hash"])
+            updated += len(changed)
+
+        self.stdout.write(
+            self.style.SUCCESS(f"Hashed {updated} of {checked} submission(s).")
+        )
@@ -0,0 +1,115 @@
+# internships/management/commands/benchmark_list_serializers.py
+
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from internships import fast_serializers
+from internships.models import Internship, InternshipStep, Submission, UserInternship
+from internships.serializers import InternshipListSerializer, UserInternshipSerializer
+from users.models import CustomUser
+
+
+class Command(BaseCommand):
+    """
+    Compares CPU time per 1,000 rows of the DRF serializers and the
+    .values() fast path (internships/fast_serializers.py) on the catalog and
+    my-internships lists. The rows are created inside a transaction that is
+    rolled back at the end, so it's safe to run against a dev database.
+    """
+
+    help = "Benchmarks list serialization CPU per 1k rows (DRF vs .values())."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--rows", type=int, default=1000)
+        parser.add_argument("--repeat", type=int, default=5)
+
+    def handle(self, *args, **options):
+        rows, repeat = options["rows"], options["repeat"]
+        if rows < 1 or repeat < 1:
+            raise CommandError("--rows and --repeat must be positive.")
+
+        with transaction.atomic():
+            user = self.create_rows(rows)
+            internships = Internship.objects.filter(title__startswith="bench-")
+            internships = internships.order_by("-created_at")
+            enrollments = UserInternship.objects.filter(user=user).order_by(
+                "-enrollment_date"
+            )
+            cases = [
+                (
+                    "internship list",
+                    lambda: InternshipListSerializer(internships, many=True).data,
+                    lambda: fast_serializers.serialize_internships(internships),
+                ),
+                (
+                    "my internships",
+                    lambda: UserInternshipSerializer(
+                        enrollments.select_related("internship").prefetch_related(
+                            "completed_steps", "submissions"
+                        ),
+                        many=True,
+                    ).data,
+                    lambda: fast_serializers.serialize_enrollments(enrollments),
+                ),
+            ]
+            for name, drf, fast in cases:
+                if drf() != fast():
+                    raise CommandError(f"{name}: outputs differ.")
+                drf_ms = self.cpu_ms(drf, repeat) * 1000 / rows
+                fast_ms = self.cpu_ms(fast, repeat) * 1000 / rows
+                self.stdout.write(
+                    f"{name:16} DRF {drf_ms:8.1f} ms/1k rows   "
+                    f".values() {fast_ms:8.1f} ms/1k rows   "
+                    f"x{drf_ms / fast_ms:.1f}"
+                )
+            transaction.set_rollback(True)
+
+    def cpu_ms(self, func, repeat):
+        # Best of `repeat`; process time, so waiting on the database is not
+        # counted (query building and row decoding are).
+        timings = []
+        for _ in range(repeat):
+            start = time.process_time()
+            func()
+            timings.append(time.process_time() - start)
+        return min(timings) * 1000
+
+    def create_rows(self, count):
+        user = CustomUser.objects.create_user(
+            "bench-list-serializers@example.invalid", "Benchmark"
+        )
+        internships = Internship.objects.bulk_create(
+            Internship(
+                title=f"bench-{n}",
+                description="-",
+                field="Web Development",
+                length_days=30,
+                thumbnail=f"image/upload/v1700000000/bench/{n % 20}.jpg",
+            )
+            for n in range(count)
+        )
+        steps = InternshipStep.objects.bulk_create(
+            InternshipStep(internship=internship, title=str(order), order=order)
+            for internship in internships
+            for order in range(3)
+        )
+        enrollments = UserInternship.objects.bulk_create(
+            UserInternship(user=user, internship=internship, is_started=True)
+            for internship in internships
+        )
+        through = UserInternship.completed_steps.through
+        through.objects.bulk_create(
+            through(userinternship_id=enrollment.pk, internshipstep_id=step.pk)
+            for enrollment, step in zip(enrollments, steps[::3])
+        )
+        Submission.objects.bulk_create(
+            Submission(
+                user_internship=enrollment,
+                project_link=f"https://github.com/bench/{enrollment.pk}",
+                fully_completed=True,
+                difficulty_rating="mid",
+            )
+            for enrollment in enrollments
+        )
+        return user
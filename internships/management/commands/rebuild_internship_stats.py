@@ -0,0 +1,28 @@
+# internships/management/commands/rebuild_internship_stats.py
+
+from django.core.management.base import BaseCommand
+from internships.analytics import rebuild_stats
+
+
+class Command(BaseCommand):
+    """
+    Recomputes the InternshipStats rollup from UserInternship and Submission.
+    The rollup is normally maintained incrementally; this is the repair path.
+    """
+
+    help = "Rebuilds the per-internship analytics rollup from the fact tables."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--internship",
+            type=int,
+            action="append",
+            dest="internship_ids",
+            help="Only rebuild the given internship id (can be repeated).",
+        )
+
+    def handle(self, *args, **options):
+        count = rebuild_stats(options["internship_ids"])
+        self.stdout.write(
+            self.style.SUCCESS(f"Rebuilt analytics for {count} internship(s).")
+        )
@@ -0,0 +1,51 @@
+# internships/management/commands/render_step_content.py
+
+from django.core.management.base import BaseCommand
+from internships.catalog import bump_catalog_version
+from internships.models import InternshipStep
+from internships.rendering import render_step
+
+
+class Command(BaseCommand):
+    """
+    Re-renders InternshipStep.content_html for steps whose stored hash no
+    longer matches their content, e.g. after a RENDERER_VERSION bump or rows
+    written without save(). Safe to run on every deploy.
+    """
+
+    help = "Renders step Markdown to stored HTML where it is missing or stale."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=200)
+        parser.add_argument(
+            "--force",
+            action="store_true",
+            help="Re-render every step, not just stale ones.",
+        )
+
+    def handle(self, *args, **options):
+        batch_size = options["batch_size"]
+        steps = InternshipStep.objects.only("id", "content", "content_hash")
+        rendered = checked = 0
+        last_id = 0
+        while True:
+            batch = list(steps.filter(id__gt=last_id).order_by("id")[:batch_size])
+            if not batch:
+                break
+            last_id = batch[-1].id
+            checked += len(batch)
+            if options["force"]:
+                for step in batch:
+                    step.content_hash = ""
+            stale = [step for step in batch if render_step(step)]
+            # bulk_update skips save(), so the pre_save renderer doesn't run
+            # a second time.
+            InternshipStep.objects.bulk_update(stale, ["content_html", "content_hash"])
+            rendered += len(stale)
+
+        if rendered:
+            # Detail responses embed the HTML and are validated by this version.
+            bump_catalog_version()
+        self.stdout.write(
+            self.style.SUCCESS(f"Rendered {rendered} of {checked} step(s).")
+        )
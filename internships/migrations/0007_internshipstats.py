@@ -0,0 +1,66 @@
+# Generated by Django 5.2.18 on 2026-10-19 12:08
+
+import django.db.models.deletion
+from django.db import migrations, models
+from django.db.models import Count, Q
+
+
+def backfill_stats(apps, schema_editor):
+    Internship = apps.get_model('internships', 'Internship')
+    InternshipStats = apps.get_model('internships', 'InternshipStats')
+    UserInternship = apps.get_model('internships', 'UserInternship')
+    Submission = apps.get_model('internships', 'Submission')
+
+    rows = {pk: InternshipStats(internship_id=pk) for pk in Internship.objects.values_list('pk', flat=True)}
+    for row in UserInternship.objects.values('internship_id').annotate(
+        enrolled_count=Count('id'),
+        in_progress_count=Count('id', filter=Q(status='in_progress')),
+        awaiting_evaluation_count=Count('id', filter=Q(status='awaiting_evaluation')),
+        accepted_count=Count('id', filter=Q(status='accepted')),
+        rejected_count=Count('id', filter=Q(status='rejected')),
+    ):
+        stats = rows[row.pop('internship_id')]
+        for field, value in row.items():
+            setattr(stats, field, value)
+    for row in Submission.objects.order_by().values('user_internship__internship_id').annotate(
+        submission_count=Count('id'),
+        fully_completed_count=Count('id', filter=Q(fully_completed=True)),
+        difficulty_easy_count=Count('id', filter=Q(difficulty_rating='easy')),
+        difficulty_mid_count=Count('id', filter=Q(difficulty_rating='mid')),
+        difficulty_hard_count=Count('id', filter=Q(difficulty_rating='hard')),
+    ):
+        stats = rows[row.pop('user_internship__internship_id')]
+        for field, value in row.items():
+            setattr(stats, field, value)
+    InternshipStats.objects.bulk_create(rows.values(), batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('internships', '0006_alter_submission_options_and_more'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='InternshipStats',
+            fields=[
+                ('internship', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='stats', serialize=False, to='internships.internship')),
+                ('enrolled_count', models.PositiveIntegerField(default=0)),
+                ('in_progress_count', models.PositiveIntegerField(default=0)),
+                ('awaiting_evaluation_count', models.PositiveIntegerField(default=0)),
+                ('accepted_count', models.PositiveIntegerField(default=0)),
+                ('rejected_count', models.PositiveIntegerField(default=0)),
+                ('submission_count', models.PositiveIntegerField(default=0)),
+                ('fully_completed_count', models.PositiveIntegerField(default=0)),
+                ('difficulty_easy_count', models.PositiveIntegerField(default=0)),
+                ('difficulty_mid_count', models.PositiveIntegerField(default=0)),
+                ('difficulty_hard_count', models.PositiveIntegerField(default=0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'verbose_name_plural': 'Internship stats',
+            },
+        ),
+        migrations.RunPython(backfill_stats, migrations.RunPython.noop),
+    ]
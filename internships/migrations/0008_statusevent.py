@@ -0,0 +1,27 @@
+# Generated by Django 5.2.18 on 2026-10-19 12:14
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('internships', '0007_internshipstats'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='StatusEvent',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('from_status', models.CharField(choices=[('in_progress', 'In Progress'), ('awaiting_evaluation', 'Awaiting Evaluation'), ('accepted', 'Accepted'), ('rejected', 'Rejected')], max_length=20)),
+                ('to_status', models.CharField(choices=[('in_progress', 'In Progress'), ('awaiting_evaluation', 'Awaiting Evaluation'), ('accepted', 'Accepted'), ('rejected', 'Rejected')], max_length=20)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('user_internship', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='status_events', to='internships.userinternship')),
+            ],
+            options={
+                'ordering': ['-created_at'],
+            },
+        ),
+    ]
@@ -0,0 +1,19 @@
+# Generated by Django 5.2.18 on 2026-10-19 12:17
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("internships", "0008_statusevent"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="internship",
+            index=models.Index(
+                fields=["field", "-created_at"], name="internship_field_idx"
+            ),
+        ),
+    ]
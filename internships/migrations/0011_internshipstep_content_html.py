@@ -0,0 +1,30 @@
+# Generated by Django 5.2.18 on 2026-10-19 12:25
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("internships", "0010_delta_sync"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="internshipstep",
+            name="content_hash",
+            field=models.CharField(blank=True, editable=False, max_length=64),
+        ),
+        migrations.AddField(
+            model_name="internshipstep",
+            name="content_html",
+            field=models.TextField(blank=True, editable=False),
+        ),
+        migrations.AlterField(
+            model_name="internshipstep",
+            name="content",
+            field=models.TextField(
+                blank=True, help_text="Main content for a 'Learning' step, in Markdown."
+            ),
+        ),
+    ]
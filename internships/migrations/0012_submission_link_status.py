@@ -0,0 +1,46 @@
+# Generated by Django 5.2.18 on 2026-10-19 12:36
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("internships", "0011_internshipstep_content_html"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="submission",
+            name="link_checked_at",
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name="submission",
+            name="link_status",
+            field=models.CharField(
+                choices=[
+                    ("pending", "Not checked yet"),
+                    ("ok", "Reachable"),
+                    ("broken", "Not found (dead or private)"),
+                    ("restricted", "Access denied"),
+                    ("error", "Check failed, will retry"),
+                ],
+                default="pending",
+                max_length=10,
+            ),
+        ),
+        migrations.AddField(
+            model_name="submission",
+            name="link_status_code",
+            field=models.PositiveSmallIntegerField(blank=True, null=True),
+        ),
+        migrations.AddIndex(
+            model_name="submission",
+            index=models.Index(
+                condition=models.Q(("link_status__in", ["pending", "error"])),
+                fields=["link_status", "link_checked_at"],
+                name="submission_link_queue_idx",
+            ),
+        ),
+    ]
@@ -0,0 +1,25 @@
+# Generated by Django 5.2.18 on 2026-10-19 12:38
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("internships", "0012_submission_link_status"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="submission",
+            name="project_link_hash",
+            field=models.CharField(blank=True, editable=False, max_length=64),
+        ),
+        migrations.AddIndex(
+            model_name="submission",
+            index=models.Index(
+                fields=["project_link_hash", "user_internship"],
+                name="submission_link_hash_idx",
+            ),
+        ),
+    ]
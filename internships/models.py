@@ -5,6 +5,8 @@ from django.conf import settings
 from django.db.models.signals import pre_save, post_delete
 from django.dispatch import receiver
 from cloudinary.models import CloudinaryField
+from .normalize import link_hash
+from .rendering import render_step
 
 FIELD_CHOICES = [
     ("Web Development", "Web Development"),
@@ -25,6 +27,12 @@ class Internship(models.Model):
     )
     created_at = models.DateTimeField(auto_now_add=True)
 
+    class Meta:
+        indexes = [
+            # Serves `?field=` filtering on the newest-first catalog list.
+            models.Index(fields=["field", "-created_at"], name="internship_field_idx"),
+        ]
+
     def __str__(self):
         return self.title
 
@@ -42,8 +50,12 @@ class InternshipStep(models.Model):
     )
     title = models.CharField(max_length=200)
     content = models.TextField(
-        blank=True, help_text="Main content for a 'Learning' step."
+        blank=True, help_text="Main content for a 'Learning' step, in Markdown."
     )
+    # Rendered from `content` on save (see rendering.py), so clients get
+    # ready HTML and nothing is rendered per request.
+    content_html = models.TextField(blank=True, editable=False)
+    content_hash = models.CharField(max_length=64, blank=True, editable=False)
     external_link = models.URLField(
         max_length=500,
         blank=True,
@@ -78,20 +90,55 @@ class UserInternship(models.Model):
     )
     intro_completed = models.BooleanField(default=False)
     roadmap_completed = models.BooleanField(default=False)
+    # Bumped on every change, including bulk .update() calls and step
+    # completion, so clients can sync with `?changed_since=`.
+    updated_at = models.DateTimeField(auto_now=True)
 
     class Meta:
         unique_together = ("user", "internship")
+        indexes = [
+            models.Index(
+                fields=["user", "updated_at"], name="enrollment_user_updated_idx"
+            ),
+        ]
 
     def __str__(self):
         return f"{self.user.email} enrolled in {self.internship.title}"
 
 
+class StatusEvent(models.Model):
+    """
+    Append-only log of UserInternship status transitions.
+    """
+
+    user_internship = models.ForeignKey(
+        UserInternship, on_delete=models.CASCADE, related_name="status_events"
+    )
+    from_status = models.CharField(max_length=20, choices=UserInternship.Status.choices)
+    to_status = models.CharField(max_length=20, choices=UserInternship.Status.choices)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        ordering = ["-created_at"]
+
+    def __str__(self):
+        return f"{self.user_internship_id}: {self.from_status} -> {self.to_status}"
+
+
 class Submission(models.Model):
     class Difficulty(models.TextChoices):
         EASY = "easy", "Easy"
         MID = "mid", "Medium"
         HARD = "hard", "Hard"
 
+    class LinkStatus(models.TextChoices):
+        # Set by the check_project_links job (see internships/links.py).
+        PENDING = "pending", "Not checked yet"
+        OK = "ok", "Reachable"
+        BROKEN = "broken", "Not found (dead or private)"
+        RESTRICTED = "restricted", "Access denied"
+        ERROR = "error", "Check failed, will retry"
+
     # --- THE CRITICAL CHANGE FOR RESUBMISSION ---
     # From OneToOneField to ForeignKey, allowing a history of submissions.
     user_internship = models.ForeignKey(
@@ -106,15 +153,144 @@ class Submission(models.Model):
     evaluation_reason = models.TextField(
         blank=True, null=True, help_text="Reason for rejection, if any."
     )
+    updated_at = models.DateTimeField(auto_now=True)
+    link_status = models.CharField(
+        max_length=10, choices=LinkStatus.choices, default=LinkStatus.PENDING
+    )
+    link_status_code = models.PositiveSmallIntegerField(null=True, blank=True)
+    link_checked_at = models.DateTimeField(null=True, blank=True)
+    # sha256 of normalize.link_fingerprint(project_link), set on save; finds
+    # other enrollments that submitted the same repository.
+    project_link_hash = models.CharField(max_length=64, blank=True, editable=False)
 
     class Meta:
         # This ensures that when we ask for submissions, the newest one is always first.
         ordering = ["-submitted_at"]
+        indexes = [
+            models.Index(
+                fields=["user_internship", "updated_at"],
+                name="submission_updated_idx",
+            ),
+            # Includes the enrollment so "how many other enrollments share
+            # this link" is answered from the index alone.
+            models.Index(
+                fields=["project_link_hash", "user_internship"],
+                name="submission_link_hash_idx",
+            ),
+            # The link checker's work queue: only rows still to be checked.
+            models.Index(
+                fields=["link_status", "link_checked_at"],
+                name="submission_link_queue_idx",
+                condition=models.Q(link_status__in=["pending", "error"]),
+            ),
+        ]
 
     def __str__(self):
         return f"Submission for {self.user_internship} at {self.submitted_at.strftime('%Y-%m-%d')}"
 
 
+class InternshipStats(models.Model):
+    """
+    Per-internship outcome rollup, kept up to date incrementally by the
+    enrollment/submission signals in `internships/signals.py` so analytics
+    reads never have to aggregate UserInternship or Submission.
+    Use `manage.py rebuild_internship_stats` to recompute it from scratch.
+    """
+
+    internship = models.OneToOneField(
+        Internship, on_delete=models.CASCADE, primary_key=True, related_name="stats"
+    )
+    enrolled_count = models.PositiveIntegerField(default=0)
+    in_progress_count = models.PositiveIntegerField(default=0)
+    awaiting_evaluation_count = models.PositiveIntegerField(default=0)
+    accepted_count = models.PositiveIntegerField(default=0)
+    rejected_count = models.PositiveIntegerField(default=0)
+    submission_count = models.PositiveIntegerField(default=0)
+    fully_completed_count = models.PositiveIntegerField(default=0)
+    difficulty_easy_count = models.PositiveIntegerField(default=0)
+    difficulty_mid_count = models.PositiveIntegerField(default=0)
+    difficulty_hard_count = models.PositiveIntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        verbose_name_plural = "Internship stats"
+
+    def __str__(self):
+        return f"Stats for {self.internship_id}"
+
+    @property
+    def submitted_count(self):
+        # Every enrollment that has left 'in_progress' has submitted at least once.
+        return self.enrolled_count - self.in_progress_count
+
+    @property
+    def completion_rate(self):
+        if not self.enrolled_count:
+            return None
+        return round(self.submitted_count / self.enrolled_count, 4)
+
+    @property
+    def acceptance_rate(self):
+        evaluated = self.accepted_count + self.rejected_count
+        if not evaluated:
+            return None
+        return round(self.accepted_count / evaluated, 4)
+
+
+class IdempotencyKey(models.Model):
+    """
+    A claimed `Idempotency-Key` and, once the request succeeded, its
+    response for replay. Kept in Postgres rather than the cache so a retry
+    served by another worker still finds it. Purged by the
+    purge_idempotency_keys job.
+    """
+
+    user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE)
+    # What the key was used for, e.g. "apply:42".
+    request = models.CharField(max_length=100)
+    key = models.CharField(max_length=255)
+    # Null while the first request is still running.
+    response_status = models.PositiveSmallIntegerField(null=True)
+    response_data = models.JSONField(null=True)
+    created_at = models.DateTimeField(auto_now_add=True, db_index=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["user", "request", "key"], name="idempotency_key_unique"
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.request} {self.key}"
+
+
+class Tombstone(models.Model):
+    """
+    Records a deleted row so delta-sync clients (`?changed_since=`) can drop
+    it locally. Written by internships/signals.py and purge_notifications.
+    """
+
+    class Kind(models.TextChoices):
+        USER_INTERNSHIP = "user_internship", "Enrollment"
+        NOTIFICATION = "notification", "Notification"
+
+    user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE)
+    kind = models.CharField(max_length=20, choices=Kind.choices)
+    object_id = models.BigIntegerField()
+    deleted_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        indexes = [
+            models.Index(
+                fields=["user", "kind", "deleted_at"], name="tombstone_sync_idx"
+            ),
+        ]
+
+    def __str__(self):
+        return f"Deleted {self.kind} {self.object_id}"
+
+
 @receiver(pre_save, sender=Internship)
 def delete_old_thumbnail(sender, instance, **kwargs):
     if not instance.pk:
@@ -137,3 +313,14 @@ def delete_thumbnail_on_delete(sender, instance, **kwargs):
             instance.thumbnail.delete(save=False)
         except Exception:
             pass
+
+
+@receiver(pre_save, sender=InternshipStep)
+def render_step_content(sender, instance, **kwargs):
+    # A no-op unless the content changed since it was last rendered.
+    render_step(instance)
+
+
+@receiver(pre_save, sender=Submission)
+def hash_project_link(sender, instance, **kwargs):
+    instance.project_link_hash = link_hash(instance.project_link)
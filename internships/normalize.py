@@ -0,0 +1,49 @@
+# internships/normalize.py
+
+import hashlib
+from urllib.parse import urlsplit, urlunsplit
+
+# URL canonicalization for project links, shared by the link checker
+# (links.py) and duplicate detection (Submission.project_link_hash).
+
+DEFAULT_PORTS = {"http": 80, "https": 443}
+
+
+def _host(parts):
+    host = (parts.hostname or "").lower()
+    try:
+        port = parts.port
+    except ValueError:
+        port = None
+    if port and port != DEFAULT_PORTS.get(parts.scheme.lower()):
+        host = f"{host}:{port}"
+    return host
+
+
+def normalize_link(url):
+    """
+    Canonical form of a project link for fetching: lowercase scheme and
+    host, no credentials, default port, fragment or trailing slash. The
+    query string is kept, since it can select different content.
+    """
+    parts = urlsplit(url.strip())
+    path = parts.path.rstrip("/")
+    return urlunsplit((parts.scheme.lower(), _host(parts), path, parts.query, ""))
+
+
+def link_fingerprint(url):
+    """
+    What identifies a repository regardless of how the link was written:
+    host and path only, lowercased, without "www.", scheme, query string,
+    fragment, trailing slashes or a ".git" suffix. So
+    "https://github.com/Ann/Todo.git/" and
+    "http://www.github.com/ann/todo?tab=readme" are the same.
+    """
+    parts = urlsplit(url.strip())
+    host = _host(parts).removeprefix("www.")
+    path = parts.path.lower().rstrip("/").removesuffix(".git").rstrip("/")
+    return host + path
+
+
+def link_hash(url):
+    return hashlib.sha256(link_fingerprint(url).encode()).hexdigest()
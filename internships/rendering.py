@@ -0,0 +1,61 @@
+# internships/rendering.py
+
+import hashlib
+
+# Step content is authored as Markdown and rendered to sanitized HTML once,
+# when the step is saved, into InternshipStep.content_html. The stored
+# content_hash covers the source and RENDERER_VERSION, so bumping the version
+# after changing the Markdown extensions or the allowlist below makes every
+# step stale for `manage.py render_step_content`.
+RENDERER_VERSION = 1
+
+MARKDOWN_EXTENSIONS = ["extra", "sane_lists"]
+
+ALLOWED_TAGS = {
+    "a", "abbr", "blockquote", "br", "code", "dd", "del", "dl", "dt", "em",
+    "h1", "h2", "h3", "h4", "h5", "h6", "hr", "img", "li", "ol", "p", "pre",
+    "strong", "sub", "sup", "table", "tbody", "td", "th", "thead", "tr", "ul",
+}  # fmt: skip
+ALLOWED_ATTRIBUTES = {
+    "a": {"href", "title"},
+    "abbr": {"title"},
+    "img": {"src", "alt", "title"},
+    "td": {"align"},
+    "th": {"align"},
+}
+URL_SCHEMES = {"http", "https", "mailto"}
+
+
+def content_hash(content):
+    return hashlib.sha256(f"{RENDERER_VERSION}:{content}".encode()).hexdigest()
+
+
+def render_markdown(content):
+    """
+    Renders Markdown to HTML and strips anything outside the allowlist
+    (scripts, event handlers, javascript: URLs, raw HTML we don't expect).
+    """
+    import markdown
+    import nh3
+
+    html = markdown.markdown(content, extensions=MARKDOWN_EXTENSIONS)
+    return nh3.clean(
+        html,
+        tags=ALLOWED_TAGS,
+        attributes=ALLOWED_ATTRIBUTES,
+        url_schemes=URL_SCHEMES,
+        link_rel="noopener noreferrer nofollow",
+    )
+
+
+def render_step(step):
+    """
+    Re-renders `step.content_html` if the content (or the renderer) changed
+    since it was last rendered. Returns True if the step was updated.
+    """
+    digest = content_hash(step.content)
+    if step.content_hash == digest:
+        return False
+    step.content_html = render_markdown(step.content) if step.content else ""
+    step.content_hash = digest
+    return True
@@ -1,14 +1,36 @@
 # internships/serializers.py
 
 from rest_framework import serializers
-from .models import Internship, InternshipStep, UserInternship, Submission
+from .models import (
+    Internship,
+    InternshipStats,
+    InternshipStep,
+    UserInternship,
+    Submission,
+)
 from cloudinary.utils import cloudinary_url
 
 
 class InternshipStepSerializer(serializers.ModelSerializer):
     class Meta:
         model = InternshipStep
-        fields = ["id", "title", "step_type", "content", "external_link", "order"]
+        fields = [
+            "id",
+            "title",
+            "step_type",
+            "content",
+            "content_html",
+            "external_link",
+            "order",
+        ]
+
+
+class InternshipStepProgressSerializer(InternshipStepSerializer):
+    # Annotated by views.internship_detail_queryset().
+    completed = serializers.BooleanField(read_only=True)
+
+    class Meta(InternshipStepSerializer.Meta):
+        fields = InternshipStepSerializer.Meta.fields + ["completed"]
 
 
 class InternshipListSerializer(serializers.ModelSerializer):
@@ -25,7 +47,14 @@ class InternshipListSerializer(serializers.ModelSerializer):
 
 
 class InternshipDetailSerializer(serializers.ModelSerializer):
-    steps = InternshipStepSerializer(many=True, read_only=True)
+    """
+    The course page for one student: steps carry `completed` and
+    `enrollment` is {"id", "status"} or None if they aren't enrolled.
+    Expects the annotations from views.internship_detail_queryset().
+    """
+
+    steps = InternshipStepProgressSerializer(many=True, read_only=True)
+    enrollment = serializers.SerializerMethodField()
 
     class Meta:
         model = Internship
@@ -37,9 +66,15 @@ class InternshipDetailSerializer(serializers.ModelSerializer):
             "field",
             "length_days",
             "created_at",
+            "enrollment",
             "steps",
         ]
 
+    def get_enrollment(self, obj):
+        if obj.enrollment_id is None:
+            return None
+        return {"id": obj.enrollment_id, "status": obj.enrollment_status}
+
 
 class SubmissionSerializer(serializers.ModelSerializer):
     class Meta:
@@ -80,3 +115,35 @@ class UserInternshipSerializer(serializers.ModelSerializer):
         if latest:
             return SubmissionSerializer(latest).data
         return None
+
+
+class InternshipStatsSerializer(serializers.ModelSerializer):
+    title = serializers.CharField(source="internship.title", read_only=True)
+    completion_rate = serializers.FloatField(read_only=True)
+    acceptance_rate = serializers.FloatField(read_only=True)
+    difficulty = serializers.SerializerMethodField()
+
+    class Meta:
+        model = InternshipStats
+        fields = [
+            "internship",
+            "title",
+            "enrolled_count",
+            "in_progress_count",
+            "awaiting_evaluation_count",
+            "accepted_count",
+            "rejected_count",
+            "submission_count",
+            "fully_completed_count",
+            "completion_rate",
+            "acceptance_rate",
+            "difficulty",
+            "updated_at",
+        ]
+
+    def get_difficulty(self, obj):
+        return {
+            "easy": obj.difficulty_easy_count,
+            "mid": obj.difficulty_mid_count,
+            "hard": obj.difficulty_hard_count,
+        }
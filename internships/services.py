@@ -0,0 +1,160 @@
+# internships/services.py
+
+from django.db import transaction
+from django.utils import timezone
+
+from notifications.models import Notification
+from users.cache import ENROLLMENTS, bump_user_version
+from . import analytics
+from .models import (
+    Internship,
+    StatusEvent,
+    Submission,
+    UserInternship,
+)
+from .normalize import link_hash
+
+SUBMITTABLE_STATUSES = [
+    UserInternship.Status.IN_PROGRESS,
+    UserInternship.Status.REJECTED,
+]
+
+# One round-trip: insert the enrollment only if the internship exists, let the
+# (user, internship) unique constraint swallow duplicates, and return the
+# internship columns the response needs. Zero rows means "not found" or
+# "already applied".
+ENROLL_SQL = """
+WITH enrollment AS (
+    INSERT INTO {enrollment_table}
+        (user_id, internship_id, enrollment_date, updated_at, status,
+         is_started, intro_completed, roadmap_completed)
+    SELECT %s, id, NOW(), NOW(), %s, false, false, false
+    FROM {internship_table}
+    WHERE id = %s
+    ON CONFLICT (user_id, internship_id) DO NOTHING
+    RETURNING id, internship_id, enrollment_date
+)
+SELECT internship.id, internship.title, internship.thumbnail, internship.field,
+       internship.length_days, internship.created_at,
+       enrollment.id AS enrollment_id, enrollment.enrollment_date
+FROM enrollment
+JOIN {internship_table} internship ON internship.id = enrollment.internship_id
+"""
+
+
+def enroll(user, internship_id):
+    """
+    Enrolls `user` in the internship with a single INSERT ... ON CONFLICT DO
+    NOTHING. Returns the new UserInternship, or None if the internship does
+    not exist or the user is already enrolled.
+
+    The returned instance is pre-populated so UserInternshipSerializer can
+    render it without any further queries.
+    """
+    sql = ENROLL_SQL.format(
+        enrollment_table=UserInternship._meta.db_table,
+        internship_table=Internship._meta.db_table,
+    )
+    status = UserInternship.Status.IN_PROGRESS
+    rows = list(Internship.objects.raw(sql, [user.pk, status, internship_id]))
+    if not rows:
+        return None
+    internship = rows[0]
+
+    user_internship = UserInternship(
+        id=internship.enrollment_id,
+        user=user,
+        internship=internship,
+        enrollment_date=internship.enrollment_date,
+        updated_at=internship.enrollment_date,
+        status=status,
+    )
+    # A brand-new enrollment has no completed steps or submissions yet.
+    _set_prefetched(user_internship, "completed_steps", [])
+    _set_prefetched(user_internship, "submissions", [])
+    # Raw inserts skip post_save, so keep the analytics rollup and the
+    # cached enrollment summaries in step here.
+    analytics.record_enrollment(internship.pk, status)
+    bump_user_version(user.pk, ENROLLMENTS)
+    return user_internship
+
+
+def status_message(status, title, reason=None):
+    """
+    The notification text sent to a student when their enrollment moves
+    to `status`. Returns None for statuses that don't notify.
+    """
+    if status == UserInternship.Status.AWAITING_EVALUATION:
+        return f"Your submission for '{title}' is now awaiting evaluation."
+    if status == UserInternship.Status.ACCEPTED:
+        return f"Congratulations! Your submission for '{title}' has been accepted."
+    if status == UserInternship.Status.REJECTED:
+        reason = reason or "Please review the requirements."
+        return f"Your submission for '{title}' needs revision. Reason: {reason}"
+    return None
+
+
+def submit(user_internship, submission_data):
+    """
+    Records a submission and moves the enrollment to 'awaiting_evaluation'
+    in one transaction. The status change is a conditional UPDATE on the
+    status that was read (optimistic concurrency), so of two submissions
+    racing for the same enrollment only one wins; the loser gets None back
+    and nothing is written.
+
+    Expects `user_internship` loaded with its internship. Costs a fixed five
+    statements: UPDATE enrollment, INSERT submission, INSERT status event,
+    INSERT notification, UPDATE analytics rollup.
+    """
+    old_status = user_internship.status
+    new_status = UserInternship.Status.AWAITING_EVALUATION
+    if old_status not in SUBMITTABLE_STATUSES:
+        return None
+
+    with transaction.atomic():
+        updated = UserInternship.objects.filter(
+            pk=user_internship.pk, status=old_status
+        ).update(status=new_status, updated_at=timezone.now())
+        if not updated:
+            return None
+
+        # bulk_create skips post_save, so the rollup update below can cover
+        # the submission and the status change in one statement. It skips
+        # pre_save too, hence the explicit link hash.
+        submission = Submission(user_internship=user_internship, **submission_data)
+        submission.project_link_hash = link_hash(submission.project_link)
+        (submission,) = Submission.objects.bulk_create([submission])
+        StatusEvent.objects.create(
+            user_internship=user_internship,
+            from_status=old_status,
+            to_status=new_status,
+        )
+        Notification.objects.create(
+            user_id=user_internship.user_id,
+            message=status_message(new_status, user_internship.internship.title),
+            related_internship=user_internship,
+        )
+        analytics.apply_deltas(
+            user_internship.internship_id,
+            analytics.status_change_deltas(old_status, new_status),
+            analytics.submission_deltas(
+                submission.difficulty_rating, submission.fully_completed
+            ),
+        )
+
+    bump_user_version(user_internship.user_id, ENROLLMENTS)
+    user_internship.status = new_status
+    user_internship._loaded_status = new_status
+    _set_prefetched(user_internship, "submissions", [submission])
+    return submission
+
+
+def _set_prefetched(instance, name, objects):
+    # Same bookkeeping prefetch_related() does, so `instance.<name>.all()`
+    # (and .first()) are served from memory.
+    cache = instance.__dict__.setdefault("_prefetched_objects_cache", {})
+    cache.pop(name, None)
+    queryset = getattr(instance, name).all()
+    queryset._result_cache = list(objects)
+    queryset._prefetch_done = True
+    cache[name] = queryset
@@ -1,8 +1,28 @@
 # internships/signals.py
-from django.db.models.signals import post_save
+from django.contrib.auth import get_user_model
+from django.db.models import QuerySet
+from django.db.models.signals import (
+    m2m_changed,
+    post_delete,
+    post_init,
+    post_save,
+    pre_delete,
+)
+from django.utils import timezone
 from django.dispatch import receiver
-from .models import UserInternship
+from .models import (
+    Internship,
+    InternshipStats,
+    InternshipStep,
+    StatusEvent,
+    Submission,
+    Tombstone,
+    UserInternship,
+)
+from . import analytics, services, sync
+from .catalog import bump_catalog_version
 from notifications.models import Notification # Import Notification model
+from users.cache import ENROLLMENTS, NOTIFICATIONS, bump_user_version
 
 @receiver(post_save, sender=UserInternship)
 def create_notification_on_status_change(sender, instance, created, **kwargs):
@@ -12,22 +32,136 @@ def create_notification_on_status_change(sender, instance, created, **kwargs):
 
     # Check if the 'status' field was updated.
     # A simple way is to just create a notification based on the new status.
-    if instance.status == 'awaiting_evaluation':
+    reason = None
+    if instance.status == 'rejected':
+        latest = instance.submissions.order_by('-submitted_at').first()
+        reason = latest.evaluation_reason if latest else None
+    message = services.status_message(instance.status, instance.internship.title, reason)
+    if message:
         Notification.objects.create(
             user=instance.user,
-            message=f"Your submission for '{instance.internship.title}' is now awaiting evaluation.",
+            message=message,
             related_internship=instance
         )
-    elif instance.status == 'accepted':
-        Notification.objects.create(
-            user=instance.user,
-            message=f"Congratulations! Your submission for '{instance.internship.title}' has been accepted.",
-            related_internship=instance
+
+
+# --- CATALOG VERSION ---
+# Anything cached from the catalog is keyed on this version.
+
+@receiver(post_save, sender=Internship)
+@receiver(post_delete, sender=Internship)
+@receiver(post_save, sender=InternshipStep)
+@receiver(post_delete, sender=InternshipStep)
+def bump_catalog_on_change(sender, instance, **kwargs):
+    bump_catalog_version()
+
+
+# --- ANALYTICS ROLLUPS ---
+# Keep InternshipStats in step with the fact tables, one UPDATE per event.
+
+@receiver(post_save, sender=Internship)
+def create_internship_stats(sender, instance, created, **kwargs):
+    if created:
+        InternshipStats.objects.get_or_create(internship=instance)
+
+
+@receiver(post_init, sender=UserInternship)
+def remember_loaded_status(sender, instance, **kwargs):
+    # Read from __dict__ so a deferred status never triggers a query here.
+    instance._loaded_status = instance.__dict__.get("status")
+
+
+@receiver(post_save, sender=UserInternship)
+def update_stats_on_enrollment_save(sender, instance, created, **kwargs):
+    if created:
+        analytics.record_enrollment(instance.internship_id, instance.status)
+    elif instance._loaded_status and instance._loaded_status != instance.status:
+        StatusEvent.objects.create(
+            user_internship=instance,
+            from_status=instance._loaded_status,
+            to_status=instance.status,
         )
-    elif instance.status == 'rejected':
-        reason = instance.submission.evaluation_reason if hasattr(instance, 'submission') and instance.submission.evaluation_reason else "Please review the requirements."
-        Notification.objects.create(
-            user=instance.user,
-            message=f"Your submission for '{instance.internship.title}' needs revision. Reason: {reason}",
-            related_internship=instance
-        )
\ No newline at end of file
+        analytics.record_status_change(
+            instance.internship_id, instance._loaded_status, instance.status
+        )
+    instance._loaded_status = instance.status
+
+
+@receiver(post_delete, sender=UserInternship)
+def update_stats_on_enrollment_delete(sender, instance, **kwargs):
+    analytics.record_enrollment(
+        instance.internship_id, instance._loaded_status, delta=-1
+    )
+
+
+@receiver(post_save, sender=Submission)
+def update_stats_on_submission(sender, instance, created, **kwargs):
+    if created:
+        analytics.record_submission(
+            instance.user_internship.internship_id,
+            instance.difficulty_rating,
+            instance.fully_completed,
+        )
+
+
+@receiver(post_delete, sender=Submission)
+def update_stats_on_submission_delete(sender, instance, **kwargs):
+    analytics.record_submission(
+        instance.user_internship.internship_id,
+        instance.difficulty_rating,
+        instance.fully_completed,
+        delta=-1,
+    )
+
+
+
+# --- DELTA SYNC ---
+# Changes that bypass auto_now bump updated_at here; deletions leave
+# tombstones so `?changed_since=` clients can drop the rows.
+
+@receiver(m2m_changed, sender=UserInternship.completed_steps.through)
+def touch_enrollment_on_step_change(sender, instance, action, reverse, **kwargs):
+    if reverse or action not in ("post_add", "post_remove", "post_clear"):
+        return
+    # A queryset update, so the status-change receivers above don't fire.
+    UserInternship.objects.filter(pk=instance.pk).update(updated_at=timezone.now())
+    bump_user_version(instance.user_id, ENROLLMENTS)
+
+
+def _deleting_user(origin):
+    # The user's own rows go with them; a tombstone would point at a
+    # deleted user (and nobody is left to sync it).
+    model = origin.model if isinstance(origin, QuerySet) else type(origin)
+    return model is get_user_model()
+
+
+@receiver(pre_delete, sender=UserInternship)
+def tombstone_enrollment_notifications(sender, instance, origin=None, **kwargs):
+    if _deleting_user(origin):
+        return
+    # Notifications pointing at the enrollment are cascade-deleted with it.
+    sync.record_deletions(
+        Tombstone.Kind.NOTIFICATION,
+        Notification.objects.filter(related_internship=instance).values_list(
+            "id", "user_id"
+        ),
+    )
+    bump_user_version(instance.user_id, NOTIFICATIONS)
+
+
+@receiver(post_delete, sender=UserInternship)
+def tombstone_enrollment(sender, instance, origin=None, **kwargs):
+    if _deleting_user(origin):
+        return
+    sync.record_deletions(
+        Tombstone.Kind.USER_INTERNSHIP, [(instance.pk, instance.user_id)]
+    )
+
+
+# --- BOOTSTRAP CACHE ---
+# Enrollment summaries in api/bootstrap/ are cached per user version.
+
+@receiver(post_save, sender=UserInternship)
+@receiver(post_delete, sender=UserInternship)
+def invalidate_cached_enrollments(sender, instance, **kwargs):
+    bump_user_version(instance.user_id, ENROLLMENTS)
@@ -0,0 +1,93 @@
+# internships/suggest.py
+
+import threading
+import time
+from bisect import bisect_left
+
+from django.conf import settings
+
+from .catalog import get_catalog_version
+from .models import Internship
+
+# Where a key came from; lower ranks sort first in results.
+RANK_TITLE = 0
+RANK_WORD = 1
+RANK_FIELD = 2
+
+
+def normalize(text):
+    return " ".join(text.lower().split())
+
+
+class SuggestIndex:
+    """
+    In-memory prefix index over internship titles and fields.
+
+    Every title is indexed whole and from the start of each later word (so
+    "dev" finds "Web Development"), and every field by name. Keys live in one
+    sorted list, so a lookup is a bisect plus a short scan of the matching
+    range; no database access.
+    """
+
+    def __init__(self, internships):
+        entries = []
+        for pk, title, field in internships:
+            words = normalize(title).split(" ")
+            for i in range(len(words)):
+                rank = RANK_TITLE if i == 0 else RANK_WORD
+                entries.append((" ".join(words[i:]), rank, title, pk, field))
+            entries.append((normalize(field), RANK_FIELD, title, pk, field))
+        entries.sort()
+        self.keys = [entry[0] for entry in entries]
+        self.entries = entries
+
+    def search(self, query, limit=8, scan_limit=500):
+        prefix = normalize(query)
+        if not prefix:
+            return []
+        matches = []
+        start = bisect_left(self.keys, prefix)
+        for key, rank, title, pk, field in self.entries[start : start + scan_limit]:
+            if not key.startswith(prefix):
+                break
+            matches.append((rank, title, pk, field))
+        matches.sort()
+
+        results, seen = [], set()
+        for rank, title, pk, field in matches:
+            if pk in seen:
+                continue
+            seen.add(pk)
+            results.append({"id": pk, "title": title, "field": field})
+            if len(results) == limit:
+                break
+        return results
+
+
+_index = None
+_index_version = None
+_index_built_at = 0.0
+_lock = threading.Lock()
+
+
+def get_index():
+    """
+    Returns this process's index, rebuilding it when the catalog version
+    changes. It's also rebuilt every SUGGEST_INDEX_MAX_AGE seconds, since
+    with a per-process cache other workers' version bumps aren't visible.
+    """
+    global _index, _index_version, _index_built_at
+
+    version = get_catalog_version()
+    fresh = time.monotonic() - _index_built_at < settings.SUGGEST_INDEX_MAX_AGE
+    if _index is not None and _index_version == version and fresh:
+        return _index
+
+    with _lock:
+        if _index is None or _index_version != version or not fresh:
+            _index = SuggestIndex(
+                Internship.objects.values_list("pk", "title", "field")
+            )
+            _index_version = version
+            _index_built_at = time.monotonic()
+    return _index
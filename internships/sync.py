@@ -0,0 +1,81 @@
+# internships/sync.py
+
+from datetime import timedelta, timezone as dt_timezone
+
+from django.conf import settings
+from django.db.models import Exists, OuterRef, Q
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+from rest_framework import exceptions, serializers
+
+from .models import Submission, Tombstone
+
+# Delta sync: a client that already holds a list passes the `server_time`
+# from its previous response as `?changed_since=` and gets back only the rows
+# created or modified since then, plus the ids deleted since then:
+#
+#     {"results": [...], "deleted": [3, 17], "server_time": "..."}
+#
+# Tombstones are only kept for SYNC_TOMBSTONE_RETENTION_DAYS; an older
+# cursor gets 410 Gone and the client falls back to a full fetch.
+
+
+class SyncCursorExpired(exceptions.APIException):
+    status_code = 410
+    default_detail = "changed_since is older than the sync window; do a full sync."
+    default_code = "sync_cursor_expired"
+
+
+def parse_changed_since(query_params):
+    """
+    Returns the `changed_since` query parameter as an aware datetime, or None
+    if it wasn't given. Naive timestamps are taken as UTC.
+    """
+    value = query_params.get("changed_since")
+    if not value:
+        return None
+    # A literal "+" in the offset arrives as a space unless it was encoded.
+    since = parse_datetime(value.replace(" ", "+"))
+    if since is None:
+        raise serializers.ValidationError(
+            {"changed_since": "Expected an ISO 8601 timestamp."}
+        )
+    if timezone.is_naive(since):
+        since = timezone.make_aware(since, dt_timezone.utc)
+    window = timedelta(days=settings.SYNC_TOMBSTONE_RETENTION_DAYS)
+    if since < timezone.now() - window:
+        raise SyncCursorExpired()
+    return since
+
+
+def changed_enrollments(queryset, since):
+    """
+    Enrollments modified since `since`, including those whose submissions
+    were added or evaluated (they are nested in the enrollment payload).
+    """
+    submission_changed = Submission.objects.filter(
+        user_internship=OuterRef("pk"), updated_at__gt=since
+    )
+    return queryset.filter(Q(updated_at__gt=since) | Exists(submission_changed))
+
+
+def deleted_ids(user, kind, since):
+    return Tombstone.objects.filter(
+        user=user, kind=kind, deleted_at__gt=since
+    ).values_list("object_id", flat=True)
+
+
+def sync_payload(results, deleted, server_time):
+    return {"results": results, "deleted": list(deleted), "server_time": server_time}
+
+
+def record_deletions(kind, rows):
+    """
+    Writes tombstones for deleted rows, given as (object_id, user_id) pairs.
+    """
+    Tombstone.objects.bulk_create(
+        [
+            Tombstone(kind=kind, object_id=object_id, user_id=user_id)
+            for object_id, user_id in rows
+        ]
+    )
@@ -1,3 +1,1175 @@
-from django.test import TestCase
+import asyncio
+import json
+import socket
+import threading
+import time
+from datetime import timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from io import StringIO
+from unittest import mock
 
-# Create your tests here.
+from asgiref.sync import sync_to_async
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import connection, connections
+from django.test import AsyncRequestFactory, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import AccessToken
+
+from notifications.async_views import AsyncNotificationListView
+from notifications.models import Notification
+from users.models import CustomUser
+from . import analytics, catalog, fast_serializers, rendering, services
+from .async_views import (
+    AsyncInternshipDetailView,
+    AsyncInternshipListView,
+    AsyncMyInternshipsView,
+)
+from .jobs import check_project_links, purge_tombstones
+from .links import BlockedHost, LinkChecker, check_links, normalize_link
+from .normalize import link_hash
+from .models import (
+    IdempotencyKey,
+    Internship,
+    InternshipStats,
+    InternshipStep,
+    StatusEvent,
+    Submission,
+    Tombstone,
+    UserInternship,
+)
+from .serializers import InternshipListSerializer, UserInternshipSerializer
+
+
+class AdminQueryCountTests(TestCase):
+    """
+    Admin pages must cost the same number of queries however many rows
+    are on the page.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = CustomUser.objects.create_superuser("admin@example.com", "Admin")
+
+    def setUp(self):
+        self.client.force_login(self.admin)
+
+    def add_rows(self, count):
+        for _ in range(count):
+            n = CustomUser.objects.count()
+            user = CustomUser.objects.create_user(f"student{n}@example.com", f"S{n}")
+            internship = Internship.objects.create(
+                title=f"Internship {n}",
+                description="-",
+                field="Web Development",
+                length_days=30,
+            )
+            enrollment = UserInternship.objects.create(user=user, internship=internship)
+            Submission.objects.create(
+                user_internship=enrollment,
+                project_link=f"https://github.com/s/{n}",
+                fully_completed=True,
+                difficulty_rating="mid",
+            )
+
+    def count_queries(self, url):
+        self.client.get(url)  # warm per-process caches (content types etc.)
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        return len(queries)
+
+    def assertConstantQueries(self, url_name):
+        url = reverse(url_name)
+        self.add_rows(2)
+        small = self.count_queries(url)
+        self.add_rows(5)
+        self.assertEqual(self.count_queries(url), small)
+
+    def test_internship_changelist(self):
+        self.assertConstantQueries("admin:internships_internship_changelist")
+
+    def test_userinternship_changelist(self):
+        self.assertConstantQueries("admin:internships_userinternship_changelist")
+
+    def test_submission_changelist(self):
+        self.assertConstantQueries("admin:internships_submission_changelist")
+
+    def test_userinternship_change_form(self):
+        self.add_rows(1)
+        enrollment = UserInternship.objects.get()
+        url = reverse("admin:internships_userinternship_change", args=[enrollment.pk])
+        InternshipStep.objects.create(internship=enrollment.internship, title="1")
+        small = self.count_queries(url)
+        for n in range(5):
+            InternshipStep.objects.create(internship=enrollment.internship, title=n)
+        self.add_rows(3)
+        self.assertEqual(self.count_queries(url), small)
+
+
+class FastSerializerTests(TestCase):
+    """
+    The .values() list path must produce exactly what the DRF serializers
+    do for the same rows.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = CustomUser.objects.create_user("student@example.com", "Student")
+        cls.internships = [
+            Internship.objects.create(
+                title="With thumbnail",
+                description="-",
+                field="Web Development",
+                length_days=30,
+                thumbnail="image/upload/v1700000000/quivix/sample.jpg",
+            ),
+            Internship.objects.create(
+                title="Without thumbnail",
+                description="-",
+                field="Data Science",
+                length_days=60,
+            ),
+            Internship.objects.create(
+                title="Not enrolled", description="-", field="Design", length_days=14
+            ),
+        ]
+        steps = [
+            InternshipStep.objects.create(
+                internship=cls.internships[0], title=str(order), order=order
+            )
+            for order in (3, 1, 2)
+        ]
+        started = UserInternship.objects.create(
+            user=cls.user, internship=cls.internships[0], is_started=True
+        )
+        started.completed_steps.set(steps)
+        UserInternship.objects.create(user=cls.user, internship=cls.internships[1])
+        first = Submission.objects.create(
+            user_internship=started,
+            project_link="https://github.com/s/old",
+            fully_completed=False,
+            difficulty_rating="hard",
+        )
+        Submission.objects.filter(pk=first.pk).update(
+            submitted_at=first.submitted_at - timedelta(days=1)
+        )
+        Submission.objects.create(
+            user_internship=started,
+            project_link="https://github.com/s/new",
+            fully_completed=True,
+            difficulty_rating="mid",
+            evaluation_reason="Good work",
+        )
+
+    def test_internship_list(self):
+        queryset = Internship.objects.order_by("-created_at")
+        self.assertEqual(
+            fast_serializers.serialize_internships(queryset),
+            InternshipListSerializer(queryset, many=True).data,
+        )
+        self.assertIsNotNone(
+            fast_serializers.serialize_internships(queryset)[-1]["thumbnail"]
+        )
+
+    def test_enrollment_list(self):
+        queryset = UserInternship.objects.filter(user=self.user).order_by(
+            "-enrollment_date"
+        )
+        expected = UserInternshipSerializer(
+            queryset.prefetch_related("completed_steps", "submissions"), many=True
+        ).data
+        fast = fast_serializers.serialize_enrollments(queryset)
+        self.assertEqual(fast, expected)
+        self.assertEqual(len(fast[-1]["completed_steps"]), 3)
+        self.assertEqual(
+            fast[-1]["latest_submission"]["evaluation_reason"], "Good work"
+        )
+
+    def test_views(self):
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        response = self.client.get(reverse("my-internships"))
+        self.assertEqual(
+            response.json(),
+            UserInternshipSerializer(
+                UserInternship.objects.filter(user=self.user).order_by(
+                    "-enrollment_date"
+                ),
+                many=True,
+            ).data,
+        )
+        response = self.client.get(reverse("internship-list"), {"search": "thumbnail"})
+        self.assertEqual(len(response.json()), 2)
+
+
+class InternshipDetailProgressTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = CustomUser.objects.create_user("student@example.com", "Student")
+        cls.internship = Internship.objects.create(
+            title="Course", description="-", field="Web Development", length_days=30
+        )
+        cls.steps = [
+            InternshipStep.objects.create(
+                internship=cls.internship, title=str(order), order=order
+            )
+            for order in range(3)
+        ]
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        self.url = reverse("internship-detail", args=[self.internship.pk])
+
+    def get(self, **headers):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(self.url, headers=headers)
+        return response, len(queries)
+
+    def test_not_enrolled(self):
+        response, _ = self.get()
+        self.assertIsNone(response.json()["enrollment"])
+        self.assertEqual(
+            [step["completed"] for step in response.json()["steps"]], [False] * 3
+        )
+
+    def test_completed_steps_and_constant_queries(self):
+        enrollment = UserInternship.objects.create(
+            user=self.user, internship=self.internship
+        )
+        enrollment.completed_steps.add(self.steps[1])
+        response, small = self.get()
+        self.assertEqual(
+            response.json()["enrollment"],
+            {"id": enrollment.pk, "status": UserInternship.Status.IN_PROGRESS},
+        )
+        self.assertEqual(
+            [step["completed"] for step in response.json()["steps"]],
+            [False, True, False],
+        )
+        for order in range(3, 8):
+            InternshipStep.objects.create(
+                internship=self.internship, title=str(order), order=order
+            )
+        self.assertEqual(self.get()[1], small)
+
+    @override_settings(CACHE_IS_SHARED=True)
+    def test_catalog_bump_elsewhere_invalidates_etag(self):
+        etag = self.get()[0]["ETag"]
+        self.assertEqual(self.get(if_none_match=etag)[0].status_code, 304)
+        catalog.bump_catalog_version()
+        self.assertEqual(self.get(if_none_match=etag)[0].status_code, 200)
+
+    @override_settings(CACHE_IS_SHARED=False)
+    def test_no_validators_without_shared_cache(self):
+        response = self.get(if_none_match="*")[0]
+        self.assertEqual(response.status_code, 200)
+        self.assertNotIn("ETag", response)
+
+    @override_settings(CACHE_IS_SHARED=True)
+    def test_progress_invalidates_etag(self):
+        enrollment = UserInternship.objects.create(
+            user=self.user, internship=self.internship
+        )
+        etag = self.get()[0]["ETag"]
+        self.assertEqual(self.get(if_none_match=etag)[0].status_code, 304)
+        enrollment.completed_steps.add(self.steps[0])
+        self.assertEqual(self.get(if_none_match=etag)[0].status_code, 200)
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    """
+    /ok 200, /missing 404, /private 403, /moved 302 to /ok, /no-head 405 to
+    HEAD but 200 to GET, /slow 200 after a short delay.
+    """
+
+    def do_HEAD(self):
+        server = self.server
+        with server.lock:
+            server.hits.append((self.command, self.path, time.monotonic()))
+            server.hosts.append(self.headers["Host"])
+            server.in_flight += 1
+            server.max_in_flight = max(server.max_in_flight, server.in_flight)
+        try:
+            path = self.path.split("?")[0]
+            if path == "/slow":
+                time.sleep(0.1)
+            if path == "/moved":
+                self.send_response(302)
+                self.send_header("Location", "/ok")
+            elif path == "/no-head" and self.command == "HEAD":
+                self.send_response(405)
+            else:
+                codes = {"/missing": 404, "/private": 403}
+                self.send_response(codes.get(path, 200))
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+        finally:
+            with server.lock:
+                server.in_flight -= 1
+
+    do_GET = do_HEAD
+
+    def log_message(self, *args):
+        pass
+
+
+@override_settings(LINK_CHECK_ALLOW_PRIVATE_HOSTS=True, LINK_CHECK_HOST_INTERVAL=0)
+class LinkCheckTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.server = ThreadingHTTPServer(("127.0.0.1", 0), StubHandler)
+        cls.server.lock = threading.Lock()
+        threading.Thread(target=cls.server.serve_forever, daemon=True).start()
+        cls.base = f"http://127.0.0.1:{cls.server.server_port}"
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+        super().tearDownClass()
+
+    def setUp(self):
+        cache.clear()
+        self.server.hits = []
+        self.server.hosts = []
+        self.server.in_flight = self.server.max_in_flight = 0
+
+    def check(self, paths, **options):
+        urls = [self.base + path for path in paths]
+        results = check_links(urls, checker=LinkChecker(**options))
+        return [results[normalize_link(url)] for url in urls]
+
+    def test_statuses(self):
+        Status = Submission.LinkStatus
+        self.assertEqual(
+            self.check(["/ok", "/missing", "/private", "/moved", "/no-head"]),
+            [
+                (Status.OK, 200),
+                (Status.BROKEN, 404),
+                (Status.RESTRICTED, 403),
+                (Status.OK, 200),
+                (Status.OK, 200),
+            ],
+        )
+
+    def test_private_hosts_blocked_by_default(self):
+        self.assertEqual(
+            self.check(["/ok"], allow_private_hosts=False),
+            [(Submission.LinkStatus.BROKEN, None)],
+        )
+        self.assertEqual(self.server.hits, [])
+
+    def test_results_cached_per_normalized_url(self):
+        self.check(["/ok"])
+        self.check(["/ok/", "/ok#readme"])
+        self.assertEqual(len(self.server.hits), 1)
+
+    def test_concurrency_limit(self):
+        self.check([f"/slow?n={n}" for n in range(8)], concurrency=3)
+        self.assertEqual(len(self.server.hits), 8)
+        self.assertEqual(self.server.max_in_flight, 3)
+
+    def test_per_host_interval(self):
+        self.check([f"/ok?n={n}" for n in range(4)], host_interval=0.05)
+        starts = sorted(moment for _, _, moment in self.server.hits)
+        gaps = [later - earlier for earlier, later in zip(starts, starts[1:])]
+        self.assertGreaterEqual(min(gaps), 0.04)
+
+    def create_submission(self, path):
+        user = CustomUser.objects.create_user("student@example.com", "Student")
+        internship = Internship.objects.create(
+            title="Course", description="-", field="Web Development", length_days=30
+        )
+        enrollment = UserInternship.objects.create(user=user, internship=internship)
+        return Submission.objects.create(
+            user_internship=enrollment,
+            project_link=self.base + path,
+            fully_completed=True,
+            difficulty_rating="mid",
+        )
+
+    def test_connects_to_the_checked_address(self):
+        # example.test never resolves in real DNS, so the request can only
+        # reach the stub server through the address resolve() returned.
+        port = self.server.server_port
+        calls = []
+
+        async def resolve(checker, host, port):
+            calls.append(host)
+            return "127.0.0.1"
+
+        with mock.patch.object(LinkChecker, "resolve", resolve):
+            results = check_links(
+                [f"http://example.test:{port}/moved"], checker=LinkChecker()
+            )
+
+        self.assertEqual(list(results.values()), [(Submission.LinkStatus.OK, 200)])
+        # One lookup per request, the redirect included.
+        self.assertEqual(calls, ["example.test", "example.test"])
+        self.assertEqual(self.server.hosts, [f"example.test:{port}"] * 2)
+
+    def test_resolve_refuses_any_private_address(self):
+        def answers(*addresses):
+            return [
+                (socket.AF_INET, socket.SOCK_STREAM, 6, "", (address, 443))
+                for address in addresses
+            ]
+
+        def resolve():
+            checker = LinkChecker(allow_private_hosts=False)
+            return asyncio.run(checker.resolve("example.test", 443))
+
+        with mock.patch("socket.getaddrinfo") as getaddrinfo:
+            getaddrinfo.return_value = answers("93.184.216.34", "1.1.1.1")
+            self.assertEqual(resolve(), "93.184.216.34")
+
+            getaddrinfo.return_value = answers("93.184.216.34", "10.0.0.7")
+            with self.assertRaises(BlockedHost):
+                resolve()
+
+            getaddrinfo.side_effect = socket.gaierror
+            with self.assertRaises(BlockedHost):
+                resolve()
+
+    def test_admin_recheck_drops_cached_result(self):
+        submission = self.create_submission("/missing")
+        check_project_links()
+        self.assertEqual(len(self.server.hits), 1)
+
+        admin = CustomUser.objects.create_superuser("admin@example.com", "Admin")
+        self.client.force_login(admin)
+        self.client.post(
+            reverse("admin:internships_submission_changelist"),
+            {"action": "recheck_links", "_selected_action": [submission.pk]},
+        )
+        submission.refresh_from_db()
+        self.assertEqual(submission.link_status, Submission.LinkStatus.PENDING)
+
+        self.assertEqual(check_project_links(), 1)
+        self.assertEqual(len(self.server.hits), 2)
+
+    def test_job_updates_submissions(self):
+        submission = self.create_submission("/missing")
+        self.assertEqual(submission.link_status, Submission.LinkStatus.PENDING)
+        self.assertEqual(check_project_links(), 1)
+        submission.refresh_from_db()
+        self.assertEqual(submission.link_status, Submission.LinkStatus.BROKEN)
+        self.assertEqual(submission.link_status_code, 404)
+        self.assertEqual(check_project_links(), 0)
+
+
+class DuplicateLinkTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = CustomUser.objects.create_superuser("admin@example.com", "Admin")
+        cls.internship = Internship.objects.create(
+            title="Course", description="-", field="Web Development", length_days=30
+        )
+
+    def submit(self, email, link):
+        user = CustomUser.objects.create_user(email, email)
+        enrollment = UserInternship.objects.create(
+            user=user, internship=self.internship
+        )
+        return Submission.objects.create(
+            user_internship=enrollment,
+            project_link=link,
+            fully_completed=True,
+            difficulty_rating="mid",
+        )
+
+    def test_link_hash_normalization(self):
+        self.assertEqual(
+            link_hash("https://github.com/Ann/Todo.git/"),
+            link_hash("http://www.github.com/ann/todo?tab=readme#top"),
+        )
+        self.assertNotEqual(
+            link_hash("https://github.com/ann/todo"),
+            link_hash("https://github.com/ann/todo-app"),
+        )
+
+    def test_admin_shared_link_count_and_filter(self):
+        first = self.submit("a@example.com", "https://github.com/ann/todo")
+        self.submit("b@example.com", "https://github.com/Ann/todo.git")
+        unique = self.submit("c@example.com", "https://github.com/cat/app")
+        self.assertEqual(first.project_link_hash, link_hash(first.project_link))
+
+        self.client.force_login(self.admin)
+        url = reverse("admin:internships_submission_changelist")
+        response = self.client.get(url)
+        counts = {
+            submission.pk: submission.shared_link_count
+            for submission in response.context["cl"].result_list
+        }
+        self.assertEqual(counts[first.pk], 1)
+        self.assertEqual(counts[unique.pk], 0)
+        response = self.client.get(url, {"shared_link": "yes"})
+        self.assertEqual(len(response.context["cl"].result_list), 2)
+        response = self.client.get(url, {"shared_link": "no"})
+        self.assertEqual(
+            [submission.pk for submission in response.context["cl"].result_list],
+            [unique.pk],
+        )
+
+
+class BootstrapTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = CustomUser.objects.create_user("student@example.com", "Student")
+        cls.internship = Internship.objects.create(
+            title="Course", description="-", field="Web Development", length_days=30
+        )
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def bootstrap(self):
+        response = self.client.get(reverse("bootstrap"))
+        self.assertEqual(response.status_code, 200)
+        return response.json()
+
+    def assert_reflects_writes(self):
+        self.assertEqual(self.bootstrap()["enrollments"], [])
+        enrollment = services.enroll(self.user, self.internship.pk)
+        self.assertEqual(
+            [row["status"] for row in self.bootstrap()["enrollments"]],
+            [UserInternship.Status.IN_PROGRESS],
+        )
+        services.submit(
+            UserInternship.objects.select_related("internship").get(pk=enrollment.pk),
+            {
+                "project_link": "https://github.com/s/app",
+                "fully_completed": True,
+                "difficulty_rating": "mid",
+            },
+        )
+        data = self.bootstrap()
+        self.assertEqual(
+            [row["status"] for row in data["enrollments"]],
+            [UserInternship.Status.AWAITING_EVALUATION],
+        )
+        unread = data["unread_notifications"]
+        Notification.objects.create(user=self.user, message="Hello")
+        self.assertEqual(self.bootstrap()["unread_notifications"], unread + 1)
+
+    @override_settings(CACHE_IS_SHARED=True)
+    def test_sections_invalidated_by_writes(self):
+        self.assert_reflects_writes()
+        version = self.bootstrap()["catalog_version"]
+        Internship.objects.create(
+            title="Other", description="-", field="Web Development", length_days=30
+        )
+        self.assertNotEqual(self.bootstrap()["catalog_version"], version)
+        with CaptureQueriesContext(connection) as queries:
+            self.bootstrap()
+        self.assertEqual(len(queries), 0)
+
+    @override_settings(CACHE_IS_SHARED=False)
+    def test_not_cached_without_shared_cache(self):
+        self.assert_reflects_writes()
+        # Per-worker versions would disagree between workers.
+        data = self.bootstrap()
+        self.assertIsNone(data["catalog_version"])
+        self.assertIsNone(data["versions"])
+        # Rows written without signals (e.g. by another tool) still show up.
+        Notification.objects.bulk_create([Notification(user=self.user, message="x")])
+        unread = self.bootstrap()["unread_notifications"]
+        Notification.objects.bulk_create([Notification(user=self.user, message="y")])
+        self.assertEqual(self.bootstrap()["unread_notifications"], unread + 1)
+
+
+class DatabasePoolStatsTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.staff = CustomUser.objects.create_superuser("admin@example.com", "Admin")
+        cls.student = CustomUser.objects.create_user("student@example.com", "Student")
+
+    def setUp(self):
+        self.client = APIClient()
+        self.url = reverse("db-pool-stats")
+
+    def test_staff_only(self):
+        self.assertEqual(self.client.get(self.url).status_code, 401)
+        self.client.force_authenticate(self.student)
+        self.assertEqual(self.client.get(self.url).status_code, 403)
+
+    def test_without_pool(self):
+        self.client.force_authenticate(self.staff)
+
+        response = self.client.get(self.url)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json(), {"pooled": False, "pools": {"default": None}})
+
+    def test_with_pool(self):
+        pool = mock.Mock()
+        pool.get_stats.return_value = {"pool_size": 4, "pool_available": 3}
+        self.client.force_authenticate(self.staff)
+
+        with mock.patch.object(
+            type(connections["default"]),
+            "pool",
+            new_callable=mock.PropertyMock,
+            return_value=pool,
+        ):
+            response = self.client.get(self.url)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            response.json(),
+            {
+                "pooled": True,
+                "pools": {"default": {"pool_size": 4, "pool_available": 3}},
+            },
+        )
+
+
+class ApplyInternshipTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = CustomUser.objects.create_user("student@example.com", "Student")
+        cls.internship = Internship.objects.create(
+            title="Course", description="-", field="Web Development", length_days=30
+        )
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def apply(self, pk=None, key=None):
+        url = reverse("internship-apply", args=[pk or self.internship.pk])
+        headers = {"Idempotency-Key": key} if key else {}
+        return self.client.post(url, headers=headers)
+
+    def test_apply_and_duplicate(self):
+        response = self.apply()
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response.json()["internship"]["id"], self.internship.pk)
+        self.assertEqual(response.json()["status"], UserInternship.Status.IN_PROGRESS)
+        self.assertEqual(self.apply().status_code, 400)
+        self.assertEqual(UserInternship.objects.count(), 1)
+
+    def test_missing_internship(self):
+        self.assertEqual(self.apply(pk=999999).status_code, 404)
+        self.assertFalse(UserInternship.objects.exists())
+
+    def test_idempotent_replay(self):
+        first = self.apply(key="abc")
+        self.assertEqual(first.status_code, 201)
+        replay = self.apply(key="abc")
+        self.assertEqual(replay.status_code, 201)
+        self.assertEqual(replay["Idempotent-Replayed"], "true")
+        self.assertEqual(replay.json(), first.json())
+        self.assertEqual(UserInternship.objects.count(), 1)
+        # A different key is a new request, which is a duplicate application.
+        self.assertEqual(self.apply(key="def").status_code, 400)
+
+    def test_failed_request_releases_key(self):
+        self.assertEqual(self.apply(pk=999999, key="abc").status_code, 404)
+        self.assertFalse(IdempotencyKey.objects.exists())
+
+    def test_in_flight_conflict(self):
+        # As if another worker were still handling the first request.
+        IdempotencyKey.objects.create(
+            user=self.user, request=f"apply:{self.internship.pk}", key="abc"
+        )
+        response = self.apply(key="abc")
+        self.assertEqual(response.status_code, 409)
+        self.assertFalse(UserInternship.objects.exists())
+
+    def test_abandoned_claim_is_taken_over(self):
+        record = IdempotencyKey.objects.create(
+            user=self.user, request=f"apply:{self.internship.pk}", key="abc"
+        )
+        IdempotencyKey.objects.filter(pk=record.pk).update(
+            created_at=record.created_at - timedelta(minutes=5)
+        )
+        self.assertEqual(self.apply(key="abc").status_code, 201)
+
+
+class SubmitInternshipTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = CustomUser.objects.create_user("student@example.com", "Student")
+        cls.internship = Internship.objects.create(
+            title="Course", description="-", field="Web Development", length_days=30
+        )
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        self.enrollment = services.enroll(self.user, self.internship.pk)
+
+    def submit(self):
+        return self.client.post(
+            reverse("internship-submit", args=[self.enrollment.pk]),
+            {
+                "project_link": "https://github.com/s/app",
+                "fully_completed": True,
+                "difficulty_rating": "mid",
+            },
+        )
+
+    def test_submit_once(self):
+        # Enrollment and its completed steps, then services.submit()'s five
+        # statements inside a savepoint.
+        with self.assertNumQueries(2 + 5 + 2):
+            response = self.submit()
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(
+            response.json()["status"], UserInternship.Status.AWAITING_EVALUATION
+        )
+
+        self.assertEqual(self.submit().status_code, 400)
+        self.assertEqual(Submission.objects.count(), 1)
+        self.assertEqual(StatusEvent.objects.count(), 1)
+
+    def test_stale_status_loses(self):
+        first = UserInternship.objects.select_related("internship").get(
+            pk=self.enrollment.pk
+        )
+        stale = UserInternship.objects.select_related("internship").get(
+            pk=self.enrollment.pk
+        )
+        data = {
+            "project_link": "https://github.com/s/app",
+            "fully_completed": True,
+            "difficulty_rating": "mid",
+        }
+        self.assertIsNotNone(services.submit(first, data))
+
+        with self.assertNumQueries(3):
+            self.assertIsNone(services.submit(stale, data))
+        self.assertEqual(Submission.objects.count(), 1)
+        self.assertEqual(StatusEvent.objects.count(), 1)
+
+    def test_rejection_notification_includes_reason(self):
+        self.submit()
+        Submission.objects.update(evaluation_reason="The README is missing.")
+        enrollment = UserInternship.objects.get(pk=self.enrollment.pk)
+        enrollment.status = UserInternship.Status.REJECTED
+        enrollment.save()
+
+        self.assertIn(
+            "Reason: The README is missing.",
+            Notification.objects.get(message__contains="needs revision").message,
+        )
+
+
+class StepRenderingTests(TestCase):
+    def test_scripts_and_handlers_removed(self):
+        html = rendering.render_markdown(
+            'Intro\n\n<script>alert("x")</script>\n\n'
+            '<img src="https://example.com/a.png" onerror="alert(1)">'
+        )
+        self.assertNotIn("<script", html)
+        self.assertNotIn("alert", html)
+        self.assertIn('<img src="https://example.com/a.png">', html)
+
+    def test_javascript_urls_removed(self):
+        html = rendering.render_markdown("[click](javascript:alert(1))")
+        self.assertNotIn("javascript:", html)
+        self.assertIn("click", html)
+
+    def test_allowed_markup_kept(self):
+        html = rendering.render_markdown(
+            "## Setup\n\n**Run** `npm install`, see [docs](https://example.com).\n\n"
+            "| a | b |\n|---|---|\n| 1 | 2 |"
+        )
+        for tag in ("<h2>", "<strong>", "<code>", "<table>", "<td>"):
+            self.assertIn(tag, html)
+        self.assertIn(
+            '<a href="https://example.com" rel="noopener noreferrer nofollow">', html
+        )
+
+    def test_rendered_on_save_when_content_changes(self):
+        internship = Internship.objects.create(
+            title="Course", description="-", field="Web Development", length_days=30
+        )
+        step = InternshipStep.objects.create(
+            internship=internship, title="Intro", content="*Hello*"
+        )
+        self.assertEqual(step.content_html, "<p><em>Hello</em></p>")
+
+        self.assertFalse(rendering.render_step(step))
+        step.content = "**Bye**"
+        step.save()
+        step.refresh_from_db()
+        self.assertEqual(step.content_html, "<p><strong>Bye</strong></p>")
+
+        # Rows written without save() are picked up by the command.
+        InternshipStep.objects.filter(pk=step.pk).update(content="Plain")
+        out = StringIO()
+        call_command("render_step_content", stdout=out)
+        step.refresh_from_db()
+        self.assertEqual(step.content_html, "<p>Plain</p>")
+        self.assertIn("Rendered 1 of 1", out.getvalue())
+
+
+class DeltaSyncTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = CustomUser.objects.create_user("student@example.com", "Student")
+        cls.internships = [
+            Internship.objects.create(
+                title=f"Course {n}",
+                description="-",
+                field="Web Development",
+                length_days=30,
+            )
+            for n in range(3)
+        ]
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        self.enrollments = [
+            UserInternship.objects.create(user=self.user, internship=internship)
+            for internship in self.internships
+        ]
+
+    def get(self, url_name, since):
+        return self.client.get(reverse(url_name), {"changed_since": since.isoformat()})
+
+    def test_changes_and_deletions_since_cursor(self):
+        since = timezone.now()
+        changed, deleted, _ = self.enrollments
+        changed.status = UserInternship.Status.ACCEPTED
+        changed.save()
+        notification = Notification.objects.get(related_internship=changed)
+        doomed = Notification.objects.create(
+            user=self.user, message="x", related_internship=deleted
+        )
+        deleted_id = deleted.pk
+        deleted.delete()
+
+        data = self.get("my-internships", since).json()
+        self.assertEqual([row["id"] for row in data["results"]], [changed.pk])
+        self.assertEqual(data["deleted"], [deleted_id])
+
+        # The enrollment's notifications were cascade-deleted with it.
+        data = self.get("notification-list", since).json()
+        self.assertEqual([row["id"] for row in data["results"]], [notification.pk])
+        self.assertEqual(data["deleted"], [doomed.pk])
+
+    def test_unencoded_plus_offset(self):
+        since = timezone.now().isoformat()
+        response = self.client.get(
+            reverse("my-internships") + f"?changed_since={since}"
+        )
+        self.assertEqual(response.status_code, 200)
+
+    def test_bad_timestamp(self):
+        response = self.client.get(
+            reverse("my-internships"), {"changed_since": "yesterday"}
+        )
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("changed_since", response.json())
+
+    @override_settings(SYNC_TOMBSTONE_RETENTION_DAYS=30)
+    def test_expired_cursor(self):
+        response = self.get("my-internships", timezone.now() - timedelta(days=31))
+        self.assertEqual(response.status_code, 410)
+        self.assertIn("full sync", response.json()["detail"])
+
+    def test_deleting_user_with_enrollments(self):
+        Notification.objects.create(
+            user=self.user, message="x", related_internship=self.enrollments[0]
+        )
+
+        self.user.delete()
+        # Foreign keys are checked at commit, which a TestCase never reaches.
+        with connection.cursor() as cursor:
+            cursor.execute("SET CONSTRAINTS ALL IMMEDIATE")
+
+        self.assertFalse(UserInternship.objects.exists())
+        self.assertFalse(Tombstone.objects.exists())
+
+    def test_old_tombstones_purged(self):
+        old, recent, _ = self.enrollments
+        old.delete()
+        Tombstone.objects.update(deleted_at=timezone.now() - timedelta(days=31))
+        recent_id = recent.pk
+        recent.delete()
+
+        with override_settings(SYNC_TOMBSTONE_RETENTION_DAYS=30):
+            self.assertEqual(purge_tombstones(), 1)
+        self.assertEqual(
+            list(Tombstone.objects.values_list("object_id", flat=True)),
+            [recent_id],
+        )
+
+
+class InternshipStatsTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.internship = Internship.objects.create(
+            title="Course", description="-", field="Web Development", length_days=30
+        )
+        cls.students = [
+            CustomUser.objects.create_user(f"s{n}@example.com", f"S{n}")
+            for n in range(4)
+        ]
+
+    def counters(self):
+        return InternshipStats.objects.filter(internship=self.internship).values(
+            *(
+                f.name
+                for f in InternshipStats._meta.concrete_fields
+                if f.name not in ("internship", "updated_at")
+            )
+        )[0]
+
+    def test_incremental_rollup_matches_rebuild(self):
+        data = {
+            "project_link": "https://github.com/s/app",
+            "fully_completed": True,
+            "difficulty_rating": "hard",
+        }
+        enrollments = [
+            services.enroll(student, self.internship.pk)
+            for student in self.students[:3]
+        ]
+        UserInternship.objects.create(user=self.students[3], internship=self.internship)
+        for enrollment in enrollments[:2]:
+            services.submit(enrollment, data)
+        accepted, rejected, dropped = (
+            UserInternship.objects.get(pk=enrollment.pk) for enrollment in enrollments
+        )
+        accepted.status = UserInternship.Status.ACCEPTED
+        accepted.save()
+        rejected.status = UserInternship.Status.REJECTED
+        rejected.save()
+        dropped.delete()
+
+        incremental = self.counters()
+        self.assertEqual(incremental["enrolled_count"], 3)
+        self.assertEqual(incremental["accepted_count"], 1)
+        self.assertEqual(incremental["difficulty_hard_count"], 2)
+
+        InternshipStats.objects.update(enrolled_count=0, submission_count=0)
+        self.assertEqual(analytics.rebuild_stats(), 1)
+        self.assertEqual(self.counters(), incremental)
+
+    def test_decrement_of_drifted_counter_stops_at_zero(self):
+        enrollment = services.enroll(self.students[0], self.internship.pk)
+        InternshipStats.objects.update(enrolled_count=0, in_progress_count=0)
+
+        UserInternship.objects.get(pk=enrollment.pk).delete()
+
+        self.assertEqual(self.counters()["enrolled_count"], 0)
+        self.assertEqual(self.counters()["in_progress_count"], 0)
+
+    def test_rebuild_locks_the_rollup_rows(self):
+        with CaptureQueriesContext(connection) as queries:
+            analytics.rebuild_stats()
+
+        self.assertTrue(
+            any(
+                "internships_internshipstats" in query["sql"]
+                and "FOR UPDATE" in query["sql"]
+                for query in queries
+            )
+        )
+
+    def test_stats_endpoint_is_staff_only(self):
+        client = APIClient()
+        client.force_authenticate(self.students[0])
+        url = reverse("internship-stats-detail", args=[self.internship.pk])
+        self.assertEqual(client.get(url).status_code, 403)
+
+        client.force_authenticate(
+            CustomUser.objects.create_superuser("admin@example.com", "Admin")
+        )
+        response = client.get(url)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["enrolled_count"], 0)
+
+
+class AsyncReadViewTests(TestCase):
+    """
+    The async variants must return the same JSON as the sync views they
+    replace under ASYNC_READ_VIEWS.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = CustomUser.objects.create_user("student@example.com", "Student")
+        cls.internships = [
+            Internship.objects.create(
+                title=f"Course {n}",
+                description="-",
+                field="Web Development",
+                length_days=30,
+            )
+            for n in range(2)
+        ]
+        enrollment = UserInternship.objects.create(
+            user=cls.user, internship=cls.internships[0]
+        )
+        enrollment.status = UserInternship.Status.REJECTED
+        enrollment.save()
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        self.factory = AsyncRequestFactory()
+        self.token = str(AccessToken.for_user(self.user))
+
+    async def call(self, view, path, authenticated=True, **kwargs):
+        headers = {"Authorization": f"Bearer {self.token}"} if authenticated else {}
+        request = self.factory.get(path, headers=headers)
+        return await view.as_view()(request, **kwargs)
+
+    async def test_same_json_as_sync_views(self):
+        detail = reverse("internship-detail", args=[self.internships[0].pk])
+        cases = [
+            (AsyncInternshipListView, reverse("internship-list"), {}),
+            (AsyncInternshipDetailView, detail, {"pk": self.internships[0].pk}),
+            (AsyncMyInternshipsView, reverse("my-internships"), {}),
+            (AsyncNotificationListView, reverse("notification-list"), {}),
+        ]
+        for view, path, kwargs in cases:
+            with self.subTest(view.__name__):
+                expected = await sync_to_async(self.client.get)(path)
+                response = await self.call(view, path, **kwargs)
+                self.assertEqual(response.status_code, 200)
+                self.assertEqual(json.loads(response.content), expected.json())
+
+    async def test_errors(self):
+        response = await self.call(
+            AsyncMyInternshipsView, reverse("my-internships"), authenticated=False
+        )
+        self.assertEqual(response.status_code, 401)
+        self.assertIn("Bearer", response["WWW-Authenticate"])
+
+        response = await self.call(
+            AsyncInternshipDetailView, reverse("internship-detail", args=[0]), pk=0
+        )
+        self.assertEqual(response.status_code, 404)
+        self.assertIn("detail", json.loads(response.content))
+
+
+class SuggestTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.web = Internship.objects.create(
+            title="Web Development Bootcamp",
+            description="-",
+            field="Web Development",
+            length_days=30,
+        )
+        self.game = Internship.objects.create(
+            title="Devops for Games",
+            description="-",
+            field="Game Development",
+            length_days=30,
+        )
+
+    def suggest(self, query, **params):
+        response = self.client.get(
+            reverse("internship-suggest"), {"q": query, **params}
+        )
+        self.assertEqual(response.status_code, 200)
+        return [row["id"] for row in response.json()]
+
+    def test_ranking_and_word_prefixes(self):
+        # A title start outranks a later word in another title.
+        self.assertEqual(self.suggest("dev"), [self.game.pk, self.web.pk])
+        self.assertEqual(self.suggest("  BOOT "), [self.web.pk])
+        self.assertEqual(self.suggest("game dev"), [self.game.pk])
+        self.assertEqual(self.suggest("dev", limit=1), [self.game.pk])
+        self.assertEqual(self.suggest(""), [])
+
+    def test_rebuilt_after_catalog_change(self):
+        with CaptureQueriesContext(connection) as queries:
+            self.suggest("dev")
+            self.suggest("web")
+        self.assertLessEqual(len(queries), 1)
+
+        mobile = Internship.objects.create(
+            title="Mobile Basics",
+            description="-",
+            field="Web Development",
+            length_days=30,
+        )
+        self.assertEqual(self.suggest("mob"), [mobile.pk])
+
+
+class CatalogFacetTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        for title, field, length_days in [
+            ("A", "Web Development", 10),
+            ("B", "Web Development", 45),
+            ("C", "Data Science / AI", 90),
+        ]:
+            Internship.objects.create(
+                title=title, description="-", field=field, length_days=length_days
+            )
+
+    def catalog(self, **params):
+        response = self.client.get(reverse("internship-list"), params)
+        self.assertEqual(response.status_code, 200)
+        return response.json()
+
+    def test_field_filter(self):
+        self.assertEqual(
+            [row["title"] for row in self.catalog(field="Web Development")],
+            ["B", "A"],
+        )
+        self.assertEqual(len(self.catalog()), 3)
+
+    @override_settings(CACHE_IS_SHARED=True)
+    def test_facets_are_catalog_wide_and_cached(self):
+        data = self.catalog(field="Data Science / AI", facets="true")
+
+        self.assertEqual([row["title"] for row in data["results"]], ["C"])
+        fields = {row["value"]: row["count"] for row in data["facets"]["field"]}
+        self.assertEqual(fields["Web Development"], 2)
+        self.assertEqual(fields["Data Science / AI"], 1)
+        self.assertEqual(fields["Game Development"], 0)
+        self.assertEqual(
+            data["facets"]["length"],
+            [
+                {"value": "1-14", "count": 1},
+                {"value": "15-30", "count": 0},
+                {"value": "31-60", "count": 1},
+                {"value": "61+", "count": 1},
+            ],
+        )
+
+        # Served from the cache until the catalog changes.
+        with CaptureQueriesContext(connection) as queries:
+            self.catalog(facets="true")
+        self.assertEqual(len(queries), 1)
+        Internship.objects.create(
+            title="D", description="-", field="Game Development", length_days=20
+        )
+        data = self.catalog(facets="true")
+        self.assertEqual(data["facets"]["length"][1], {"value": "15-30", "count": 1})
+
+    @override_settings(CACHE_IS_SHARED=False, CATALOG_FACETS_MAX_AGE=0)
+    def test_facets_expire_without_shared_cache(self):
+        self.catalog(facets="true")
+        # As if another worker added it: its version bump isn't seen here.
+        Internship.objects.bulk_create(
+            [
+                Internship(
+                    title="D", description="-", field="Game Development", length_days=20
+                )
+            ]
+        )
+        fields = {
+            row["value"]: row["count"]
+            for row in self.catalog(facets="true")["facets"]["field"]
+        }
+        self.assertEqual(fields["Game Development"], 1)
@@ -1,17 +1,36 @@
 # internships/urls.py
 
+from django.conf import settings
 from django.urls import path
+from .async_views import (
+    AsyncInternshipListView, AsyncInternshipDetailView, AsyncMyInternshipsView
+)
 from .views import (
-    InternshipListView, InternshipDetailView, ApplyInternshipView,
-    MyInternshipsView, SubmitInternshipView, UpdateInternshipProgressView # <-- IMPORT the new view
+    InternshipListView, InternshipDetailView, ApplyInternshipView, InternshipSuggestView,
+    MyInternshipsView, SubmitInternshipView, UpdateInternshipProgressView, # <-- IMPORT the new view
+    InternshipStatsListView, InternshipStatsDetailView,
+    InternshipThumbnailUploadSignatureView, InternshipThumbnailConfirmView
 )
 
+# Hot read endpoints switch to their async variants when served under ASGI.
+if settings.ASYNC_READ_VIEWS:
+    InternshipListView = AsyncInternshipListView
+    InternshipDetailView = AsyncInternshipDetailView
+    MyInternshipsView = AsyncMyInternshipsView
+
 urlpatterns = [
     path('', InternshipListView.as_view(), name='internship-list'),
+    path('suggest/', InternshipSuggestView.as_view(), name='internship-suggest'),
     path('<int:pk>/', InternshipDetailView.as_view(), name='internship-detail'),
     path('<int:pk>/apply/', ApplyInternshipView.as_view(), name='internship-apply'),
     path('my-internships/', MyInternshipsView.as_view(), name='my-internships'),
     # --- ADD THIS NEW URL PATTERN, MY LOVE! ---
     path('my-internships/<int:pk>/progress/', UpdateInternshipProgressView.as_view(), name='internship-progress-update'),
     path('my-internships/<int:pk>/submit/', SubmitInternshipView.as_view(), name='internship-submit'),
+    # Staff analytics, served from the InternshipStats rollup
+    path('stats/', InternshipStatsListView.as_view(), name='internship-stats-list'),
+    path('<int:pk>/stats/', InternshipStatsDetailView.as_view(), name='internship-stats-detail'),
+    # Staff: direct-to-Cloudinary thumbnail uploads
+    path('<int:pk>/thumbnail/sign/', InternshipThumbnailUploadSignatureView.as_view(), name='internship-thumbnail-sign'),
+    path('<int:pk>/thumbnail/confirm/', InternshipThumbnailConfirmView.as_view(), name='internship-thumbnail-confirm'),
 ]
\ No newline at end of file
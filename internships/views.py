@@ -1,52 +1,230 @@
 # internships/views.py
 
+from datetime import timedelta
+
+from django.db import IntegrityError, transaction
+from django.db.models import Exists, OuterRef, Prefetch, Subquery
+from django.utils import timezone
+from django.utils.decorators import method_decorator
+from django.views.decorators.cache import cache_control
 from rest_framework import generics, permissions, status
 from rest_framework.filters import SearchFilter
 from rest_framework.response import Response
 from rest_framework.views import APIView
-from .models import Internship, UserInternship, Submission, InternshipStep
+from quivix_internships.uploads import UploadConfirmSerializer, sign_upload
+from users.cache import (
+    ENROLLMENTS,
+    get_user_version,
+    version_datetime,
+    versioned_condition,
+)
+from . import catalog, fast_serializers, services, suggest, sync
+from .models import (
+    IdempotencyKey,
+    Internship,
+    InternshipStats,
+    UserInternship,
+    Submission,
+    InternshipStep,
+    Tombstone,
+)
 from .serializers import (
     InternshipListSerializer,
     InternshipDetailSerializer,
+    InternshipStatsSerializer,
     UserInternshipSerializer,
     SubmissionSerializer,
 )
 
 
 class InternshipListView(generics.ListAPIView):
+    """
+    The public catalog. Supports `?search=`, exact `?field=` filtering, and
+    `?facets=true`, which wraps the list as {"results": [...], "facets": {...}}
+    with catalog-wide counts per field and length bucket.
+    """
+
     queryset = Internship.objects.all().order_by("-created_at")
     serializer_class = InternshipListSerializer
     permission_classes = [permissions.AllowAny]
     filter_backends = [SearchFilter]
     search_fields = ["title", "description", "field"]
 
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        return catalog.filter_catalog(queryset, self.request.query_params)
+
+    def list(self, request, *args, **kwargs):
+        # Read-only and unpaginated, so rows skip the serializer entirely
+        # (see internships/fast_serializers.py).
+        queryset = self.filter_queryset(self.get_queryset())
+        data = fast_serializers.serialize_internships(queryset)
+        if wants_facets(request.query_params):
+            data = {"results": data, "facets": catalog.get_facets()}
+        return Response(data)
+
+
+def wants_facets(query_params):
+    return query_params.get("facets", "").lower() in ("true", "1")
+
+
+class InternshipSuggestView(APIView):
+    """
+    Typeahead for internship titles and fields, served from the in-process
+    prefix index in suggest.py: `?q=<prefix>&limit=<n>`.
+    """
+
+    permission_classes = [permissions.AllowAny]
+    max_limit = 20
+
+    def get(self, request):
+        query = request.query_params.get("q", "")
+        try:
+            limit = min(int(request.query_params.get("limit", 8)), self.max_limit)
+        except ValueError:
+            limit = 8
+        return Response(suggest.get_index().search(query, limit=max(limit, 1)))
+
+
+def internship_etag(request, pk):
+    # The catalog version changes with any internship or step edit, and the
+    # user's enrollments version with their progress, so together they
+    # validate every detail page without touching the database.
+    return "internship-{}-{}-{}".format(
+        pk,
+        catalog.get_catalog_version(),
+        get_user_version(request.user.pk, ENROLLMENTS),
+    )
+
+
+def internship_last_modified(request, pk):
+    return max(
+        version_datetime(catalog.get_catalog_version()),
+        version_datetime(get_user_version(request.user.pk, ENROLLMENTS)),
+    )
+
+
+def internship_detail_queryset(user):
+    """
+    Internships annotated with `user`'s enrollment id and status, with their
+    steps annotated `completed`: one EXISTS per step against the
+    completed_steps through table, so the page costs two queries however
+    many steps there are.
+    """
+    enrollment = UserInternship.objects.filter(user=user, internship=OuterRef("pk"))
+    completed = UserInternship.completed_steps.through.objects.filter(
+        internshipstep_id=OuterRef("pk"),
+        userinternship__user=user,
+        userinternship__internship_id=OuterRef("internship_id"),
+    )
+    return Internship.objects.annotate(
+        enrollment_id=Subquery(enrollment.values("pk")[:1]),
+        enrollment_status=Subquery(enrollment.values("status")[:1]),
+    ).prefetch_related(
+        Prefetch(
+            "steps",
+            queryset=InternshipStep.objects.annotate(completed=Exists(completed)),
+        )
+    )
 
+
+# Validators only; clients must still revalidate before reusing a response.
+conditional_internship = [
+    cache_control(private=True, no_cache=True),
+    versioned_condition(
+        etag_func=internship_etag, last_modified_func=internship_last_modified
+    ),
+]
+
+
+@method_decorator(conditional_internship, name="get")
 class InternshipDetailView(generics.RetrieveAPIView):
-    queryset = Internship.objects.all().prefetch_related("steps")
+    """
+    Answers If-None-Match / If-Modified-Since with 304 Not Modified from the
+    catalog and enrollments versions alone, when the cache is shared.
+    """
+
     serializer_class = InternshipDetailSerializer
     permission_classes = [permissions.IsAuthenticated]
 
+    def get_queryset(self):
+        return internship_detail_queryset(self.request.user)
+
 
 class ApplyInternshipView(APIView):
+    """
+    Enrolls the user with a single INSERT ... ON CONFLICT DO NOTHING.
+    Clients may send an `Idempotency-Key` header; a retried request with the
+    same key gets the original 201 response replayed instead of an error.
+    Keys are IdempotencyKey rows, so this holds across workers.
+    """
+
     permission_classes = [permissions.IsAuthenticated]
+    pending_timeout = 60
 
     def post(self, request, pk):
+        idempotency_key = request.headers.get("Idempotency-Key")
+        if not idempotency_key:
+            return self.apply(request, pk)
+
+        record, replay = self.claim(request.user, f"apply:{pk}", idempotency_key)
+        if replay is not None:
+            return replay
+        response = self.apply(request, pk)
+        if status.is_success(response.status_code):
+            record.response_status = response.status_code
+            record.response_data = response.data
+            record.save(update_fields=["response_status", "response_data"])
+        else:
+            record.delete()
+        return response
+
+    def claim(self, user, action, key):
+        """
+        Claims `key` with a unique row, so concurrent duplicates (on any
+        worker) can't both run. Returns (record, None) when this request
+        should go ahead, or (None, response) with the replayed response or a
+        409 while the first request is still in flight.
+        """
         try:
-            internship = Internship.objects.get(pk=pk)
-        except Internship.DoesNotExist:
-            return Response(
-                {"error": "Internship not found."}, status=status.HTTP_404_NOT_FOUND
-            )
-        if UserInternship.objects.filter(
-            user=request.user, internship=internship
-        ).exists():
+            with transaction.atomic():
+                return (
+                    IdempotencyKey.objects.create(user=user, request=action, key=key),
+                    None,
+                )
+        except IntegrityError:
+            pass
+        record = IdempotencyKey.objects.filter(
+            user=user, request=action, key=key
+        ).first()
+        if record is not None and record.response_status is not None:
+            response = Response(record.response_data, status=record.response_status)
+            response["Idempotent-Replayed"] = "true"
+            return None, response
+        # A claim left pending by a request that died is taken over.
+        stale = timezone.now() - timedelta(seconds=self.pending_timeout)
+        if record is not None and IdempotencyKey.objects.filter(
+            pk=record.pk, response_status=None, created_at__lt=stale
+        ).update(created_at=timezone.now()):
+            return record, None
+        return None, Response(
+            {"error": "A request with this Idempotency-Key is in progress."},
+            status=status.HTTP_409_CONFLICT,
+        )
+
+    def apply(self, request, pk):
+        user_internship = services.enroll(request.user, pk)
+        if user_internship is None:
+            # Nothing was inserted; find out why (only on the error path).
+            if not Internship.objects.filter(pk=pk).exists():
+                return Response(
+                    {"error": "Internship not found."},
+                    status=status.HTTP_404_NOT_FOUND,
+                )
             return Response(
                 {"error": "You have already applied."},
                 status=status.HTTP_400_BAD_REQUEST,
             )
-        user_internship = UserInternship.objects.create(
-            user=request.user, internship=internship
-        )
         return Response(
             UserInternshipSerializer(user_internship).data,
             status=status.HTTP_201_CREATED,
@@ -54,14 +232,31 @@ class ApplyInternshipView(APIView):
 
 
 class MyInternshipsView(generics.ListAPIView):
+    """
+    The student's enrollments. With `?changed_since=<server_time>` only the
+    enrollments changed since then are returned, plus the ids of deleted
+    ones (see internships/sync.py).
+    """
+
     serializer_class = UserInternshipSerializer
     permission_classes = [permissions.IsAuthenticated]
 
     def get_queryset(self):
-        return (
-            UserInternship.objects.filter(user=self.request.user)
-            .order_by("-enrollment_date")
-            .prefetch_related("completed_steps", "submissions")
+        return UserInternship.objects.filter(user=self.request.user).order_by(
+            "-enrollment_date"
+        )
+
+    def list(self, request, *args, **kwargs):
+        since = sync.parse_changed_since(request.query_params)
+        if since is None:
+            return Response(fast_serializers.serialize_enrollments(self.get_queryset()))
+        server_time = timezone.now()
+        queryset = sync.changed_enrollments(self.get_queryset(), since)
+        deleted = sync.deleted_ids(request.user, Tombstone.Kind.USER_INTERNSHIP, since)
+        return Response(
+            sync.sync_payload(
+                fast_serializers.serialize_enrollments(queryset), deleted, server_time
+            )
         )
 
 
@@ -106,7 +301,11 @@ class SubmitInternshipView(APIView):
 
     def post(self, request, pk):
         try:
-            user_internship = UserInternship.objects.get(pk=pk, user=request.user)
+            user_internship = (
+                UserInternship.objects.select_related("internship")
+                .prefetch_related("completed_steps")
+                .get(pk=pk, user=request.user)
+            )
         except UserInternship.DoesNotExist:
             return Response(
                 {"error": "Enrollment not found."}, status=status.HTTP_404_NOT_FOUND
@@ -114,8 +313,7 @@ class SubmitInternshipView(APIView):
 
         # --- THE FIX FOR RESUBMISSION ---
         # Allow submission if status is 'in_progress' OR 'rejected'.
-        allowed_statuses = ["in_progress", "rejected"]
-        if user_internship.status not in allowed_statuses:
+        if user_internship.status not in services.SUBMITTABLE_STATUSES:
             return Response(
                 {
                     "error": f"Cannot submit now. Status is '{user_internship.get_status_display()}'."
@@ -125,14 +323,81 @@ class SubmitInternshipView(APIView):
 
         serializer = SubmissionSerializer(data=request.data)
         if serializer.is_valid():
-            # Create a NEW submission object.
-            serializer.save(user_internship=user_internship)
-            # ALWAYS set the status to Awaiting Evaluation after any submission.
-            user_internship.status = UserInternship.Status.AWAITING_EVALUATION
-            user_internship.save(update_fields=["status"])
+            # Create a NEW submission and move to Awaiting Evaluation atomically.
+            if services.submit(user_internship, serializer.validated_data) is None:
+                return Response(
+                    {"error": "Cannot submit now. Status changed, please refresh."},
+                    status=status.HTTP_409_CONFLICT,
+                )
             return Response(
                 UserInternshipSerializer(user_internship).data,
                 status=status.HTTP_201_CREATED,
             )
 
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+
+
+class InternshipStatsListView(generics.ListAPIView):
+    """
+    Staff-only analytics: per-internship enrollment and outcome rollups.
+    Reads only the InternshipStats table, never the fact tables.
+    """
+
+    serializer_class = InternshipStatsSerializer
+    permission_classes = [permissions.IsAdminUser]
+
+    def get_queryset(self):
+        queryset = InternshipStats.objects.select_related("internship").order_by(
+            "-enrolled_count"
+        )
+        field = self.request.query_params.get("field")
+        if field:
+            queryset = queryset.filter(internship__field=field)
+        return queryset
+
+
+class InternshipStatsDetailView(generics.RetrieveAPIView):
+    queryset = InternshipStats.objects.select_related("internship")
+    serializer_class = InternshipStatsSerializer
+    permission_classes = [permissions.IsAdminUser]
+
+
+class InternshipThumbnailUploadSignatureView(APIView):
+    """
+    Staff-only: signed parameters for uploading a thumbnail straight to Cloudinary.
+    """
+
+    permission_classes = [permissions.IsAdminUser]
+
+    def post(self, request, pk):
+        if not Internship.objects.filter(pk=pk).exists():
+            return Response(
+                {"error": "Internship not found."}, status=status.HTTP_404_NOT_FOUND
+            )
+        return Response(sign_upload(thumbnail_prefix(pk)))
+
+
+class InternshipThumbnailConfirmView(APIView):
+    permission_classes = [permissions.IsAdminUser]
+
+    def post(self, request, pk):
+        try:
+            internship = Internship.objects.get(pk=pk)
+        except Internship.DoesNotExist:
+            return Response(
+                {"error": "Internship not found."}, status=status.HTTP_404_NOT_FOUND
+            )
+        serializer = UploadConfirmSerializer(
+            data=request.data, context={"prefix": thumbnail_prefix(pk)}
+        )
+        serializer.is_valid(raise_exception=True)
+
+        internship.thumbnail = serializer.to_image()
+        internship.save(update_fields=["thumbnail"])
+        return Response(
+            InternshipListSerializer(internship).data, status=status.HTTP_200_OK
+        )
+
+
+def thumbnail_prefix(internship_id):
+    return f"internship_thumbnails/{internship_id}"
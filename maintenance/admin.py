@@ -0,0 +1,32 @@
+# maintenance/admin.py
+
+from django.contrib import admin
+from .models import JobState
+
+
+@admin.register(JobState)
+class JobStateAdmin(admin.ModelAdmin):
+    list_display = (
+        "name",
+        "last_status",
+        "last_started_at",
+        "last_duration",
+        "last_processed",
+        "run_count",
+        "failure_count",
+        "run_requested",
+    )
+    list_filter = ("last_status", "run_requested")
+    readonly_fields = [
+        field.name for field in JobState._meta.fields if field.name != "run_requested"
+    ]
+    actions = ["request_run"]
+
+    @admin.action(description="Run on the scheduler's next tick")
+    def request_run(self, request, queryset):
+        updated = queryset.update(run_requested=True)
+        self.message_user(request, f"{updated} job(s) will run on the next tick.")
+
+    def has_add_permission(self, request):
+        # Rows are created by the scheduler for jobs registered in code.
+        return False
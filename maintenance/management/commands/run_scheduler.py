@@ -0,0 +1,102 @@
+# maintenance/management/commands/run_scheduler.py
+
+import signal
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import close_old_connections, connection
+from maintenance.models import JobState
+from maintenance.registry import get_jobs
+from maintenance.scheduler import tick
+
+
+class Command(BaseCommand):
+    """
+    Runs the housekeeping scheduler. Meant for a single background worker,
+    but safe to run anywhere: only the advisory-lock holder runs jobs.
+    """
+
+    help = "Runs registered maintenance jobs on their intervals."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--interval",
+            type=float,
+            default=30,
+            help="Seconds between scheduler ticks.",
+        )
+        parser.add_argument(
+            "--once", action="store_true", help="Run a single tick and exit."
+        )
+        parser.add_argument(
+            "--run",
+            action="append",
+            dest="run",
+            metavar="JOB",
+            help="Run this job now, due or not, and exit (can be repeated).",
+        )
+        parser.add_argument(
+            "--list", action="store_true", help="List jobs and their last run."
+        )
+
+    def handle(self, *args, **options):
+        if options["list"]:
+            return self.list_jobs()
+
+        if options["run"]:
+            unknown = set(options["run"]) - set(get_jobs())
+            if unknown:
+                raise CommandError(f"Unknown job(s): {', '.join(sorted(unknown))}")
+            return self.report(tick(only=options["run"]))
+
+        if options["once"]:
+            return self.report(tick())
+
+        self.stopping = False
+        signal.signal(signal.SIGTERM, self.stop)
+        signal.signal(signal.SIGINT, self.stop)
+        self.stdout.write(f"Scheduler started ({len(get_jobs())} jobs).")
+        while not self.stopping:
+            self.report(tick(), quiet=True)
+            # Don't hold a (possibly stale) connection between ticks.
+            close_old_connections()
+            connection.close()
+            deadline = time.monotonic() + options["interval"]
+            while not self.stopping and time.monotonic() < deadline:
+                time.sleep(min(1, options["interval"]))
+        self.stdout.write("Scheduler stopped.")
+
+    def stop(self, signum, frame):
+        self.stopping = True
+
+    def report(self, states, quiet=False):
+        if states is None:
+            if not quiet:
+                self.stdout.write("Another scheduler holds the lock; nothing ran.")
+            return
+        for state in states:
+            line = (
+                f"{state.name}: {state.last_status} in {state.last_duration:.2f}s"
+                + (
+                    f", {state.last_processed} processed"
+                    if state.last_processed is not None
+                    else ""
+                )
+            )
+            style = (
+                self.style.SUCCESS
+                if state.last_status == JobState.Status.OK
+                else self.style.ERROR
+            )
+            self.stdout.write(style(line))
+
+    def list_jobs(self):
+        states = {state.name: state for state in JobState.objects.all()}
+        for name, job in get_jobs().items():
+            state = states.get(name)
+            last = (
+                f"last {state.last_status} at {state.last_started_at:%Y-%m-%d %H:%M}"
+                if state and state.last_started_at
+                else "never run"
+            )
+            self.stdout.write(f"  {name:<30} every {job.interval}  ({last})")
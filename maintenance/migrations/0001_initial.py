@@ -0,0 +1,59 @@
+# Generated by Django 5.2.18 on 2026-10-19 12:29
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = []
+
+    operations = [
+        migrations.CreateModel(
+            name="JobState",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("name", models.CharField(max_length=100, unique=True)),
+                ("last_started_at", models.DateTimeField(blank=True, null=True)),
+                ("last_finished_at", models.DateTimeField(blank=True, null=True)),
+                (
+                    "last_status",
+                    models.CharField(
+                        blank=True,
+                        choices=[("ok", "OK"), ("failed", "Failed")],
+                        max_length=10,
+                    ),
+                ),
+                (
+                    "last_duration",
+                    models.FloatField(
+                        blank=True, help_text="Seconds the last run took.", null=True
+                    ),
+                ),
+                (
+                    "last_processed",
+                    models.PositiveIntegerField(
+                        blank=True,
+                        help_text="Rows the last run handled, if it reports it.",
+                        null=True,
+                    ),
+                ),
+                ("last_error", models.TextField(blank=True)),
+                ("run_count", models.PositiveIntegerField(default=0)),
+                ("failure_count", models.PositiveIntegerField(default=0)),
+                ("run_requested", models.BooleanField(default=False)),
+            ],
+            options={
+                "ordering": ["name"],
+            },
+        ),
+    ]
@@ -0,0 +1,37 @@
+# maintenance/models.py
+
+from django.db import models
+
+
+class JobState(models.Model):
+    """
+    Last-run bookkeeping for a housekeeping job registered in code (see
+    maintenance/registry.py). One row per job, created on its first run.
+    """
+
+    class Status(models.TextChoices):
+        OK = "ok", "OK"
+        FAILED = "failed", "Failed"
+
+    name = models.CharField(max_length=100, unique=True)
+    last_started_at = models.DateTimeField(null=True, blank=True)
+    last_finished_at = models.DateTimeField(null=True, blank=True)
+    last_status = models.CharField(max_length=10, choices=Status.choices, blank=True)
+    last_duration = models.FloatField(
+        null=True, blank=True, help_text="Seconds the last run took."
+    )
+    last_processed = models.PositiveIntegerField(
+        null=True, blank=True, help_text="Rows the last run handled, if it reports it."
+    )
+    last_error = models.TextField(blank=True)
+    run_count = models.PositiveIntegerField(default=0)
+    failure_count = models.PositiveIntegerField(default=0)
+    # Set from the admin to run the job on the scheduler's next tick,
+    # regardless of its interval.
+    run_requested = models.BooleanField(default=False)
+
+    class Meta:
+        ordering = ["name"]
+
+    def __str__(self):
+        return self.name
@@ -0,0 +1,78 @@
+# maintenance/registry.py
+
+from django.utils.module_loading import autodiscover_modules
+
+# Housekeeping jobs are plain functions in each app's jobs.py, registered
+# with @job(...). They should work in bounded batches and may return how
+# many rows they handled, which is recorded on JobState.
+#
+#     @job(interval=timedelta(hours=1))
+#     def purge_expired_otps():
+#         ...
+#         return deleted
+
+_jobs = {}
+_discovered = False
+
+
+class Job:
+    def __init__(self, name, func, interval):
+        self.name = name
+        self.func = func
+        self.interval = interval
+
+    def is_due(self, state, now):
+        if state.run_requested or state.last_started_at is None:
+            return True
+        return now >= state.last_started_at + self.interval
+
+    def __repr__(self):
+        return f"<Job {self.name} every {self.interval}>"
+
+
+def job(interval, name=None):
+    """
+    Registers the decorated function as a job that runs every `interval`
+    (a timedelta).
+    """
+
+    def decorator(func):
+        job_name = name or func.__name__
+        if job_name in _jobs:
+            raise ValueError(f"Duplicate maintenance job name: {job_name}")
+        _jobs[job_name] = Job(job_name, func, interval)
+        return func
+
+    return decorator
+
+
+def get_jobs():
+    """
+    All registered jobs, by name. App jobs.py modules are imported on first
+    use, so web workers never load them.
+    """
+    global _discovered
+    if not _discovered:
+        autodiscover_modules("jobs")
+        _discovered = True
+    return dict(sorted(_jobs.items()))
+
+
+def delete_in_batches(queryset, batch_size=1000):
+    """
+    Deletes the rows matched by `queryset` a batch of primary keys at a time,
+    so no single statement locks or scans much. Returns the rows of the
+    queryset's model deleted (cascaded rows aren't counted). Stops early if
+    a batch deletes nothing, rather than selecting the same ids forever.
+    """
+    model = queryset.model
+    deleted = 0
+    while True:
+        ids = list(queryset.order_by("pk").values_list("pk", flat=True)[:batch_size])
+        if not ids:
+            return deleted
+        _, per_model = model.objects.filter(pk__in=ids).delete()
+        batch = per_model.get(model._meta.label, 0)
+        if not batch:
+            return deleted
+        deleted += batch
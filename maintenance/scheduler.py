@@ -0,0 +1,91 @@
+# maintenance/scheduler.py
+
+import logging
+import time
+import traceback
+import zlib
+from contextlib import contextmanager
+
+from django.db import connection
+from django.utils import timezone
+
+from .models import JobState
+from .registry import get_jobs
+
+logger = logging.getLogger(__name__)
+
+# Any number of scheduler processes may run; on each tick the one that gets
+# this Postgres advisory lock is the leader and runs the due jobs, the rest
+# skip the tick. Session-level advisory locks need a real session, so point
+# the scheduler at a direct (non-pgbouncer/"-pooler") database URL.
+LOCK_ID = zlib.crc32(b"quivix:maintenance-scheduler")
+
+
+@contextmanager
+def leader_lock():
+    """
+    Yields True if this process holds the scheduler lock for the duration
+    of the block, False if another process does.
+    """
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT pg_try_advisory_lock(%s)", [LOCK_ID])
+        acquired = cursor.fetchone()[0]
+    try:
+        yield acquired
+    finally:
+        if acquired:
+            with connection.cursor() as cursor:
+                cursor.execute("SELECT pg_advisory_unlock(%s)", [LOCK_ID])
+
+
+def run_job(job):
+    """
+    Runs one job and records the outcome on its JobState. Failures are
+    logged and recorded, never raised, so one broken job can't stop the rest.
+    """
+    state, _ = JobState.objects.get_or_create(name=job.name)
+    state.last_started_at = timezone.now()
+    state.run_requested = False
+    state.save(update_fields=["last_started_at", "run_requested"])
+
+    start = time.perf_counter()
+    try:
+        processed = job.func()
+    except Exception:
+        logger.exception("Maintenance job %s failed", job.name)
+        state.last_status = JobState.Status.FAILED
+        state.last_error = traceback.format_exc()[-4000:]
+        state.last_processed = None
+        state.failure_count += 1
+    else:
+        state.last_status = JobState.Status.OK
+        state.last_error = ""
+        state.last_processed = processed if isinstance(processed, int) else None
+    state.last_duration = time.perf_counter() - start
+    state.last_finished_at = timezone.now()
+    state.run_count += 1
+    state.save()
+    return state
+
+
+def tick(only=None):
+    """
+    Runs every due job (or just the jobs named in `only`, due or not) if
+    this process is the leader. Returns the JobStates of the jobs that ran,
+    or None if another process holds the lock.
+    """
+    jobs = get_jobs()
+    with leader_lock() as leader:
+        if not leader:
+            return None
+        if only is not None:
+            due = [jobs[name] for name in only]
+        else:
+            states = {state.name: state for state in JobState.objects.all()}
+            now = timezone.now()
+            due = [
+                job
+                for name, job in jobs.items()
+                if job.is_due(states.get(name) or JobState(name=name), now)
+            ]
+        return [run_job(job) for job in due]
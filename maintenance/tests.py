@@ -0,0 +1,117 @@
+from datetime import timedelta
+from unittest import mock
+
+from django.db import connections
+from django.db.models import QuerySet
+from django.test import TestCase
+from django.utils import timezone
+
+from .models import JobState
+from .registry import Job, delete_in_batches
+from .scheduler import LOCK_ID, run_job, tick
+
+
+def noop():
+    return 3
+
+
+def broken():
+    raise RuntimeError("disk full")
+
+
+JOBS = {"noop": Job("noop", noop, timedelta(hours=1))}
+
+
+class JobTests(TestCase):
+    def test_is_due(self):
+        job = JOBS["noop"]
+        now = timezone.now()
+
+        self.assertTrue(job.is_due(JobState(name="noop"), now))
+        recent = JobState(name="noop", last_started_at=now - timedelta(minutes=5))
+        self.assertFalse(job.is_due(recent, now))
+        recent.run_requested = True
+        self.assertTrue(job.is_due(recent, now))
+        stale = JobState(name="noop", last_started_at=now - timedelta(hours=1))
+        self.assertTrue(job.is_due(stale, now))
+
+    def test_run_job_records_success(self):
+        JobState.objects.create(name="noop", run_requested=True)
+
+        state = run_job(JOBS["noop"])
+
+        state.refresh_from_db()
+        self.assertEqual(state.last_status, JobState.Status.OK)
+        self.assertEqual(state.last_processed, 3)
+        self.assertEqual(state.run_count, 1)
+        self.assertFalse(state.run_requested)
+        self.assertIsNotNone(state.last_finished_at)
+
+    def test_run_job_records_failure(self):
+        job = Job("broken", broken, timedelta(hours=1))
+
+        with self.assertLogs("maintenance.scheduler", "ERROR"):
+            run_job(job)
+            state = run_job(job)
+
+        state.refresh_from_db()
+        self.assertEqual(state.last_status, JobState.Status.FAILED)
+        self.assertIn("RuntimeError: disk full", state.last_error)
+        self.assertIsNone(state.last_processed)
+        self.assertEqual(state.failure_count, 2)
+        self.assertEqual(state.run_count, 2)
+
+
+@mock.patch("maintenance.scheduler.get_jobs", return_value=JOBS)
+class TickTests(TestCase):
+    def test_leader_runs_due_jobs(self, get_jobs):
+        states = tick()
+
+        self.assertEqual([state.name for state in states], ["noop"])
+        # Just ran, so not due again until its interval has passed.
+        self.assertEqual(tick(), [])
+
+    def test_only_runs_named_jobs_even_if_not_due(self, get_jobs):
+        tick()
+
+        states = tick(only=["noop"])
+
+        self.assertEqual([state.run_count for state in states], [2])
+
+    def test_skips_tick_while_another_process_holds_the_lock(self, get_jobs):
+        other = connections.create_connection("default")
+        try:
+            with other.cursor() as cursor:
+                cursor.execute("SELECT pg_advisory_lock(%s)", [LOCK_ID])
+
+            self.assertIsNone(tick())
+            self.assertFalse(JobState.objects.exists())
+
+            with other.cursor() as cursor:
+                cursor.execute("SELECT pg_advisory_unlock(%s)", [LOCK_ID])
+            self.assertEqual(len(tick()), 1)
+        finally:
+            other.close()
+
+
+class DeleteInBatchesTests(TestCase):
+    def setUp(self):
+        JobState.objects.bulk_create(JobState(name=f"job-{n}") for n in range(7))
+
+    def test_deletes_matching_rows_in_batches(self):
+        queryset = JobState.objects.exclude(name="job-0")
+
+        with self.assertNumQueries(3 * 2 + 1):
+            deleted = delete_in_batches(queryset, batch_size=2)
+
+        self.assertEqual(deleted, 6)
+        self.assertEqual(
+            list(JobState.objects.values_list("name", flat=True)), ["job-0"]
+        )
+
+    def test_stops_when_a_batch_deletes_nothing(self):
+        with mock.patch.object(QuerySet, "delete", return_value=(0, {})):
+            deleted = delete_in_batches(JobState.objects.all(), batch_size=2)
+
+        self.assertEqual(deleted, 0)
+        self.assertEqual(JobState.objects.count(), 7)
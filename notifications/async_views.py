@@ -0,0 +1,35 @@
+# notifications/async_views.py
+from django.utils import timezone
+
+from internships import sync
+from internships.models import Tombstone
+from quivix_internships.async_api import AsyncAPIView
+from .models import Notification
+from .serializers import NotificationSerializer
+
+
+class AsyncNotificationListView(AsyncAPIView):
+    """
+    Async variant of NotificationListView, enabled with ASYNC_READ_VIEWS=True.
+    """
+
+    login_required = True
+
+    async def get(self, request):
+        queryset = Notification.objects.recent().filter(user=request.user)
+        since = sync.parse_changed_since(request.GET)
+        if since is None:
+            notifications = [notification async for notification in queryset]
+            return self.render(NotificationSerializer(notifications, many=True).data)
+
+        server_time = timezone.now()
+        queryset = queryset.filter(updated_at__gt=since)
+        notifications = [notification async for notification in queryset]
+        deleted = sync.deleted_ids(request.user, Tombstone.Kind.NOTIFICATION, since)
+        return self.render(
+            sync.sync_payload(
+                NotificationSerializer(notifications, many=True).data,
+                [object_id async for object_id in deleted],
+                server_time,
+            )
+        )
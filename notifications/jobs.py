@@ -0,0 +1,18 @@
+# notifications/jobs.py
+from datetime import timedelta
+from io import StringIO
+
+from django.core.management import call_command
+from maintenance.registry import job
+
+
+@job(interval=timedelta(days=1))
+def purge_notifications():
+    # The command already works in batches and applies the retention settings.
+    call_command("purge_notifications", stdout=StringIO())
+
+
+@job(interval=timedelta(days=1))
+def maintain_notification_partitions():
+    # A no-op until the table has been converted with --convert.
+    call_command("partition_notifications", stdout=StringIO())
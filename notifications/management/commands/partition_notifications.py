@@ -0,0 +1,72 @@
+# notifications/management/commands/partition_notifications.py
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from notifications import partitions
+
+
+class Command(BaseCommand):
+    """
+    Manages optional monthly partitioning of the notification table: a
+    one-off --convert, then (on every run) creating partitions ahead of time
+    and dropping months past retention. Does nothing on an unpartitioned
+    table, so the scheduler can run it unconditionally.
+    """
+
+    help = "Creates upcoming and drops expired monthly notification partitions."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--convert",
+            action="store_true",
+            help="Convert the table to a partitioned one first (one-off; locks it).",
+        )
+        parser.add_argument(
+            "--ahead", type=int, default=3, help="Months to create ahead of now."
+        )
+        parser.add_argument(
+            "--retention-months",
+            type=int,
+            default=settings.NOTIFICATION_PARTITION_RETENTION_MONTHS,
+            help="Drop partitions whose rows are all older than this (0 = keep all).",
+        )
+        parser.add_argument(
+            "--detach-only",
+            action="store_true",
+            help="Detach expired partitions instead of dropping them.",
+        )
+        parser.add_argument(
+            "--list", action="store_true", help="List the current partitions."
+        )
+
+    def handle(self, *args, **options):
+        if options["convert"]:
+            if partitions.is_partitioned():
+                raise CommandError("The notification table is already partitioned.")
+            legacy_end = partitions.convert()
+            self.stdout.write(
+                self.style.SUCCESS(
+                    f"Converted; existing rows are in {partitions.LEGACY} "
+                    f"(up to {legacy_end:%Y-%m-%d})."
+                )
+            )
+        elif not partitions.is_partitioned():
+            self.stdout.write(
+                "The notification table is not partitioned; nothing to do."
+            )
+            return
+
+        for name in partitions.ensure_partitions(ahead=options["ahead"]):
+            self.stdout.write(f"  created {name}")
+        if options["retention_months"]:
+            removed = partitions.drop_partitions(
+                options["retention_months"], detach_only=options["detach_only"]
+            )
+            verb = "detached" if options["detach_only"] else "dropped"
+            for name in removed:
+                self.stdout.write(f"  {verb} {name}")
+
+        if options["list"]:
+            for name, upper in partitions.list_partitions():
+                bound = f"< {upper:%Y-%m-%d}" if upper else "default"
+                self.stdout.write(f"  {name:<45} {bound}")
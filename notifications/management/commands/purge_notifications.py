@@ -0,0 +1,145 @@
+# notifications/management/commands/purge_notifications.py
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import Count, Q
+from django.utils import timezone
+
+from internships.models import Tombstone
+from internships.sync import record_deletions
+from notifications.models import ArchivedNotification, Notification
+
+
+class Command(BaseCommand):
+    """
+    Enforces the notification retention policy for read notifications:
+    anything older than --days, and anything beyond the newest --per-user-cap
+    per user. Rows are removed in bounded batches walking the primary key, so
+    no single statement locks or scans the whole table.
+    """
+
+    help = "Deletes (or archives) old read notifications in batches."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--days",
+            type=int,
+            default=settings.NOTIFICATION_RETENTION_DAYS,
+            help="Remove read notifications older than this many days.",
+        )
+        parser.add_argument(
+            "--per-user-cap",
+            type=int,
+            default=settings.NOTIFICATION_READ_CAP_PER_USER,
+            help="Keep at most this many read notifications per user (0 = no cap).",
+        )
+        parser.add_argument("--batch-size", type=int, default=1000)
+        parser.add_argument(
+            "--archive",
+            action="store_true",
+            help="Copy rows to ArchivedNotification before deleting them.",
+        )
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Only report what would be removed.",
+        )
+
+    def handle(self, *args, **options):
+        self.batch_size = options["batch_size"]
+        self.archive = options["archive"]
+        self.dry_run = options["dry_run"]
+        verb = "Would remove" if self.dry_run else "Removed"
+
+        cutoff = timezone.now() - timedelta(days=options["days"])
+        removed = self.purge(
+            Notification.objects.filter(is_read=True, created_at__lt=cutoff),
+            f"older than {options['days']} days",
+        )
+
+        cap = options["per_user_cap"]
+        if cap:
+            over_cap = (
+                Notification.objects.filter(is_read=True)
+                .order_by()
+                .values("user_id")
+                .annotate(total=Count("id"))
+                .filter(total__gt=cap)
+            )
+            for row in over_cap:
+                removed += self.purge_over_cap(row["user_id"], cap, cutoff)
+
+        self.stdout.write(self.style.SUCCESS(f"{verb} {removed} notification(s)."))
+
+    def purge_over_cap(self, user_id, cap, cutoff):
+        # Rows past the age cutoff were handled above (or counted, in a dry run).
+        read = Notification.objects.filter(
+            user_id=user_id, is_read=True, created_at__gte=cutoff
+        )
+        # The newest notification that falls outside the cap; it and
+        # everything older than it goes.
+        boundary = (
+            read.order_by("-created_at", "-id").values("created_at", "id")[cap : cap + 1]
+        ).first()
+        if boundary is None:
+            return 0
+        return self.purge(
+            read.filter(
+                Q(created_at__lt=boundary["created_at"])
+                | Q(created_at=boundary["created_at"], id__lte=boundary["id"])
+            ),
+            f"over cap for user {user_id}",
+        )
+
+    def purge(self, queryset, label):
+        total = 0
+        last_id = 0
+        while True:
+            ids = list(
+                queryset.filter(id__gt=last_id)
+                .order_by("id")
+                .values_list("id", flat=True)[: self.batch_size]
+            )
+            if not ids:
+                break
+            last_id = ids[-1]
+            batch = queryset.filter(id__gte=ids[0], id__lte=last_id)
+            if not self.dry_run:
+                with transaction.atomic():
+                    if self.archive:
+                        self.archive_rows(batch)
+                    # Written here rather than from a post_delete receiver,
+                    # which would turn the range delete into per-row deletes.
+                    record_deletions(
+                        Tombstone.Kind.NOTIFICATION,
+                        batch.values_list("id", "user_id"),
+                    )
+                    batch.delete()
+            total += len(ids)
+            self.stdout.write(f"  {label}: {total} so far")
+        return total
+
+    def archive_rows(self, batch):
+        ArchivedNotification.objects.bulk_create(
+            [
+                ArchivedNotification(
+                    original_id=row["id"],
+                    user_id=row["user_id"],
+                    message=row["message"],
+                    is_read=row["is_read"],
+                    created_at=row["created_at"],
+                    related_internship_id=row["related_internship_id"],
+                )
+                for row in batch.values(
+                    "id",
+                    "user_id",
+                    "message",
+                    "is_read",
+                    "created_at",
+                    "related_internship_id",
+                )
+            ],
+            ignore_conflicts=True,
+        )
@@ -1,12 +1,32 @@
 # notifications/models.py
+from datetime import timedelta
+
 from django.db import models
 from django.conf import settings
+from django.utils import timezone
+from django.db.models.signals import post_save
+from django.dispatch import receiver
+from users.cache import NOTIFICATIONS, bump_user_version
+
+class NotificationQuerySet(models.QuerySet):
+    def recent(self):
+        """
+        Notifications inside the NOTIFICATION_LIST_DAYS window, or all of
+        them when the setting is unset. The explicit created_at bound lets
+        Postgres skip old monthly partitions (see partitions.py).
+        """
+        if settings.NOTIFICATION_LIST_DAYS is None:
+            return self.all()
+        cutoff = timezone.now() - timedelta(days=settings.NOTIFICATION_LIST_DAYS)
+        return self.filter(created_at__gte=cutoff)
+
 
 class Notification(models.Model):
     user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name='notifications')
     message = models.CharField(max_length=255)
     is_read = models.BooleanField(default=False)
     created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
     
     # Optional: A link to a related object, e.g., the internship
     related_internship = models.ForeignKey(
@@ -16,8 +36,42 @@ class Notification(models.Model):
         blank=True
     )
 
+    objects = NotificationQuerySet.as_manager()
+
     class Meta:
         ordering = ['-created_at']
+        indexes = [
+            # Serves NotificationListView and the per-user retention cap.
+            models.Index(fields=['user', '-created_at'], name='notif_user_created_idx'),
+            # Serves `?changed_since=` delta sync.
+            models.Index(fields=['user', 'updated_at'], name='notif_user_updated_idx'),
+        ]
 
     def __str__(self):
-        return f"Notification for {self.user.email}: {self.message}"
\ No newline at end of file
+        return f"Notification for {self.user.email}: {self.message}"
+
+
+class ArchivedNotification(models.Model):
+    """
+    Cold storage for notifications removed by `manage.py purge_notifications --archive`.
+    Keeps the original id and timestamps; the internship link is kept as a plain id.
+    """
+    original_id = models.BigIntegerField(unique=True)
+    user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name='archived_notifications')
+    message = models.CharField(max_length=255)
+    is_read = models.BooleanField(default=False)
+    created_at = models.DateTimeField()
+    related_internship_id = models.BigIntegerField(null=True, blank=True)
+    archived_at = models.DateTimeField(auto_now_add=True)
+
+    def __str__(self):
+        return f"Archived notification {self.original_id} for user {self.user_id}"
+
+
+
+# The unread count in api/bootstrap/ is cached per user version. Deletes are
+# not hooked: a post_delete receiver would make purge_notifications delete
+# row by row, and it only removes read notifications anyway.
+@receiver(post_save, sender=Notification)
+def invalidate_cached_unread_count(sender, instance, **kwargs):
+    bump_user_version(instance.user_id, NOTIFICATIONS)
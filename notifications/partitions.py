@@ -0,0 +1,204 @@
+# notifications/partitions.py
+from datetime import datetime, timezone
+
+from django.db import connection, transaction
+
+from internships.models import Tombstone
+from .models import Notification
+
+# Optional monthly range partitioning of the notification table on
+# created_at (Postgres declarative partitioning). Nothing here runs unless
+# `manage.py partition_notifications --convert` has been run once; after
+# that the same command (and the daily scheduler job) keeps partitions
+# created ahead of time and drops whole months past retention, which is far
+# cheaper than deleting their rows.
+#
+# Layout after conversion:
+#   notifications_notification           partitioned parent, PK (id, created_at)
+#   notifications_notification_legacy    all rows that existed at conversion
+#   notifications_notification_pYYYY_MM  one per month
+#   notifications_notification_default   catch-all, normally empty
+
+TABLE = Notification._meta.db_table
+LEGACY = f"{TABLE}_legacy"
+DEFAULT = f"{TABLE}_default"
+SEQUENCE = f"{TABLE}_id_seq"
+
+
+def month_start(moment, offset=0):
+    index = moment.year * 12 + moment.month - 1 + offset
+    return datetime(index // 12, index % 12 + 1, 1, tzinfo=timezone.utc)
+
+
+def partition_name(start):
+    return f"{TABLE}_p{start:%Y_%m}"
+
+
+def is_partitioned():
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT c.relkind = 'p' FROM pg_class c " "WHERE c.oid = to_regclass(%s)",
+            [TABLE],
+        )
+        row = cursor.fetchone()
+    return bool(row and row[0])
+
+
+def list_partitions():
+    """
+    Returns [(name, upper_bound)] for the attached partitions, oldest first.
+    upper_bound is None for the default partition.
+    """
+    with connection.cursor() as cursor:
+        cursor.execute(
+            """
+            SELECT child.relname,
+                   substring(pg_get_expr(child.relpartbound, child.oid)
+                             FROM 'TO \\(''(.*)''\\)')::timestamptz AS upper_bound
+            FROM pg_inherits
+            JOIN pg_class child ON child.oid = pg_inherits.inhrelid
+            WHERE pg_inherits.inhparent = %s::regclass
+            ORDER BY upper_bound NULLS LAST
+            """,
+            [TABLE],
+        )
+        return cursor.fetchall()
+
+
+def convert():
+    """
+    Turns the plain table into a partitioned one without copying rows: the
+    existing table is attached as the legacy partition, which covers
+    everything up to the end of the current month. Takes an exclusive lock on the table for
+    the duration (mostly building the (id, created_at) index on the legacy
+    rows), so run it in a quiet period.
+    """
+    now = datetime.now(timezone.utc)
+    with transaction.atomic(), connection.cursor() as cursor:
+        cursor.execute(f'LOCK TABLE "{TABLE}" IN ACCESS EXCLUSIVE MODE')
+        cursor.execute(
+            "SELECT indexname, indexdef FROM pg_indexes "
+            "WHERE tablename = %s AND indexname <> %s",
+            [TABLE, f"{TABLE}_pkey"],
+        )
+        indexes = cursor.fetchall()
+        cursor.execute(
+            "SELECT conname, pg_get_constraintdef(oid) FROM pg_constraint "
+            "WHERE conrelid = %s::regclass AND contype = 'f'",
+            [TABLE],
+        )
+        foreign_keys = cursor.fetchall()
+        cursor.execute(f'SELECT max(id) FROM "{TABLE}"')
+        (max_id,) = cursor.fetchone()
+        legacy_end = month_start(now, 1)
+
+        # The legacy table keeps its rows and its indexes under new names;
+        # its identity sequence is replaced by a sequence on the parent.
+        cursor.execute(f'ALTER TABLE "{TABLE}" RENAME TO "{LEGACY}"')
+        cursor.execute(
+            f'ALTER TABLE "{LEGACY}" ALTER COLUMN id DROP IDENTITY IF EXISTS'
+        )
+        cursor.execute(f'ALTER TABLE "{LEGACY}" DROP CONSTRAINT "{TABLE}_pkey"')
+        for name, _ in indexes:
+            cursor.execute(f'ALTER INDEX "{name}" RENAME TO "{name[:52]}_legacy"')
+
+        cursor.execute(
+            f'CREATE TABLE "{TABLE}" (LIKE "{LEGACY}" INCLUDING DEFAULTS) '
+            "PARTITION BY RANGE (created_at)"
+        )
+        cursor.execute(f'CREATE SEQUENCE "{SEQUENCE}" OWNED BY "{TABLE}".id')
+        if max_id is not None:
+            cursor.execute("SELECT setval(%s, %s)", [SEQUENCE, max_id])
+        cursor.execute(
+            f'ALTER TABLE "{TABLE}" ALTER COLUMN id '
+            f"SET DEFAULT nextval('\"{SEQUENCE}\"')"
+        )
+        # Unique constraints on a partitioned table must include the key.
+        cursor.execute(f'ALTER TABLE "{TABLE}" ADD PRIMARY KEY (id, created_at)')
+        for name, definition in foreign_keys:
+            cursor.execute(
+                f'ALTER TABLE "{TABLE}" ADD CONSTRAINT "{name}" {definition}'
+            )
+        for _, definition in indexes:
+            cursor.execute(definition.replace(f"ON public.{TABLE} ", f'ON "{TABLE}" '))
+
+        cursor.execute(
+            f'ALTER TABLE "{TABLE}" ATTACH PARTITION "{LEGACY}" '
+            "FOR VALUES FROM (MINVALUE) TO (%s)",
+            [legacy_end],
+        )
+        cursor.execute(f'CREATE TABLE "{DEFAULT}" PARTITION OF "{TABLE}" DEFAULT')
+    return legacy_end
+
+
+def create_partition(start):
+    """
+    Creates the partition for the month starting at `start`. Rows that
+    already landed in the default partition for that month are moved into
+    it, since Postgres refuses to attach over them.
+    """
+    end = month_start(start, 1)
+    name = partition_name(start)
+    with transaction.atomic(), connection.cursor() as cursor:
+        cursor.execute(f'CREATE TABLE "{name}" (LIKE "{TABLE}" INCLUDING DEFAULTS)')
+        cursor.execute(
+            f"""
+            WITH moved AS (
+                DELETE FROM "{DEFAULT}"
+                WHERE created_at >= %s AND created_at < %s
+                RETURNING *
+            )
+            INSERT INTO "{name}" SELECT * FROM moved
+            """,
+            [start, end],
+        )
+        cursor.execute(
+            f'ALTER TABLE "{TABLE}" ATTACH PARTITION "{name}" '
+            "FOR VALUES FROM (%s) TO (%s)",
+            [start, end],
+        )
+    return name
+
+
+def ensure_partitions(ahead=3, now=None):
+    """
+    Creates any missing monthly partitions from the end of the newest
+    existing one through `ahead` months past the current month. Returns the
+    names created.
+    """
+    now = now or datetime.now(timezone.utc)
+    bounds = [upper for _, upper in list_partitions() if upper is not None]
+    start = max(bounds) if bounds else month_start(now)
+    created = []
+    while start < month_start(now, ahead + 1):
+        created.append(create_partition(start))
+        start = month_start(start, 1)
+    return created
+
+
+def drop_partitions(retention_months, detach_only=False, now=None):
+    """
+    Detaches (and unless detach_only, drops) partitions whose rows are all
+    older than `retention_months` whole months. Tombstones for the dropped
+    rows are written first, so delta-sync clients remove them too.
+    Returns the names removed.
+    """
+    cutoff = month_start(now or datetime.now(timezone.utc), -retention_months)
+    removed = []
+    for name, upper in list_partitions():
+        if upper is None or upper > cutoff:
+            continue
+        with transaction.atomic(), connection.cursor() as cursor:
+            cursor.execute(
+                f"""
+                INSERT INTO "{Tombstone._meta.db_table}"
+                    (user_id, kind, object_id, deleted_at)
+                SELECT user_id, %s, id, NOW() FROM "{name}"
+                """,
+                [Tombstone.Kind.NOTIFICATION],
+            )
+            cursor.execute(f'ALTER TABLE "{TABLE}" DETACH PARTITION "{name}"')
+            if not detach_only:
+                cursor.execute(f'DROP TABLE "{name}"')
+        removed.append(name)
+    return removed
@@ -1,3 +1,204 @@
-from django.test import TestCase
+from datetime import timedelta
+from io import StringIO
 
-# Create your tests here.
+from django.core.management import CommandError, call_command
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from internships.models import Tombstone
+from users.models import CustomUser
+from . import partitions
+from .models import ArchivedNotification, Notification
+
+
+def notify(user, days_ago=0, **kwargs):
+    notification = Notification.objects.create(user=user, message='Hello', **kwargs)
+    if days_ago:
+        # created_at is auto_now_add, so it can only be backdated afterwards.
+        Notification.objects.filter(pk=notification.pk).update(
+            created_at=timezone.now() - timedelta(days=days_ago)
+        )
+    return notification
+
+
+class RecentNotificationTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = CustomUser.objects.create_user('student@example.com', 'Student')
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        self.old = notify(self.user, days_ago=120)
+        self.new = notify(self.user)
+
+    def listed_ids(self):
+        response = self.client.get(reverse('notification-list'))
+        self.assertEqual(response.status_code, 200)
+        return {item['id'] for item in response.data}
+
+    @override_settings(NOTIFICATION_LIST_DAYS=None)
+    def test_no_cutoff_by_default(self):
+        self.assertEqual(Notification.objects.recent().count(), 2)
+        self.assertEqual(self.listed_ids(), {self.old.pk, self.new.pk})
+
+        response = self.client.post(reverse('mark-all-read'))
+
+        self.assertEqual(response.status_code, 204)
+        self.assertFalse(Notification.objects.filter(is_read=False).exists())
+
+    @override_settings(NOTIFICATION_LIST_DAYS=30)
+    def test_cutoff_when_set(self):
+        self.assertEqual(list(Notification.objects.recent()), [self.new])
+        self.assertEqual(self.listed_ids(), {self.new.pk})
+
+        self.client.post(reverse('mark-all-read'))
+
+        self.old.refresh_from_db()
+        self.assertFalse(self.old.is_read)
+
+
+class PartitionTests(TestCase):
+    """
+    The conversion runs inside the test transaction and is rolled back with
+    it, like any other DDL in Postgres.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = CustomUser.objects.create_user('student@example.com', 'Student')
+
+    def setUp(self):
+        self.existing = [notify(self.user), notify(self.user, days_ago=60)]
+        # Rows written in this transaction leave deferred foreign key checks
+        # pending, and Postgres refuses ALTER TABLE while they are.
+        with connection.cursor() as cursor:
+            cursor.execute('SET CONSTRAINTS ALL IMMEDIATE')
+
+    def partition_rows(self, name):
+        with connection.cursor() as cursor:
+            cursor.execute(f'SELECT id FROM "{name}" ORDER BY id')
+            return [row[0] for row in cursor.fetchall()]
+
+    def test_convert_keeps_rows_and_ids(self):
+        self.assertFalse(partitions.is_partitioned())
+
+        legacy_end = partitions.convert()
+
+        self.assertTrue(partitions.is_partitioned())
+        self.assertEqual(
+            partitions.list_partitions(),
+            [(partitions.LEGACY, legacy_end), (partitions.DEFAULT, None)],
+        )
+        self.assertEqual(
+            self.partition_rows(partitions.LEGACY),
+            sorted(n.pk for n in self.existing),
+        )
+        created = notify(self.user)
+        self.assertGreater(created.pk, max(n.pk for n in self.existing))
+        self.assertEqual(Notification.objects.filter(user=self.user).count(), 3)
+
+    def test_create_partition_moves_rows_out_of_default(self):
+        legacy_end = partitions.convert()
+        later = notify(self.user)
+        Notification.objects.filter(pk=later.pk).update(
+            created_at=legacy_end + timedelta(days=40)
+        )
+        self.assertEqual(self.partition_rows(partitions.DEFAULT), [later.pk])
+
+        created = partitions.ensure_partitions(ahead=3)
+
+        self.assertEqual(len(created), 3)
+        self.assertEqual(self.partition_rows(partitions.DEFAULT), [])
+        name = partitions.partition_name(partitions.month_start(legacy_end, 1))
+        self.assertEqual(self.partition_rows(name), [later.pk])
+        self.assertEqual(partitions.ensure_partitions(ahead=3), [])
+
+    def test_drop_partitions_writes_tombstones(self):
+        legacy_end = partitions.convert()
+        partitions.ensure_partitions(ahead=1)
+
+        removed = partitions.drop_partitions(
+            1, now=partitions.month_start(legacy_end, 1)
+        )
+
+        self.assertEqual(removed, [partitions.LEGACY])
+        self.assertFalse(Notification.objects.exists())
+        self.assertEqual(
+            set(
+                Tombstone.objects.filter(kind=Tombstone.Kind.NOTIFICATION).values_list(
+                    'object_id', flat=True
+                )
+            ),
+            {n.pk for n in self.existing},
+        )
+
+    def test_command(self):
+        out = StringIO()
+        call_command('partition_notifications', stdout=out)
+        self.assertIn('not partitioned', out.getvalue())
+
+        out = StringIO()
+        call_command('partition_notifications', '--convert', '--list', stdout=out)
+        next_month = partitions.month_start(timezone.now(), 1)
+        self.assertIn(f'existing rows are in {partitions.LEGACY}', out.getvalue())
+        self.assertIn(
+            f'created {partitions.partition_name(next_month)}', out.getvalue()
+        )
+
+        with self.assertRaises(CommandError):
+            call_command('partition_notifications', '--convert', stdout=StringIO())
+
+
+class PurgeNotificationsTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = CustomUser.objects.create_user('student@example.com', 'Student')
+
+    def purge(self, *args):
+        out = StringIO()
+        call_command('purge_notifications', *args, stdout=out)
+        return out.getvalue()
+
+    def test_removes_old_read_notifications_only(self):
+        old_read = notify(self.user, days_ago=100, is_read=True)
+        old_unread = notify(self.user, days_ago=100)
+        new_read = notify(self.user, is_read=True)
+
+        output = self.purge('--days', '90', '--per-user-cap', '0', '--batch-size', '1')
+
+        self.assertIn('Removed 1 notification(s).', output)
+        self.assertEqual(
+            set(Notification.objects.values_list('id', flat=True)),
+            {old_unread.pk, new_read.pk},
+        )
+        self.assertEqual(
+            list(Tombstone.objects.values_list('object_id', flat=True)), [old_read.pk]
+        )
+
+    def test_per_user_cap_keeps_newest(self):
+        read = [notify(self.user, days_ago=n, is_read=True) for n in (1, 2, 3, 4)]
+
+        self.purge('--per-user-cap', '2')
+
+        self.assertEqual(
+            list(Notification.objects.values_list('id', flat=True)),
+            [read[0].pk, read[1].pk],
+        )
+
+    def test_archive_and_dry_run(self):
+        old = notify(self.user, days_ago=100, is_read=True)
+
+        self.assertIn('Would remove 1', self.purge('--dry-run'))
+        self.assertTrue(Notification.objects.filter(pk=old.pk).exists())
+
+        self.purge('--archive')
+
+        self.assertFalse(Notification.objects.exists())
+        archived = ArchivedNotification.objects.get()
+        self.assertEqual(archived.original_id, old.pk)
+        self.assertEqual((archived.user, archived.message), (self.user, 'Hello'))
+        self.assertTrue(archived.is_read)
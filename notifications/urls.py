@@ -1,7 +1,13 @@
 # notifications/urls.py
+from django.conf import settings
 from django.urls import path
+from .async_views import AsyncNotificationListView
 from .views import NotificationListView, MarkAllAsReadView
 
+# Served by the async variant when running under ASGI (uvicorn workers).
+if settings.ASYNC_READ_VIEWS:
+    NotificationListView = AsyncNotificationListView
+
 urlpatterns = [
     path('', NotificationListView.as_view(), name='notification-list'),
     path('mark-all-read/', MarkAllAsReadView.as_view(), name='mark-all-read'),
@@ -1,21 +1,43 @@
 # notifications/views.py
+from django.utils import timezone
 from rest_framework import generics, status
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
+from internships import sync
+from internships.models import Tombstone
+from users.cache import NOTIFICATIONS, bump_user_version
 from .models import Notification
 from .serializers import NotificationSerializer
 
 class NotificationListView(generics.ListAPIView):
+    """
+    Supports `?changed_since=<server_time>` delta sync (see internships/sync.py).
+    """
     permission_classes = [IsAuthenticated]
     serializer_class = NotificationSerializer
 
     def get_queryset(self):
-        return Notification.objects.filter(user=self.request.user)
+        return Notification.objects.recent().filter(user=self.request.user)
+
+    def list(self, request, *args, **kwargs):
+        since = sync.parse_changed_since(request.query_params)
+        if since is None:
+            return super().list(request, *args, **kwargs)
+        server_time = timezone.now()
+        queryset = self.get_queryset().filter(updated_at__gt=since)
+        deleted = sync.deleted_ids(request.user, Tombstone.Kind.NOTIFICATION, since)
+        return Response(sync.sync_payload(
+            self.get_serializer(queryset, many=True).data, deleted, server_time
+        ))
 
 class MarkAllAsReadView(APIView):
     permission_classes = [IsAuthenticated]
 
     def post(self, request):
-        Notification.objects.filter(user=request.user, is_read=False).update(is_read=True)
-        return Response(status=status.HTTP_204_NO_CONTENT)
\ No newline at end of file
+        # .update() skips auto_now, so bump updated_at for delta sync by hand.
+        Notification.objects.recent().filter(user=request.user, is_read=False).update(
+            is_read=True, updated_at=timezone.now()
+        )
+        bump_user_version(request.user.pk, NOTIFICATIONS)
+        return Response(status=status.HTTP_204_NO_CONTENT)
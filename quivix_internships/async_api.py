@@ -0,0 +1,69 @@
+# quivix_internships/async_api.py
+
+from asgiref.sync import sync_to_async
+from django.contrib.auth.models import AnonymousUser
+from django.http import Http404, HttpResponse
+from django.views import View
+from rest_framework import exceptions
+from rest_framework.renderers import JSONRenderer
+from rest_framework.request import Request
+
+from users.authentication import CachedJWTAuthentication
+
+
+class AsyncAPIView(View):
+    """
+    A minimal async counterpart of DRF's APIView for read-only JSON endpoints.
+
+    DRF views are synchronous, so under uvicorn every one of them is pushed
+    onto a thread. Subclasses of this view implement `async def get()` with
+    Django's async ORM instead and reuse the existing DRF serializers on the
+    already-fetched objects, so the JSON is byte-for-byte the same as the
+    sync endpoints.
+    """
+
+    http_method_names = ["get", "head", "options"]
+    authentication_class = CachedJWTAuthentication
+    login_required = False
+
+    async def dispatch(self, request, *args, **kwargs):
+        try:
+            request.user = await self.authenticate(request)
+            if self.login_required and not request.user.is_authenticated:
+                raise exceptions.NotAuthenticated()
+            return await super().dispatch(request, *args, **kwargs)
+        except Http404 as exc:
+            return self.handle_exception(exceptions.NotFound(*exc.args))
+        except exceptions.APIException as exc:
+            return self.handle_exception(exc)
+
+    async def authenticate(self, request):
+        result = await sync_to_async(self.authentication_class().authenticate)(
+            request
+        )
+        return result[0] if result else AnonymousUser()
+
+    def drf_request(self, request):
+        # Lets DRF filter backends (e.g. SearchFilter) read query params.
+        return Request(request)
+
+    def render(self, data, status=200, headers=None):
+        return HttpResponse(
+            JSONRenderer().render(data),
+            status=status,
+            content_type="application/json",
+            headers=headers,
+        )
+
+    def handle_exception(self, exc):
+        headers = None
+        if isinstance(
+            exc, (exceptions.NotAuthenticated, exceptions.AuthenticationFailed)
+        ):
+            authenticator = self.authentication_class()
+            headers = {"WWW-Authenticate": authenticator.authenticate_header(None)}
+        if isinstance(exc.detail, (list, dict)):
+            data = exc.detail
+        else:
+            data = {"detail": exc.detail}
+        return self.render(data, status=exc.status_code, headers=headers)
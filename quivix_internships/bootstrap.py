@@ -0,0 +1,97 @@
+# quivix_internships/bootstrap.py
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Count, F
+
+from internships.catalog import get_catalog_version
+from internships.models import UserInternship
+from notifications.models import Notification
+from users import cache as user_cache
+from users.serializers import UserSerializer
+
+# Everything the app needs on launch, assembled from independently cached
+# sections. Each section is keyed on its own version, so e.g. a new
+# notification only recomputes the unread count. A warm call costs three
+# cache round trips (user versions, catalog version, sections) and no
+# queries; cold sections are each a single query. Sections are only cached
+# when the cache is shared (users.cache.cache_is_shared): a per-process
+# cache would keep serving them after writes handled by other workers.
+
+SECTION_KEY = "bootstrap:{section}:{user_id}:{version}"
+
+
+def build_user(user):
+    # request.user comes from CachedJWTAuthentication with its profile
+    # already joined, so this needs no query.
+    return UserSerializer(user).data
+
+
+def build_enrollments(user):
+    rows = (
+        UserInternship.objects.filter(user=user)
+        .order_by("-enrollment_date")
+        .values(
+            "id",
+            "status",
+            "enrollment_date",
+            "internship_id",
+            internship_title=F("internship__title"),
+        )
+        .annotate(
+            completed_step_count=Count("completed_steps", distinct=True),
+            step_count=Count("internship__steps", distinct=True),
+        )
+    )
+    return list(rows)
+
+
+def build_unread_notifications(user):
+    return Notification.objects.recent().filter(user=user, is_read=False).count()
+
+
+def get_bootstrap(user):
+    versions = user_cache.get_user_versions(
+        user.pk, [None, user_cache.ENROLLMENTS, user_cache.NOTIFICATIONS]
+    )
+    catalog_version = get_catalog_version()
+    # section -> (builder, version); enrollment summaries embed internship
+    # titles, so they also change with the catalog.
+    sections = {
+        "user": (build_user, versions[None]),
+        "enrollments": (
+            build_enrollments,
+            f"{versions[user_cache.ENROLLMENTS]}.{catalog_version}",
+        ),
+        "unread_notifications": (
+            build_unread_notifications,
+            versions[user_cache.NOTIFICATIONS],
+        ),
+    }
+    keys = {
+        name: SECTION_KEY.format(section=name, user_id=user.pk, version=version)
+        for name, (_, version) in sections.items()
+    }
+    shared = user_cache.cache_is_shared()
+    cached = cache.get_many(keys.values()) if shared else {}
+
+    data, missing = {}, {}
+    for name, (builder, _) in sections.items():
+        if keys[name] in cached:
+            data[name] = cached[keys[name]]
+        else:
+            data[name] = missing[keys[name]] = builder(user)
+    if missing and shared:
+        cache.set_many(missing, timeout=settings.BOOTSTRAP_CACHE_TIMEOUT)
+
+    # Versions are nanosecond timestamps, too big for a JavaScript number.
+    # Without a shared cache they are per worker and don't follow writes
+    # handled elsewhere, so they are null and clients refetch as usual.
+    if shared:
+        data["catalog_version"] = str(catalog_version)
+        data["versions"] = {
+            name: str(version) for name, (_, version) in sections.items()
+        }
+    else:
+        data["catalog_version"] = data["versions"] = None
+    return data
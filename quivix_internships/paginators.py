@@ -0,0 +1,45 @@
+# quivix_internships/paginators.py
+
+from django.conf import settings
+from django.core.paginator import Paginator
+from django.db import connections
+from django.utils.functional import cached_property
+
+
+class EstimatedCountPaginator(Paginator):
+    """
+    Admin paginator that avoids an exact COUNT(*) over big tables.
+
+    For an unfiltered changelist on Postgres it reads the planner's row
+    estimate (pg_class.reltuples) instead, and only falls back to a real
+    count when the table is below ADMIN_ESTIMATED_COUNT_THRESHOLD rows or
+    has never been analyzed. Filtered/searched changelists count exactly.
+    """
+
+    @cached_property
+    def count(self):
+        queryset = self.object_list
+        query = getattr(queryset, "query", None)
+        if query is not None and not query.where and not query.distinct:
+            estimate = self.estimate(queryset)
+            if (
+                estimate is not None
+                and estimate >= settings.ADMIN_ESTIMATED_COUNT_THRESHOLD
+            ):
+                return estimate
+        return super().count
+
+    def estimate(self, queryset):
+        connection = connections[queryset.db]
+        if connection.vendor != "postgresql":
+            return None
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "SELECT reltuples FROM pg_class WHERE oid = %s::regclass",
+                [queryset.model._meta.db_table],
+            )
+            row = cursor.fetchone()
+        # reltuples is -1 for tables that have never been vacuumed/analyzed.
+        if row is None or row[0] < 0:
+            return None
+        return int(row[0])
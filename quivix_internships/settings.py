@@ -1,9 +1,9 @@
 import os
 from pathlib import Path
 from datetime import timedelta
+from urllib.parse import urlparse
 import dj_database_url
 from dotenv import load_dotenv
-import cloudinary
 
 # --- BASE DIRECTORY ---
 BASE_DIR = Path(__file__).resolve().parent.parent
@@ -50,6 +50,7 @@ INSTALLED_APPS = [
     "users",
     "internships",
     "notifications",
+    "maintenance",
 ]
 
 MIDDLEWARE = [
@@ -83,17 +84,33 @@ TEMPLATES = [
 ]
 
 WSGI_APPLICATION = "quivix_internships.wsgi.application"
+ASGI_APPLICATION = "quivix_internships.asgi.application"
+
+# Serve the hot read endpoints with async views. Only worth enabling when
+# running under uvicorn workers, e.g.:
+#   gunicorn quivix_internships.asgi:application -k uvicorn_worker.UvicornWorker
+ASYNC_READ_VIEWS = os.getenv("ASYNC_READ_VIEWS", "False").lower() in ("true", "1", "t")
 
 # --- DATABASE (NEON POSTGRES) ---
 DATABASE_URL = os.getenv("DATABASE_URL")
 if not DATABASE_URL:
     raise ValueError("DATABASE_URL environment variable is required!")
 
+# DB_POOL=True switches from one persistent connection per worker thread to a
+# shared psycopg 3 connection pool per process (Django requires CONN_MAX_AGE=0
+# with pooling, and the pool does its own health checks).
+DB_POOL = os.getenv("DB_POOL", "False").lower() in ("true", "1", "t")
+
+# DB_PGBOUNCER=True is for connecting through PgBouncer (or Neon's pooled
+# endpoint) in transaction mode, which can't keep server-side cursors or
+# prepared statements alive between transactions.
+DB_PGBOUNCER = os.getenv("DB_PGBOUNCER", "False").lower() in ("true", "1", "t")
+
 DATABASES = {
     "default": dj_database_url.config(
         default=DATABASE_URL,
-        conn_max_age=600,
-        conn_health_checks=True,
+        conn_max_age=0 if DB_POOL else 600,
+        conn_health_checks=not DB_POOL,
         ssl_require=True,
     )
 }
@@ -101,6 +118,17 @@ DATABASES = {
 # Explicit SSL mode for psycopg
 DATABASES["default"]["OPTIONS"] = {"sslmode": "require"}
 
+if DB_POOL:
+    DATABASES["default"]["OPTIONS"]["pool"] = {
+        "min_size": int(os.getenv("DB_POOL_MIN_SIZE", "2")),
+        "max_size": int(os.getenv("DB_POOL_MAX_SIZE", "10")),
+        "timeout": float(os.getenv("DB_POOL_TIMEOUT", "10")),
+    }
+
+if DB_PGBOUNCER:
+    DATABASES["default"]["DISABLE_SERVER_SIDE_CURSORS"] = True
+    DATABASES["default"]["OPTIONS"]["prepare_threshold"] = None
+
 # --- AUTH SETTINGS ---
 AUTH_USER_MODEL = "users.CustomUser"
 AUTH_PASSWORD_VALIDATORS = [
@@ -128,31 +156,142 @@ CLOUDINARY_URL = os.getenv("CLOUDINARY_URL")
 if not CLOUDINARY_URL:
     raise ValueError("CLOUDINARY_URL environment variable is required!")
 
-cloudinary_config = cloudinary.config(cloudinary_url=CLOUDINARY_URL)
+# Parsed here instead of via cloudinary.config() so loading settings doesn't
+# import the SDK; cloudinary reads CLOUDINARY_URL from the environment itself.
+_cloudinary_url = urlparse(CLOUDINARY_URL)
 
 CLOUDINARY_STORAGE = {
-    "CLOUD_NAME": cloudinary_config.cloud_name,
-    "API_KEY": cloudinary_config.api_key,
-    "API_SECRET": cloudinary_config.api_secret,
+    "CLOUD_NAME": _cloudinary_url.hostname,
+    "API_KEY": _cloudinary_url.username,
+    "API_SECRET": _cloudinary_url.password,
 }
 
 DEFAULT_FILE_STORAGE = "cloudinary_storage.storage.MediaCloudinaryStorage"
 MEDIA_URL = "/media/"
 
+# Uploaded profile pictures are re-encoded to fit in AVATAR_SIZE x AVATAR_SIZE
+# as WEBP (or JPEG). IMAGE_PROCESSING_INLINE runs that in the request instead
+# of the background thread pool (handy for debugging).
+AVATAR_SIZE = int(os.getenv("AVATAR_SIZE", "512"))
+AVATAR_FORMAT = os.getenv("AVATAR_FORMAT", "WEBP").upper()
+IMAGE_PROCESSING_INLINE = os.getenv("IMAGE_PROCESSING_INLINE", "False").lower() in (
+    "true",
+    "1",
+    "t",
+)
+
+# --- ADMIN ---
+# Above this many rows, unfiltered admin changelists show the planner's
+# estimated row count instead of running COUNT(*).
+ADMIN_ESTIMATED_COUNT_THRESHOLD = int(
+    os.getenv("ADMIN_ESTIMATED_COUNT_THRESHOLD", "10000")
+)
+
 # --- DEFAULT FIELD TYPE ---
 DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
 
+# --- CACHE ---
+# Uses Redis when REDIS_URL is set, otherwise a per-process memory cache.
+REDIS_URL = os.getenv("REDIS_URL")
+if REDIS_URL:
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.redis.RedisCache",
+            "LOCATION": REDIS_URL,
+        }
+    }
+else:
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+            "OPTIONS": {"MAX_ENTRIES": 10000},
+        }
+    }
+# Per-user and catalog cache versions (users/cache.py) only reach every
+# worker through a shared cache. Without one, the shortcuts built on them
+# (HTTP validators, cached auth users, bootstrap sections) are turned off.
+CACHE_IS_SHARED = bool(REDIS_URL)
+
 # --- REST FRAMEWORK & JWT ---
 REST_FRAMEWORK = {
     "DEFAULT_AUTHENTICATION_CLASSES": (
-        "rest_framework_simplejwt.authentication.JWTAuthentication",
-    )
+        "users.authentication.CachedJWTAuthentication",
+    ),
+    # Sliding-window limits for the auth endpoints (users/throttling.py),
+    # per client IP and per email address in the request body.
+    "DEFAULT_THROTTLE_RATES": {
+        "register_ip": os.getenv("THROTTLE_REGISTER_IP", "10/hour"),
+        "register_email": os.getenv("THROTTLE_REGISTER_EMAIL", "3/hour"),
+        "verify_otp_ip": os.getenv("THROTTLE_VERIFY_OTP_IP", "30/hour"),
+        "verify_otp_email": os.getenv("THROTTLE_VERIFY_OTP_EMAIL", "10/hour"),
+        "resend_otp_ip": os.getenv("THROTTLE_RESEND_OTP_IP", "10/hour"),
+        "resend_otp_email": os.getenv("THROTTLE_RESEND_OTP_EMAIL", "3/hour"),
+        "login_ip": os.getenv("THROTTLE_LOGIN_IP", "60/hour"),
+        "login_email": os.getenv("THROTTLE_LOGIN_EMAIL", "10/hour"),
+    },
+    # Proxies in front of the app (Render's load balancer), so throttles key
+    # on the client address from X-Forwarded-For rather than a spoofable one.
+    "NUM_PROXIES": int(os.getenv("NUM_PROXIES", "1")),
 }
 
+# Seconds an authenticated user (and profile) stays cached between requests.
+AUTH_USER_CACHE_TIMEOUT = int(os.getenv("AUTH_USER_CACHE_TIMEOUT", "300"))
+# Seconds each section of api/bootstrap/ stays cached; keys are versioned,
+# so this only bounds memory, not staleness.
+BOOTSTRAP_CACHE_TIMEOUT = int(os.getenv("BOOTSTRAP_CACHE_TIMEOUT", "3600"))
+
 SIMPLE_JWT = {
     "ACCESS_TOKEN_LIFETIME": timedelta(minutes=60),
     "REFRESH_TOKEN_LIFETIME": timedelta(days=1),
 }
 
+# --- CATALOG ---
+# Upper bound, in seconds, on how stale a worker's in-memory suggest index can
+# get when catalog version bumps aren't shared (i.e. without REDIS_URL).
+SUGGEST_INDEX_MAX_AGE = int(os.getenv("SUGGEST_INDEX_MAX_AGE", "60"))
+# Same bound for the cached catalog facet counts (?facets=true).
+CATALOG_FACETS_MAX_AGE = int(os.getenv("CATALOG_FACETS_MAX_AGE", "60"))
+
+# --- NOTIFICATION RETENTION ---
+# Enforced by `manage.py purge_notifications`; only read notifications are removed.
+NOTIFICATION_RETENTION_DAYS = int(os.getenv("NOTIFICATION_RETENTION_DAYS", "90"))
+NOTIFICATION_READ_CAP_PER_USER = int(os.getenv("NOTIFICATION_READ_CAP_PER_USER", "200"))
+# Opt-in: when set, the notification list, mark-all-read and the unread
+# count only look this many days back, so Postgres can prune old partitions
+# once the table is partitioned (`manage.py partition_notifications
+# --convert`). Older notifications then no longer show up, even unread.
+# Unset (the default), every notification is included.
+NOTIFICATION_LIST_DAYS = (
+    int(os.environ["NOTIFICATION_LIST_DAYS"])
+    if os.getenv("NOTIFICATION_LIST_DAYS")
+    else None
+)
+# Whole monthly partitions older than this are dropped by the scheduler.
+NOTIFICATION_PARTITION_RETENTION_MONTHS = int(
+    os.getenv("NOTIFICATION_PARTITION_RETENTION_MONTHS", "12")
+)
+
+# --- MAINTENANCE ---
+# Self-registered accounts that never verified their email are deleted after
+# this many days by the scheduler (`manage.py run_scheduler`).
+UNVERIFIED_USER_TTL_DAYS = int(os.getenv("UNVERIFIED_USER_TTL_DAYS", "7"))
+
+# --- PROJECT LINK CHECKS ---
+# The check_project_links job requests submitted project links to flag dead
+# ones for evaluators (see internships/links.py).
+LINK_CHECK_CONCURRENCY = int(os.getenv("LINK_CHECK_CONCURRENCY", "20"))
+# Minimum seconds between two requests to the same host.
+LINK_CHECK_HOST_INTERVAL = float(os.getenv("LINK_CHECK_HOST_INTERVAL", "0.5"))
+LINK_CHECK_TIMEOUT = float(os.getenv("LINK_CHECK_TIMEOUT", "10"))
+LINK_CHECK_CACHE_TIMEOUT = int(os.getenv("LINK_CHECK_CACHE_TIMEOUT", "21600"))
+LINK_CHECK_RETRY_MINUTES = int(os.getenv("LINK_CHECK_RETRY_MINUTES", "60"))
+LINK_CHECK_BATCH_SIZE = int(os.getenv("LINK_CHECK_BATCH_SIZE", "200"))
+LINK_CHECK_ALLOW_PRIVATE_HOSTS = False
+
+# --- DELTA SYNC ---
+# How long deletion tombstones are kept; `?changed_since=` cursors older than
+# this get 410 Gone and the client refetches the full list.
+SYNC_TOMBSTONE_RETENTION_DAYS = int(os.getenv("SYNC_TOMBSTONE_RETENTION_DAYS", "30"))
+
 # --- THIRD-PARTY SERVICE KEYS ---
 BREVO_API_KEY = os.getenv("BREVO_API_KEY")
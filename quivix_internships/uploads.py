@@ -0,0 +1,87 @@
+# quivix_internships/uploads.py
+
+import hmac
+import time
+import uuid
+
+from cloudinary import CloudinaryImage
+from cloudinary.utils import api_sign_request
+from django.conf import settings
+from rest_framework import serializers
+
+# Direct-to-Cloudinary uploads: the API signs the upload parameters, the
+# client posts the file straight to Cloudinary, then sends the result back to
+# a confirm endpoint that only records the public_id. Image bytes never pass
+# through our workers. Everything here is pure computation over
+# settings.CLOUDINARY_STORAGE, so it works (and is tested) offline.
+
+UPLOAD_URL = "https://api.cloudinary.com/v1_1/{cloud_name}/image/upload"
+ALLOWED_FORMATS = "jpg,jpeg,png,webp"
+# Applied by Cloudinary on upload, so oversized originals are never stored.
+INCOMING_TRANSFORMATION = "c_limit,w_1024,h_1024"
+
+
+def sign_upload(prefix, timestamp=None):
+    """
+    Returns everything a client needs to POST an image to Cloudinary under a
+    fresh public_id beneath `prefix`. All fields except `upload_url` are sent
+    as form fields alongside the file.
+    """
+    credentials = settings.CLOUDINARY_STORAGE
+    params = {
+        "public_id": f"{prefix}/{uuid.uuid4().hex}",
+        "timestamp": timestamp or int(time.time()),
+        "allowed_formats": ALLOWED_FORMATS,
+        "transformation": INCOMING_TRANSFORMATION,
+    }
+    return {
+        "upload_url": UPLOAD_URL.format(cloud_name=credentials["CLOUD_NAME"]),
+        "api_key": credentials["API_KEY"],
+        "signature": api_sign_request(params, credentials["API_SECRET"]),
+        **params,
+    }
+
+
+def verify_upload(public_id, version, signature):
+    """
+    Checks the signature Cloudinary returns with a successful upload, which
+    proves the public_id/version pair really came from Cloudinary.
+    """
+    expected = api_sign_request(
+        {"public_id": public_id, "version": version},
+        settings.CLOUDINARY_STORAGE["API_SECRET"],
+        signature_version=1,
+    )
+    return hmac.compare_digest(expected, signature)
+
+
+class UploadConfirmSerializer(serializers.Serializer):
+    """
+    Validates the upload result a client forwards from Cloudinary. The
+    expected public_id prefix is passed in the serializer context.
+    """
+
+    public_id = serializers.CharField(max_length=255)
+    version = serializers.IntegerField()
+    signature = serializers.CharField(max_length=128)
+    format = serializers.CharField(max_length=10)
+
+    def validate(self, data):
+        if not data["public_id"].startswith(self.context["prefix"] + "/"):
+            raise serializers.ValidationError(
+                {"public_id": "This upload does not belong here."}
+            )
+        if not verify_upload(data["public_id"], data["version"], data["signature"]):
+            raise serializers.ValidationError(
+                {"signature": "Invalid upload signature."}
+            )
+        return data
+
+    def to_image(self):
+        return CloudinaryImage(
+            self.validated_data["public_id"],
+            version=self.validated_data["version"],
+            format=self.validated_data["format"],
+            type="upload",
+            resource_type="image",
+        )
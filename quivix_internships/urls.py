@@ -3,12 +3,15 @@ from django.contrib import admin
 from django.urls import path, include
 from django.conf import settings
 from django.conf.urls.static import static
+from .views import BootstrapView, DatabasePoolStatsView
 
 urlpatterns = [
     path('admin/', admin.site.urls),
     path('api/auth/', include('users.urls')),
     path('api/internships/', include('internships.urls')),
     path('api/notifications/', include('notifications.urls')), # <-- ADD THIS!
+    path('api/bootstrap/', BootstrapView.as_view(), name='bootstrap'),
+    path('api/health/db-pool/', DatabasePoolStatsView.as_view(), name='db-pool-stats'),
 ]
 
 # This is for serving media files during development
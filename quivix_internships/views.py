@@ -0,0 +1,38 @@
+# quivix_internships/views.py
+
+from django.db import connections
+from rest_framework import permissions
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from .bootstrap import get_bootstrap
+
+
+class BootstrapView(APIView):
+    """
+    One call on app launch instead of four: the user (as UserSerializer
+    renders it), enrollment summaries, unread notification count and the
+    catalog version (null without a shared cache). Each section is cached
+    separately, see bootstrap.py.
+    """
+
+    permission_classes = [permissions.IsAuthenticated]
+
+    def get(self, request):
+        return Response(get_bootstrap(request.user))
+
+
+class DatabasePoolStatsView(APIView):
+    """
+    Staff-only view of this worker process's psycopg connection pool
+    (sizes, waiting clients, errors). Only meaningful with DB_POOL=True.
+    """
+
+    permission_classes = [permissions.IsAdminUser]
+
+    def get(self, request):
+        stats = {}
+        for alias in connections:
+            pool = getattr(connections[alias], "pool", None)
+            stats[alias] = pool.get_stats() if pool else None
+        return Response({"pooled": any(stats.values()), "pools": stats})
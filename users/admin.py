@@ -1,6 +1,7 @@
 from django.contrib import admin
 from django.contrib.auth.admin import UserAdmin
 from django.utils.html import format_html
+from quivix_internships.paginators import EstimatedCountPaginator
 from .models import CustomUser, UserProfile
 
 
@@ -12,6 +13,8 @@ class UserProfileInline(admin.StackedInline):
 
 
 class CustomUserAdmin(UserAdmin):
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
     inlines = (UserProfileInline,)
     list_display = ("email", "full_name", "is_verified", "is_staff")
     list_filter = ("is_staff", "is_superuser", "is_active", "is_verified", "groups")
@@ -42,6 +45,8 @@ class CustomUserAdmin(UserAdmin):
 
 @admin.register(UserProfile)
 class UserProfileAdmin(admin.ModelAdmin):
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
     list_display = (
         "user",
         "profile_picture_preview",
@@ -49,10 +54,17 @@ class UserProfileAdmin(admin.ModelAdmin):
         "major",
         "interest",
     )
+    list_select_related = ("user",)
+    search_fields = ("user__email", "user__full_name", "university")
+    autocomplete_fields = ("user",)
 
     def profile_picture_preview(self, obj):
         if obj.profile_picture:
-            return format_html('<img src="{}" width="50" />', obj.profile_picture.url)
+            # Ask Cloudinary for a 50px thumbnail rather than the full image.
+            url = obj.profile_picture.build_url(
+                width=50, height=50, crop="fill", secure=True
+            )
+            return format_html('<img src="{}" width="50" />', url)
         return "-"
 
     profile_picture_preview.short_description = "Profile Picture"
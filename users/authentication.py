@@ -0,0 +1,105 @@
+# users/authentication.py
+
+from django.conf import settings
+from django.core.cache import cache
+from django.utils.translation import gettext_lazy as _
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed, InvalidToken
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.utils import get_md5_hash_password
+
+from .cache import cache_is_shared, get_user_version
+from .models import UserProfile
+
+USER_KEY = "users:auth:{user_id}:{version}"
+
+
+class CachedJWTAuthentication(JWTAuthentication):
+    """
+    JWTAuthentication that resolves the user (with their profile already
+    joined) from a short-lived cache instead of querying Postgres on every
+    request. Entries are keyed by the user's cache version, which is bumped
+    whenever the CustomUser or UserProfile is saved or deleted.
+
+    The cache is only used when it is shared by every process (see
+    users.cache.cache_is_shared); otherwise a deactivation in one worker
+    would not reach the others, and each request loads the user instead.
+    """
+
+    def get_user(self, validated_token):
+        try:
+            user_id = validated_token[api_settings.USER_ID_CLAIM]
+        except KeyError as e:
+            raise InvalidToken(
+                _("Token contained no recognizable user identification")
+            ) from e
+
+        if cache_is_shared():
+            key = USER_KEY.format(user_id=user_id, version=get_user_version(user_id))
+            entry = cache.get(key)
+            if entry is None:
+                entry = snapshot(self.load_user(user_id))
+                cache.set(key, entry, timeout=settings.AUTH_USER_CACHE_TIMEOUT)
+            user = self.restore(entry)
+            revoke_hash = entry["revoke_hash"]
+        else:
+            user = self.load_user(user_id)
+            revoke_hash = revoke_claim(user)
+
+        if api_settings.CHECK_USER_IS_ACTIVE and not user.is_active:
+            raise AuthenticationFailed(_("User is inactive"), code="user_inactive")
+
+        if api_settings.CHECK_REVOKE_TOKEN:
+            if validated_token.get(api_settings.REVOKE_TOKEN_CLAIM) != revoke_hash:
+                raise AuthenticationFailed(
+                    _("The user's password has been changed."), code="password_changed"
+                )
+
+        return user
+
+    def load_user(self, user_id):
+        try:
+            return self.user_model.objects.select_related("profile").get(
+                **{api_settings.USER_ID_FIELD: user_id}
+            )
+        except self.user_model.DoesNotExist as e:
+            raise AuthenticationFailed(
+                _("User not found"), code="user_not_found"
+            ) from e
+
+    def restore(self, entry):
+        # The password is left deferred: reading it queries the database,
+        # and save() without update_fields then only writes loaded fields.
+        user = self.user_model.from_db("default", *zip(*entry["user"].items()))
+        profile = entry["profile"]
+        user.profile = (
+            UserProfile.from_db("default", *zip(*profile.items())) if profile else None
+        )
+        return user
+
+
+def revoke_claim(user):
+    if not api_settings.CHECK_REVOKE_TOKEN:
+        return None
+    return get_md5_hash_password(user.password)
+
+
+def snapshot(user):
+    """
+    The cache entry for an authenticated user: their fields and their
+    profile's, without the password hash.
+    """
+    profile = getattr(user, "profile", None)
+    return {
+        "user": {
+            field.attname: getattr(user, field.attname)
+            for field in user._meta.concrete_fields
+            if field.name != "password"
+        },
+        "profile": profile
+        and {
+            field.attname: getattr(profile, field.attname)
+            for field in profile._meta.concrete_fields
+        },
+        "revoke_hash": revoke_claim(user),
+    }
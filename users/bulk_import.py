@@ -0,0 +1,210 @@
+# users/bulk_import.py
+
+import csv
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice
+
+from django.contrib.auth.hashers import make_password
+from django.core.exceptions import ValidationError
+from django.core.validators import validate_email
+from django.db import transaction
+
+from internships import analytics
+from internships.models import Internship, UserInternship
+from .cache import ENROLLMENTS, bump_user_version
+from .models import CustomUser, UserProfile
+from .utils import send_invitation_emails
+
+# Cohort onboarding for partner universities. A CSV with the columns below
+# is read as a stream and processed in batches; each batch costs a handful
+# of queries however many rows it has:
+#
+#   email,full_name,nationality,university,major,interest,internship
+#
+# Only email and full_name are required. `internship` is an id and
+# overrides the importer's default. Users that already exist are enrolled
+# but not re-created. New users get an unusable password and are left
+# unverified; the invitation asks them to verify their email in the app,
+# which signs them in and can set a password. Until they set one, they sign
+# in with a fresh OTP each time (see users/views.py accepts_otp).
+
+COLUMNS = [
+    "email",
+    "full_name",
+    "nationality",
+    "university",
+    "major",
+    "interest",
+    "internship",
+]
+REQUIRED_COLUMNS = {"email", "full_name"}
+MAX_LENGTHS = {
+    field: CustomUser._meta.get_field(field).max_length
+    for field in ("full_name", "nationality")
+} | {
+    field: UserProfile._meta.get_field(field).max_length
+    for field in ("university", "major", "interest")
+}
+INTERESTS = set(UserProfile.InterestChoices.values)
+
+# Invitations go out from a single background thread so a large import
+# doesn't hold the request open while Brevo is called.
+_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="invitations")
+
+
+def read_csv(lines):
+    """
+    Yields (row_number, row) for each data row; row numbers match the
+    spreadsheet, so the header is row 1. Raises ValueError if required
+    columns are missing.
+    """
+    reader = csv.DictReader(lines)
+    missing = REQUIRED_COLUMNS - set(reader.fieldnames or [])
+    if missing:
+        raise ValueError(f"Missing column(s): {', '.join(sorted(missing))}.")
+    for row_number, row in enumerate(reader, start=2):
+        yield row_number, {
+            column: (row.get(column) or "").strip() for column in COLUMNS
+        }
+
+
+def import_cohort(
+    rows, internship_id=None, batch_size=500, send_invitations=True, queue=True
+):
+    """
+    Creates users, profiles and enrollments for rows from read_csv().
+    Returns a report with totals and per-row errors; rows with errors are
+    skipped, the rest of their batch is still imported.
+    """
+    report = {"created": 0, "existing": 0, "enrolled": 0, "errors": []}
+    seen = set()
+    rows = iter(rows)
+    while batch := list(islice(rows, batch_size)):
+        valid = _validate(batch, internship_id, seen, report["errors"])
+        invited = _import_batch(valid, report)
+        if send_invitations and invited:
+            if queue:
+                _executor.submit(send_invitation_emails, invited)
+            else:
+                send_invitation_emails(invited)
+    return report
+
+
+def _validate(batch, default_internship_id, seen, errors):
+    requested = {row["internship"] for _, row in batch if row["internship"]}
+    if default_internship_id:
+        requested.add(str(default_internship_id))
+    internship_ids = set(
+        Internship.objects.filter(
+            pk__in=[value for value in requested if value.isdigit()]
+        ).values_list("pk", flat=True)
+    )
+
+    valid = []
+    for row_number, row in batch:
+        problems = {}
+        email = CustomUser.objects.normalize_email(row["email"])
+        try:
+            validate_email(email)
+        except ValidationError:
+            problems["email"] = "Enter a valid email address."
+        if email in seen:
+            problems["email"] = "Duplicate email in this file."
+        if not row["full_name"]:
+            problems["full_name"] = "This field is required."
+        for field, max_length in MAX_LENGTHS.items():
+            if len(row[field]) > max_length:
+                problems[field] = f"At most {max_length} characters."
+        if row["interest"] and row["interest"] not in INTERESTS:
+            problems["interest"] = f"'{row['interest']}' is not a valid choice."
+
+        internship = row["internship"] or default_internship_id
+        if internship:
+            internship = int(internship) if str(internship).isdigit() else None
+            if internship not in internship_ids:
+                problems["internship"] = "Internship not found."
+
+        if problems:
+            errors.append(
+                {"row": row_number, "email": row["email"], "errors": problems}
+            )
+            continue
+        seen.add(email)
+        valid.append((email, row, internship))
+    return valid
+
+
+def _import_batch(valid, report):
+    """
+    Writes one batch with bulk inserts. bulk_create skips post_save, so the
+    profile signal, the analytics rollup and cache versions are handled
+    here. Returns the newly created users.
+    """
+    if not valid:
+        return []
+    existing = {
+        user.email: user
+        for user in CustomUser.objects.filter(
+            email__in=[email for email, _, _ in valid]
+        ).only("id", "email")
+    }
+    to_create = [(email, row) for email, row, _ in valid if email not in existing]
+    unusable_password = make_password(None)
+
+    with transaction.atomic():
+        new_users = CustomUser.objects.bulk_create(
+            [
+                CustomUser(
+                    email=email,
+                    full_name=row["full_name"],
+                    nationality=row["nationality"] or None,
+                    password=unusable_password,
+                )
+                for email, row in to_create
+            ]
+        )
+        UserProfile.objects.bulk_create(
+            [
+                UserProfile(
+                    user=user,
+                    university=row["university"] or None,
+                    major=row["major"] or None,
+                    interest=row["interest"] or None,
+                )
+                for user, (_, row) in zip(new_users, to_create)
+            ]
+        )
+
+        users = existing | {user.email: user for user in new_users}
+        wanted = {
+            (users[email].pk, internship)
+            for email, _, internship in valid
+            if internship
+        }
+        already_enrolled = set(
+            UserInternship.objects.filter(
+                user_id__in={user_id for user_id, _ in wanted},
+                internship_id__in={internship for _, internship in wanted},
+            ).values_list("user_id", "internship_id")
+        )
+        enrollments = UserInternship.objects.bulk_create(
+            [
+                UserInternship(user_id=user_id, internship_id=internship)
+                for user_id, internship in wanted - already_enrolled
+            ]
+        )
+
+        per_internship = Counter(enrollment.internship_id for enrollment in enrollments)
+        for internship, count in per_internship.items():
+            analytics.record_enrollment(
+                internship, UserInternship.Status.IN_PROGRESS, delta=count
+            )
+
+    for user_id in {enrollment.user_id for enrollment in enrollments}:
+        bump_user_version(user_id, ENROLLMENTS)
+
+    report["created"] += len(new_users)
+    report["existing"] += len(valid) - len(new_users)
+    report["enrolled"] += len(enrollments)
+    return new_users
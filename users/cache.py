@@ -0,0 +1,102 @@
+# users/cache.py
+
+import time
+from datetime import datetime, timezone
+from functools import wraps
+
+from asgiref.sync import iscoroutinefunction
+from django.conf import settings
+from django.core.cache import cache
+from django.views.decorators.http import condition
+
+VERSION_KEY = "users:version:{user_id}"
+
+# Optional scopes give independent versions for data that changes on its own
+# schedule (the user's enrollments, their notifications), so e.g. a new
+# notification doesn't evict the cached auth user.
+ENROLLMENTS = "enrollments"
+NOTIFICATIONS = "notifications"
+
+
+def cache_is_shared():
+    """
+    Whether every process sees the same cache (Redis). A version bumped in
+    one gunicorn worker, the scheduler or a management command only reaches
+    the other processes if it is, so anything that trusts a version without
+    asking the database must check this first.
+    """
+    return settings.CACHE_IS_SHARED
+
+
+def _version_key(user_id, scope):
+    key = VERSION_KEY.format(user_id=user_id)
+    return f"{key}:{scope}" if scope else key
+
+
+def get_user_version(user_id, scope=None):
+    """
+    Returns the current cache version for a user, creating one if needed.
+    Versions are timestamps rather than counters so that an evicted version
+    key can never bring an older cached entry back to life.
+    """
+    key = _version_key(user_id, scope)
+    version = cache.get(key)
+    if version is None:
+        version = time.time_ns()
+        if not cache.add(key, version, timeout=None):
+            version = cache.get(key, version)
+    return version
+
+
+def get_user_versions(user_id, scopes):
+    """
+    Like get_user_version() for several scopes at once, in one cache round
+    trip when all of them exist. Returns {scope: version}.
+    """
+    keys = {scope: _version_key(user_id, scope) for scope in scopes}
+    found = cache.get_many(keys.values())
+    return {
+        scope: found[key] if key in found else get_user_version(user_id, scope)
+        for scope, key in keys.items()
+    }
+
+
+def bump_user_version(user_id, scope=None):
+    """
+    Invalidates everything cached under the user's current version.
+    """
+    cache.set(_version_key(user_id, scope), time.time_ns(), timeout=None)
+
+
+def version_datetime(version):
+    """
+    The moment a version was issued, for use as a Last-Modified value.
+    """
+    return datetime.fromtimestamp(version / 1e9, tz=timezone.utc)
+
+
+def versioned_condition(etag_func, last_modified_func):
+    """
+    condition() for validators built from cache versions. Without a shared
+    cache another process may hold a stale version forever, so the view
+    then runs unconditionally and sends no validators.
+    """
+    conditional = condition(etag_func=etag_func, last_modified_func=last_modified_func)
+
+    def decorator(view):
+        guarded = conditional(view)
+        if iscoroutinefunction(view):
+
+            async def wrapper(request, *args, **kwargs):
+                handler = guarded if cache_is_shared() else view
+                return await handler(request, *args, **kwargs)
+
+        else:
+
+            def wrapper(request, *args, **kwargs):
+                handler = guarded if cache_is_shared() else view
+                return handler(request, *args, **kwargs)
+
+        return wraps(view)(wrapper)
+
+    return decorator
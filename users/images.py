@@ -0,0 +1,117 @@
+# users/images.py
+
+import io
+import logging
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.db import connection
+
+logger = logging.getLogger(__name__)
+
+# Magic numbers for the formats we accept, checked before Pillow sees the file.
+SIGNATURES = {
+    b"\xff\xd8\xff": "JPEG",
+    b"\x89PNG\r\n\x1a\n": "PNG",
+    b"GIF87a": "GIF",
+    b"GIF89a": "GIF",
+}
+MAX_PIXELS = 40_000_000
+CHUNK_SIZE = 64 * 1024
+
+# Pillow releases the GIL while decoding/resizing, so a couple of threads
+# are enough to keep this work off the request thread. Queued jobs are
+# finished when the worker exits cleanly (the executor joins its threads at
+# shutdown) but lost if it is killed; the user then has to upload again.
+_executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="images")
+
+
+def sniff_format(file):
+    """
+    Returns the image format from the file's leading bytes, or None if it
+    isn't one we accept. Leaves the file position at the start.
+    """
+    file.seek(0)
+    header = file.read(12)
+    file.seek(0)
+    if header[:4] == b"RIFF" and header[8:12] == b"WEBP":
+        return "WEBP"
+    for magic, image_format in SIGNATURES.items():
+        if header.startswith(magic):
+            return image_format
+    return None
+
+
+def read_dimensions(file):
+    """
+    Reads only the image header to get (width, height); no pixels are decoded.
+    """
+    from PIL import Image
+
+    file.seek(0)
+    with Image.open(file) as image:
+        size = image.size
+    file.seek(0)
+    return size
+
+
+def normalize(data, max_size, image_format):
+    """
+    Decodes `data`, applies the EXIF orientation, shrinks it to fit in a
+    max_size x max_size box and re-encodes it as WEBP or JPEG. Metadata
+    (EXIF, GPS, ICC comments) is not carried over.
+    """
+    from PIL import Image, ImageOps
+
+    with Image.open(io.BytesIO(data)) as image:
+        image.draft("RGB", (max_size, max_size))  # cheap JPEG downscale on decode
+        image = ImageOps.exif_transpose(image)
+        image.thumbnail((max_size, max_size), Image.Resampling.LANCZOS)
+        if image_format == "JPEG" or image.mode not in ("RGB", "RGBA"):
+            image = image.convert("RGB" if image_format == "JPEG" else "RGBA")
+        output = io.BytesIO()
+        image.save(output, image_format, quality=82, optimize=True)
+    return output.getvalue()
+
+
+def copy_upload(file):
+    """
+    Copies an upload into memory in chunks; Django deletes the temporary file
+    when the request ends, before the background job runs.
+    """
+    buffer = io.BytesIO()
+    file.seek(0)
+    for chunk in file.chunks(CHUNK_SIZE):
+        buffer.write(chunk)
+    return buffer.getvalue()
+
+
+def process_profile_picture(profile_id, data):
+    """
+    Background job: normalizes the image and stores it on the profile.
+    """
+    from .models import UserProfile
+
+    try:
+        image_format = settings.AVATAR_FORMAT
+        extension = "webp" if image_format == "WEBP" else "jpg"
+        content = normalize(data, settings.AVATAR_SIZE, image_format)
+        profile = UserProfile.objects.get(pk=profile_id)
+        profile.profile_picture = SimpleUploadedFile(
+            f"avatar.{extension}", content, content_type=f"image/{extension}"
+        )
+        profile.save(update_fields=["profile_picture"])
+    except Exception:
+        logger.exception("Failed to process profile picture for profile %s", profile_id)
+    finally:
+        # Pool threads are long-lived; don't let them pin a DB connection.
+        connection.close()
+
+
+def schedule_profile_picture(profile, file):
+    data = copy_upload(file)
+    if settings.IMAGE_PROCESSING_INLINE:
+        process_profile_picture(profile.pk, data)
+    else:
+        _executor.submit(process_profile_picture, profile.pk, data)
@@ -0,0 +1,38 @@
+# users/jobs.py
+
+from datetime import timedelta
+
+from django.conf import settings
+from django.contrib.auth.hashers import UNUSABLE_PASSWORD_PREFIX
+from django.utils import timezone
+from maintenance.registry import delete_in_batches, job
+from .models import OTP, OTP_LIFETIME, CustomUser, ThrottleCounter
+
+
+@job(interval=timedelta(hours=1))
+def purge_expired_otps():
+    return delete_in_batches(
+        OTP.objects.filter(created_at__lt=timezone.now() - OTP_LIFETIME)
+    )
+
+
+@job(interval=timedelta(days=1))
+def delete_unverified_users():
+    """
+    Removes self-registered accounts that never verified their email. Users
+    created by a cohort import have no usable password yet and are kept.
+    """
+    cutoff = timezone.now() - timedelta(days=settings.UNVERIFIED_USER_TTL_DAYS)
+    return delete_in_batches(
+        CustomUser.objects.filter(
+            is_verified=False, is_staff=False, date_joined__lt=cutoff
+        ).exclude(password__startswith=UNUSABLE_PASSWORD_PREFIX),
+        batch_size=100,
+    )
+
+
+@job(interval=timedelta(hours=1))
+def purge_throttle_counters():
+    return delete_in_batches(
+        ThrottleCounter.objects.filter(expires_at__lt=timezone.now())
+    )
@@ -0,0 +1,61 @@
+# users/management/commands/import_cohort.py
+
+import sys
+
+from django.core.management.base import BaseCommand, CommandError
+from users.bulk_import import import_cohort, read_csv
+
+
+class Command(BaseCommand):
+    """
+    Command-line counterpart of the staff cohort import endpoint, for files
+    too large to upload. Invitations are sent before the command exits.
+    """
+
+    help = "Creates and enrolls users from a partner-university CSV."
+
+    def add_arguments(self, parser):
+        parser.add_argument("path", help="CSV file, or - for stdin.")
+        parser.add_argument(
+            "--internship", type=int, help="Enroll rows without an internship here."
+        )
+        parser.add_argument("--batch-size", type=int, default=500)
+        parser.add_argument(
+            "--no-invitations",
+            action="store_true",
+            help="Create the accounts without emailing anyone.",
+        )
+
+    def handle(self, *args, **options):
+        path = options["path"]
+        try:
+            lines = (
+                sys.stdin
+                if path == "-"
+                else open(path, encoding="utf-8-sig", newline="")
+            )
+        except OSError as e:
+            raise CommandError(e)
+
+        with lines:
+            try:
+                report = import_cohort(
+                    read_csv(lines),
+                    internship_id=options["internship"],
+                    batch_size=options["batch_size"],
+                    send_invitations=not options["no_invitations"],
+                    queue=False,
+                )
+            except ValueError as e:
+                raise CommandError(e)
+
+        for error in report["errors"]:
+            problems = "; ".join(f"{k}: {v}" for k, v in error["errors"].items())
+            self.stderr.write(f"  row {error['row']} ({error['email']}): {problems}")
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Created {report['created']} user(s), {report['existing']} "
+                f"already existed, {report['enrolled']} enrollment(s); "
+                f"{len(report['errors'])} row(s) rejected."
+            )
+        )
@@ -0,0 +1,80 @@
+# users/management/commands/profile_startup.py
+
+import os
+import re
+import subprocess
+import sys
+from collections import defaultdict
+
+from django.core.management.base import BaseCommand, CommandError
+
+# Runs in a fresh interpreter so nothing is already imported. Phase timings
+# are printed to stdout, `-X importtime` writes the import log to stderr.
+STARTUP_SCRIPT = """
+import time
+start = time.perf_counter()
+import django
+django.setup()
+setup_done = time.perf_counter()
+from django.urls import get_resolver
+get_resolver().url_patterns
+urls_done = time.perf_counter()
+print(f"django.setup() {setup_done - start:.6f}")
+print(f"URLConf {urls_done - setup_done:.6f}")
+"""
+
+IMPORT_LINE = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \|(\s*)(\S+)")
+
+
+class Command(BaseCommand):
+    """
+    Reports where cold-start time goes: wall time of django.setup() and of
+    loading the URLConf, plus an import-time breakdown by top-level package.
+    """
+
+    help = "Profiles import time for django.setup() and URLConf loading."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--top", type=int, default=15, help="Number of packages/modules to list."
+        )
+
+    def handle(self, *args, **options):
+        result = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", STARTUP_SCRIPT],
+            capture_output=True,
+            text=True,
+            env=os.environ.copy(),
+        )
+        if result.returncode != 0:
+            raise CommandError(f"Startup failed:\n{result.stderr[-2000:]}")
+
+        self.stdout.write(self.style.MIGRATE_HEADING("Phases"))
+        for line in result.stdout.splitlines():
+            phase, seconds = line.rsplit(" ", 1)
+            self.stdout.write(f"  {phase:<20} {float(seconds) * 1000:8.1f} ms")
+
+        by_package = defaultdict(int)
+        modules = []
+        for line in result.stderr.splitlines():
+            match = IMPORT_LINE.match(line)
+            if not match:
+                continue
+            self_us, cumulative_us, indent, name = match.groups()
+            by_package[name.split(".")[0]] += int(self_us)
+            if len(indent) == 1:  # imported directly, not by another module
+                modules.append((int(cumulative_us), name))
+
+        top = options["top"]
+        total = sum(by_package.values())
+        self.stdout.write(
+            self.style.MIGRATE_HEADING(
+                f"Import time by package (total {total / 1000:.1f} ms)"
+            )
+        )
+        for package, us in sorted(by_package.items(), key=lambda i: -i[1])[:top]:
+            self.stdout.write(f"  {package:<30} {us / 1000:8.1f} ms")
+
+        self.stdout.write(self.style.MIGRATE_HEADING("Slowest top-level imports"))
+        for us, name in sorted(modules, reverse=True)[:top]:
+            self.stdout.write(f"  {name:<30} {us / 1000:8.1f} ms")
@@ -0,0 +1,54 @@
+# users/management/commands/warmup.py
+
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import connection
+from django.urls import get_resolver
+from internships import catalog
+from users.cache import cache_is_shared
+
+
+class Command(BaseCommand):
+    """
+    Deploy-time warmup: wakes the (possibly suspended) Neon database and
+    checks that the URLConf and every view module import. It runs in the
+    build process, so the only state it can leave for the web workers is in
+    the database or a shared cache: with Redis configured it precomputes the
+    catalog version and facets there; with the per-process LocMemCache there
+    is nothing to prime and that step is skipped.
+    """
+
+    help = "Wakes the database and primes the shared cache after a deploy."
+
+    def handle(self, *args, **options):
+        self.step("Database connection", self.warm_database)
+        self.step("URLConf and views", self.warm_urls)
+        self.step("Cache", self.warm_cache)
+
+    def step(self, name, func):
+        start = time.perf_counter()
+        try:
+            detail = func()
+        except Exception as e:
+            # Warmup must never fail a deploy.
+            self.stdout.write(self.style.WARNING(f"{name}: skipped ({e})"))
+            return
+        elapsed = (time.perf_counter() - start) * 1000
+        suffix = f" - {detail}" if detail else ""
+        self.stdout.write(self.style.SUCCESS(f"{name}: {elapsed:.0f} ms{suffix}"))
+
+    def warm_database(self):
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT 1")
+
+    def warm_urls(self):
+        return f"{len(get_resolver().reverse_dict)} routes"
+
+    def warm_cache(self):
+        if not cache_is_shared():
+            return "skipped, the cache is per process"
+        facets = catalog.get_facets()
+        return (
+            f"catalog facets for {sum(f['count'] for f in facets['field'])} internships"
+        )
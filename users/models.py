@@ -10,6 +10,7 @@ from django.utils import timezone
 from datetime import timedelta
 from cloudinary.models import CloudinaryField
 from cloudinary.uploader import destroy
+from .cache import bump_user_version
 
 
 # -------------------------
@@ -76,6 +77,10 @@ class UserProfile(models.Model):
         return f"{self.user.full_name}'s Profile"
 
 
+# Everything but profile_picture, which only users/images.py writes.
+PROFILE_FIELDS = ["university", "major", "interest"]
+
+
 # -------------------------
 # Signals: create & save user profile
 # -------------------------
@@ -87,8 +92,25 @@ def create_user_profile(sender, instance, created, **kwargs):
 
 @receiver(post_save, sender=CustomUser)
 def save_user_profile(sender, instance, **kwargs):
+    # The picture is written separately by the image pipeline; saving a
+    # possibly stale copy of it here would undo that.
     if hasattr(instance, "profile"):
-        instance.profile.save()
+        instance.profile.save(update_fields=PROFILE_FIELDS)
+
+
+# -------------------------
+# Signals: invalidate cached auth user on any change
+# -------------------------
+@receiver(post_save, sender=CustomUser)
+@receiver(post_delete, sender=CustomUser)
+def invalidate_cached_user(sender, instance, **kwargs):
+    bump_user_version(instance.pk)
+
+
+@receiver(post_save, sender=UserProfile)
+@receiver(post_delete, sender=UserProfile)
+def invalidate_cached_user_profile(sender, instance, **kwargs):
+    bump_user_version(instance.user_id)
 
 
 # -------------------------
@@ -98,6 +120,9 @@ def save_user_profile(sender, instance, **kwargs):
 def delete_old_profile_picture(sender, instance, **kwargs):
     if not instance.pk:
         return  # New profile, nothing to delete
+    update_fields = kwargs.get("update_fields")
+    if update_fields is not None and "profile_picture" not in update_fields:
+        return  # Picture not being written
 
     try:
         old_profile = UserProfile.objects.get(pk=instance.pk)
@@ -130,13 +155,29 @@ def delete_profile_picture_on_delete(sender, instance, **kwargs):
 # -------------------------
 # OTP Model
 # -------------------------
+OTP_LIFETIME = timedelta(minutes=10)
+
+
 class OTP(models.Model):
     user = models.ForeignKey(CustomUser, on_delete=models.CASCADE)
     otp_code = models.CharField(max_length=6)
     created_at = models.DateTimeField(auto_now_add=True)
 
     def is_expired(self):
-        return timezone.now() > self.created_at + timedelta(minutes=10)
+        return timezone.now() > self.created_at + OTP_LIFETIME
 
     def __str__(self):
         return f"OTP for {self.user.email}: {self.otp_code}"
+
+
+# -------------------------
+# Throttle counters (users/throttling.py) for deployments without a
+# shared cache; one row per throttle key and window.
+# -------------------------
+class ThrottleCounter(models.Model):
+    key = models.CharField(max_length=200, unique=True)
+    count = models.PositiveIntegerField(default=0)
+    expires_at = models.DateTimeField(db_index=True)
+
+    def __str__(self):
+        return f"{self.key}: {self.count}"
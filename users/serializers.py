@@ -1,19 +1,48 @@
 from rest_framework import serializers
+from .images import MAX_PIXELS, read_dimensions, schedule_profile_picture, sniff_format
 from .models import CustomUser, UserProfile
 
 
 class UserProfileSerializer(serializers.ModelSerializer):
-    profile_picture = serializers.ImageField(required=False, allow_null=True)
+    # A plain FileField: the image is checked by header sniffing here and only
+    # decoded by the background pipeline in users/images.py.
+    profile_picture = serializers.FileField(required=False, allow_null=True)
 
     class Meta:
         model = UserProfile
         fields = ["profile_picture", "university", "major", "interest"]
 
     def validate_profile_picture(self, value):
-        if value and value.size > 3 * 1024 * 1024:
+        if not value:
+            return value
+        if value.size > 3 * 1024 * 1024:
             raise serializers.ValidationError("Profile picture must be less than 3 MB.")
+        if sniff_format(value) is None:
+            raise serializers.ValidationError("Upload a JPEG, PNG, GIF or WebP image.")
+        try:
+            width, height = read_dimensions(value)
+        except Exception:
+            raise serializers.ValidationError("The image file is corrupt.")
+        if width * height > MAX_PIXELS:
+            raise serializers.ValidationError("The image dimensions are too large.")
         return value
 
+    def update(self, instance, validated_data):
+        # New pictures are normalized (resized, re-encoded, metadata stripped)
+        # off the request thread and stored on the profile when done. Only the
+        # fields sent are saved, so this can't write back an older picture
+        # over one the background job has just stored.
+        picture = validated_data.get("profile_picture")
+        if picture:
+            del validated_data["profile_picture"]
+        for attr, value in validated_data.items():
+            setattr(instance, attr, value)
+        if validated_data:
+            instance.save(update_fields=list(validated_data))
+        if picture:
+            schedule_profile_picture(instance, picture)
+        return instance
+
     def to_representation(self, instance):
         representation = super().to_representation(instance)
         if instance.profile_picture:
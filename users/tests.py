@@ -1,3 +1,600 @@
-from django.test import TestCase
+import hashlib
+import io
+from datetime import timedelta
+from io import StringIO
+from types import SimpleNamespace
+from unittest import mock
 
-# Create your tests here.
+from django.conf import settings
+from django.contrib.auth.backends import ModelBackend
+from django.core.cache import cache
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.db import connection
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APIClient, APIRequestFactory
+from rest_framework_simplejwt.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.tokens import AccessToken, RefreshToken
+
+from internships import catalog
+from internships.models import Internship, UserInternship
+from quivix_internships.paginators import EstimatedCountPaginator
+from quivix_internships.uploads import (
+    UploadConfirmSerializer,
+    sign_upload,
+    verify_upload,
+)
+from .authentication import USER_KEY, CachedJWTAuthentication
+from .bulk_import import COLUMNS, import_cohort
+from .cache import bump_user_version, get_user_version
+from .images import normalize, sniff_format
+from .jobs import delete_unverified_users
+from .models import CustomUser, ThrottleCounter, UserProfile
+from .serializers import UserProfileSerializer
+from .throttling import EmailRateThrottle, IPRateThrottle
+
+EMPTY_ROW = dict.fromkeys(COLUMNS, "")
+CLOUDINARY_STORAGE = {"CLOUD_NAME": "demo", "API_KEY": "1234", "API_SECRET": "s3cret"}
+
+
+@override_settings(CLOUDINARY_STORAGE=CLOUDINARY_STORAGE)
+class DirectUploadSigningTests(SimpleTestCase):
+    def test_sign_upload_signs_all_upload_params(self):
+        signed = sign_upload("profile_pictures/user_1", timestamp=1700000000)
+
+        self.assertTrue(signed["public_id"].startswith("profile_pictures/user_1/"))
+        self.assertEqual(
+            signed["upload_url"], "https://api.cloudinary.com/v1_1/demo/image/upload"
+        )
+        self.assertEqual(signed["api_key"], "1234")
+        to_sign = "&".join(
+            f"{key}={signed[key]}"
+            for key in ("allowed_formats", "public_id", "timestamp", "transformation")
+        )
+        self.assertEqual(
+            signed["signature"], hashlib.sha1((to_sign + "s3cret").encode()).hexdigest()
+        )
+
+    def test_verify_upload(self):
+        signature = hashlib.sha1(b"public_id=a/b&version=42s3cret").hexdigest()
+        self.assertTrue(verify_upload("a/b", 42, signature))
+        self.assertFalse(verify_upload("a/c", 42, signature))
+
+    def test_confirm_rejects_uploads_outside_prefix(self):
+        signature = hashlib.sha1(b"public_id=other/x&version=1s3cret").hexdigest()
+        serializer = UploadConfirmSerializer(
+            data={
+                "public_id": "other/x",
+                "version": 1,
+                "signature": signature,
+                "format": "jpg",
+            },
+            context={"prefix": "profile_pictures/user_1"},
+        )
+        self.assertFalse(serializer.is_valid())
+        self.assertIn("public_id", serializer.errors)
+
+    def test_confirm_builds_image(self):
+        public_id = "profile_pictures/user_1/abc"
+        signature = hashlib.sha1(
+            f"public_id={public_id}&version=7s3cret".encode()
+        ).hexdigest()
+        serializer = UploadConfirmSerializer(
+            data={
+                "public_id": public_id,
+                "version": 7,
+                "signature": signature,
+                "format": "png",
+            },
+            context={"prefix": "profile_pictures/user_1"},
+        )
+        self.assertTrue(serializer.is_valid(), serializer.errors)
+        self.assertEqual(
+            serializer.to_image().get_prep_value(),
+            "image/upload/v7/profile_pictures/user_1/abc.png",
+        )
+
+
+class AdminChangelistTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = CustomUser.objects.create_superuser("admin@example.com", "Admin")
+
+    def setUp(self):
+        self.client.force_login(self.admin)
+
+    def add_users(self, count):
+        for _ in range(count):
+            n = CustomUser.objects.count()
+            CustomUser.objects.create_user(f"user{n}@example.com", f"User {n}")
+
+    def count_queries(self, url):
+        self.client.get(url)  # warm per-process caches (content types etc.)
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        return len(queries)
+
+    def test_changelist_queries_do_not_grow_with_rows(self):
+        for url_name in (
+            "admin:users_customuser_changelist",
+            "admin:users_userprofile_changelist",
+        ):
+            with self.subTest(url_name):
+                url = reverse(url_name)
+                self.add_users(2)
+                small = self.count_queries(url)
+                self.add_users(5)
+                self.assertEqual(self.count_queries(url), small)
+
+    @override_settings(ADMIN_ESTIMATED_COUNT_THRESHOLD=1)
+    def test_paginator_uses_estimate_for_unfiltered_changelist(self):
+        self.add_users(3)
+        with connection.cursor() as cursor:
+            cursor.execute("ANALYZE users_customuser")
+
+        paginator = EstimatedCountPaginator(CustomUser.objects.order_by("pk"), 10)
+        with CaptureQueriesContext(connection) as queries:
+            self.assertEqual(paginator.count, 4)
+        self.assertIn("reltuples", queries[0]["sql"])
+
+        filtered = EstimatedCountPaginator(
+            CustomUser.objects.filter(is_staff=True).order_by("pk"), 10
+        )
+        self.assertEqual(filtered.count, 1)
+
+
+class ProfileConditionalGetTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = CustomUser.objects.create_user("student@example.com", "Student")
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        self.url = reverse("user_profile")
+
+    @override_settings(CACHE_IS_SHARED=True)
+    def test_version_bump_elsewhere_invalidates_etag(self):
+        etag = self.client.get(self.url)["ETag"]
+        self.assertEqual(
+            self.client.get(self.url, headers={"if-none-match": etag}).status_code,
+            304,
+        )
+        # As a save in another worker, the scheduler or a command would.
+        bump_user_version(self.user.pk)
+        response = self.client.get(self.url, headers={"if-none-match": etag})
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response["ETag"], etag)
+
+    @override_settings(CACHE_IS_SHARED=False)
+    def test_no_validators_without_shared_cache(self):
+        response = self.client.get(self.url)
+        self.assertNotIn("ETag", response)
+        self.assertNotIn("Last-Modified", response)
+        response = self.client.get(self.url, headers={"if-none-match": "*"})
+        self.assertEqual(response.status_code, 200)
+
+
+class CachedAuthenticationTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = CustomUser.objects.create_user(
+            "student@example.com", "Student", password="correct horse"
+        )
+
+    def setUp(self):
+        cache.clear()
+        self.token = AccessToken.for_user(self.user)
+
+    def authenticate(self):
+        with CaptureQueriesContext(connection) as queries:
+            user = CachedJWTAuthentication().get_user(self.token)
+        return user, len(queries)
+
+    @override_settings(CACHE_IS_SHARED=True)
+    def test_cached_without_password(self):
+        self.assertEqual(self.authenticate()[1], 1)
+        user, queries = self.authenticate()
+        self.assertEqual(queries, 0)
+        self.assertEqual(user.email, "student@example.com")
+        self.assertIsNone(user.profile.university)
+        entry = cache.get(
+            USER_KEY.format(
+                user_id=self.user.pk, version=get_user_version(self.user.pk)
+            )
+        )
+        self.assertNotIn("password", entry["user"])
+        self.assertNotIn(self.user.password, repr(entry))
+
+    @override_settings(CACHE_IS_SHARED=True)
+    def test_deactivation_invalidates(self):
+        self.authenticate()
+        user = CustomUser.objects.get(pk=self.user.pk)
+        user.is_active = False
+        user.save()
+        with self.assertRaises(AuthenticationFailed):
+            self.authenticate()
+
+    @override_settings(CACHE_IS_SHARED=True)
+    def test_profile_save_invalidates(self):
+        self.authenticate()
+        profile = UserProfile.objects.get(user=self.user)
+        profile.university = "Example University"
+        profile.save()
+        self.assertEqual(
+            self.authenticate()[0].profile.university, "Example University"
+        )
+
+    @override_settings(CACHE_IS_SHARED=True)
+    def test_saving_cached_user_keeps_password(self):
+        self.authenticate()
+        user = self.authenticate()[0]
+        user.full_name = "Renamed"
+        user.save()
+        user = CustomUser.objects.get(pk=self.user.pk)
+        self.assertEqual(user.full_name, "Renamed")
+        self.assertTrue(user.check_password("correct horse"))
+
+    @override_settings(CACHE_IS_SHARED=False)
+    def test_not_cached_without_shared_cache(self):
+        self.authenticate()
+        self.assertEqual(self.authenticate()[1], 1)
+
+
+def throttle_rates(**rates):
+    return {**settings.REST_FRAMEWORK, "DEFAULT_THROTTLE_RATES": rates}
+
+
+@override_settings(REST_FRAMEWORK=throttle_rates(test_ip="4/min"))
+class SlidingWindowThrottleTests(TestCase):
+    view = SimpleNamespace(throttle_scope="test")
+    start = 6000.0  # a window boundary for 60 s windows
+
+    def setUp(self):
+        cache.clear()
+        self.request = APIRequestFactory().get("/", REMOTE_ADDR="10.0.0.1")
+
+    def attempt(self, at):
+        throttle = IPRateThrottle()
+        throttle.timer = lambda: self.start + at
+        return throttle.allow_request(self.request, self.view), throttle
+
+    def check_window(self):
+        self.assertEqual([self.attempt(n)[0] for n in range(5)], [True] * 4 + [False])
+        # Halfway through the next window the previous one counts for 2.
+        self.assertEqual([self.attempt(90)[0] for _ in range(3)], [True, True, False])
+        allowed, throttle = self.attempt(90)
+        self.assertFalse(allowed)
+        self.assertEqual(throttle.estimate, 4)
+        self.assertEqual(throttle.wait(), 15)  # 60 s / 4 requests
+        self.assertEqual(self.attempt(200)[0], True)
+
+    @override_settings(CACHE_IS_SHARED=True)
+    def test_window_estimate_in_cache(self):
+        self.check_window()
+        self.assertFalse(ThrottleCounter.objects.exists())
+
+    @override_settings(CACHE_IS_SHARED=False)
+    def test_window_estimate_in_database(self):
+        self.check_window()
+        # Counters outlive the per-process cache, as in another worker.
+        cache.clear()
+        self.assertFalse(self.attempt(90)[0])
+
+    def test_unknown_scope_is_not_throttled(self):
+        view = SimpleNamespace(throttle_scope="other")
+        self.assertTrue(IPRateThrottle().allow_request(self.request, view))
+
+    def test_email_ident_is_normalized_and_hashed(self):
+        ident = EmailRateThrottle().get_ident_value(
+            SimpleNamespace(data={"email": " Ann@Example.com "})
+        )
+        self.assertEqual(
+            ident,
+            EmailRateThrottle().get_ident_value(
+                SimpleNamespace(data={"email": "ann@example.com"})
+            ),
+        )
+        self.assertNotIn("ann", ident)
+        self.assertIsNone(EmailRateThrottle().get_ident_value(SimpleNamespace(data={})))
+
+
+@override_settings(
+    REST_FRAMEWORK=throttle_rates(login_ip="100/min", login_email="1/min")
+)
+class LoginThrottleTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.url = reverse("token_obtain_pair")
+        self.body = {"email": "student@example.com", "password": "wrong"}
+
+    def login(self):
+        return self.client.post(self.url, self.body, content_type="application/json")
+
+    @override_settings(CACHE_IS_SHARED=True)
+    def test_throttled_login_skips_database_and_hasher(self):
+        with mock.patch.object(
+            ModelBackend, "authenticate", autospec=True, return_value=None
+        ) as authenticate:
+            self.assertEqual(self.login().status_code, 401)
+            with CaptureQueriesContext(connection) as queries:
+                response = self.login()
+        self.assertEqual(response.status_code, 429)
+        self.assertIn("Retry-After", response)
+        self.assertEqual(len(queries), 0)
+        self.assertEqual(authenticate.call_count, 1)
+
+    @override_settings(CACHE_IS_SHARED=False)
+    def test_throttled_login_skips_hasher_without_shared_cache(self):
+        with mock.patch.object(
+            ModelBackend, "authenticate", autospec=True, return_value=None
+        ) as authenticate:
+            self.assertEqual(self.login().status_code, 401)
+            cache.clear()
+            self.assertEqual(self.login().status_code, 429)
+        self.assertEqual(authenticate.call_count, 1)
+
+
+class WarmupCommandTests(TestCase):
+    def setUp(self):
+        cache.clear()
+
+    def warmup(self):
+        out = StringIO()
+        call_command("warmup", stdout=out)
+        return out.getvalue()
+
+    @override_settings(CACHE_IS_SHARED=True)
+    def test_primes_facets_in_a_shared_cache(self):
+        output = self.warmup()
+
+        self.assertIn("Database connection:", output)
+        self.assertIn("catalog facets", output)
+        key = catalog.FACETS_KEY.format(version=catalog.get_catalog_version())
+        self.assertIsNotNone(cache.get(key))
+
+    @override_settings(CACHE_IS_SHARED=False)
+    def test_skips_priming_a_per_process_cache(self):
+        output = self.warmup()
+
+        self.assertIn("skipped, the cache is per process", output)
+        self.assertIsNone(cache.get(catalog.CATALOG_VERSION_KEY))
+
+
+@mock.patch("users.bulk_import._executor")
+class BulkImportTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = CustomUser.objects.create_superuser("admin@example.com", "Admin")
+        cls.internship = Internship.objects.create(
+            title="Course", description="-", field="Web Development", length_days=30
+        )
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(self.admin)
+
+    def upload(self, csv_text, **data):
+        upload = SimpleUploadedFile("cohort.csv", csv_text.encode(), "text/csv")
+        return self.client.post(
+            reverse("cohort_import"), {"file": upload, **data}, format="multipart"
+        )
+
+    def test_import(self, executor):
+        existing = CustomUser.objects.create_user("old@example.com", "Old")
+        response = self.upload(
+            "email,full_name,university,interest\n"
+            "ada@example.com,Ada,Uni,Web Development\n"
+            "old@EXAMPLE.com,Old,,\n"
+            "ada@example.com,Ada Again,,\n"
+            "not-an-email,Bad,,\n"
+            "grace@example.com,,,\n"
+            "alan@example.com,Alan,,Knitting\n",
+            internship=self.internship.pk,
+        )
+
+        self.assertEqual(response.status_code, 200)
+        report = response.json()
+        self.assertEqual(
+            (report["created"], report["existing"], report["enrolled"]), (1, 1, 2)
+        )
+        self.assertEqual(
+            [(error["row"], list(error["errors"])) for error in report["errors"]],
+            [(4, ["email"]), (5, ["email"]), (6, ["full_name"]), (7, ["interest"])],
+        )
+
+        ada = CustomUser.objects.get(email="ada@example.com")
+        self.assertFalse(ada.has_usable_password())
+        self.assertFalse(ada.is_verified)
+        self.assertEqual(ada.profile.university, "Uni")
+        self.assertEqual(
+            set(
+                UserInternship.objects.filter(internship=self.internship).values_list(
+                    "user_id", flat=True
+                )
+            ),
+            {ada.pk, existing.pk},
+        )
+        # Only new users are invited.
+        (call,) = executor.submit.call_args_list
+        self.assertEqual(call.args[1], [ada])
+
+    def test_unknown_internship_and_missing_column(self, executor):
+        report = self.upload(
+            "email,full_name,internship\nada@example.com,Ada,999999\n"
+        ).json()
+        self.assertEqual(
+            report["errors"][0]["errors"], {"internship": "Internship not found."}
+        )
+        self.assertFalse(CustomUser.objects.filter(email="ada@example.com").exists())
+
+        response = self.upload("email\nada@example.com\n")
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("full_name", response.json()["error"])
+
+    def test_staff_only(self, executor):
+        self.client.force_authenticate(
+            CustomUser.objects.create_user("student@example.com", "Student")
+        )
+        self.assertEqual(self.upload("email,full_name\n").status_code, 403)
+
+    def test_imported_users_survive_unverified_cleanup(self, executor):
+        self.upload("email,full_name\nada@example.com,Ada\n")
+        CustomUser.objects.create_user("self@example.com", "Self", "s3cret-pass")
+        CustomUser.objects.update(
+            date_joined=timezone.now()
+            - timedelta(days=settings.UNVERIFIED_USER_TTL_DAYS + 1)
+        )
+
+        self.assertEqual(delete_unverified_users(), 1)
+        self.assertEqual(
+            set(CustomUser.objects.values_list("email", flat=True)),
+            {"admin@example.com", "ada@example.com"},
+        )
+
+
+def image_bytes(size, image_format="JPEG", orientation=None):
+    from PIL import Image
+
+    image = Image.new("RGB", size, "red")
+    exif = Image.Exif()
+    if orientation:
+        exif[0x0112] = orientation
+    output = io.BytesIO()
+    image.save(output, image_format, exif=exif)
+    return output.getvalue()
+
+
+class ProfilePictureTests(SimpleTestCase):
+    def test_sniff_format(self):
+        self.assertEqual(sniff_format(io.BytesIO(image_bytes((4, 4), "PNG"))), "PNG")
+        self.assertEqual(sniff_format(io.BytesIO(image_bytes((4, 4)))), "JPEG")
+        self.assertIsNone(sniff_format(io.BytesIO(b"<svg onload=alert(1)>")))
+
+    def test_normalize_rotates_shrinks_and_strips_metadata(self):
+        from PIL import Image
+
+        # Orientation 6: stored landscape, displayed rotated to portrait.
+        data = normalize(image_bytes((1200, 600), orientation=6), 512, "WEBP")
+
+        with Image.open(io.BytesIO(data)) as image:
+            self.assertEqual(image.format, "WEBP")
+            self.assertEqual(image.size, (256, 512))
+            self.assertNotIn(0x0112, image.getexif())
+
+    def test_serializer_validation(self):
+        def validate(name, content):
+            serializer = UserProfileSerializer(
+                data={"profile_picture": SimpleUploadedFile(name, content)},
+                partial=True,
+            )
+            serializer.is_valid()
+            return serializer.errors.get("profile_picture")
+
+        self.assertIsNone(validate("me.png", image_bytes((64, 64), "PNG")))
+        self.assertEqual(
+            validate("me.png", b"not an image at all"),
+            ["Upload a JPEG, PNG, GIF or WebP image."],
+        )
+        # A valid signature followed by garbage.
+        self.assertEqual(
+            validate("me.png", b"\x89PNG\r\n\x1a\n" + b"\0" * 64),
+            ["The image file is corrupt."],
+        )
+
+
+@mock.patch("users.models.destroy")
+class ProfilePictureRaceTests(TestCase):
+    """
+    A profile loaded before the background job stored the new picture must
+    not write the old one back (and delete the new one) when saved.
+    """
+
+    def setUp(self):
+        self.user = CustomUser.objects.create_user("ada@example.com", "Ada")
+        self.stale = CustomUser.objects.get(pk=self.user.pk)
+        self.stale.profile  # loaded before the picture is stored
+        UserProfile.objects.filter(user=self.user).update(profile_picture="avatars/new")
+
+    def assertPictureKept(self, destroy):
+        profile = UserProfile.objects.get(user=self.user)
+        self.assertEqual(profile.profile_picture.public_id, "avatars/new")
+        destroy.assert_not_called()
+
+    def test_serializer_update(self, destroy):
+        serializer = UserProfileSerializer(
+            self.stale.profile, data={"major": "Physics"}, partial=True
+        )
+        serializer.is_valid(raise_exception=True)
+        serializer.save()
+
+        self.assertPictureKept(destroy)
+        self.assertEqual(UserProfile.objects.get(user=self.user).major, "Physics")
+
+    def test_user_save(self, destroy):
+        self.stale.full_name = "Ada Lovelace"
+        self.stale.save()
+
+        self.assertPictureKept(destroy)
+
+
+@mock.patch("users.views.send_otp_email")
+class ImportedUserSignInTests(TestCase):
+    """
+    Imported students have no password; an OTP must keep signing them in
+    after their first verification until they set one.
+    """
+
+    def setUp(self):
+        cache.clear()
+        import_cohort(
+            [(2, EMPTY_ROW | {"email": "ada@example.com", "full_name": "Ada"})],
+            send_invitations=False,
+        )
+        self.client = APIClient()
+
+    def sign_in_with_otp(self, send_otp_email, **extra):
+        response = self.client.post(reverse("resend_otp"), {"email": "ada@example.com"})
+        self.assertEqual(response.status_code, 200)
+        otp_code = send_otp_email.call_args.args[1]
+        return self.client.post(
+            reverse("verify_otp"),
+            {"email": "ada@example.com", "otp": otp_code, **extra},
+        )
+
+    def test_otp_sign_in_again_after_tokens_expire(self, send_otp_email):
+        response = self.sign_in_with_otp(send_otp_email)
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(CustomUser.objects.get(email="ada@example.com").is_verified)
+
+        expired = RefreshToken(response.json()["refresh"])
+        expired.set_exp(lifetime=-timedelta(seconds=1))
+        response = self.client.post(reverse("token_refresh"), {"refresh": str(expired)})
+        self.assertEqual(response.status_code, 401)
+
+        response = self.sign_in_with_otp(send_otp_email)
+        self.assertEqual(response.status_code, 200)
+        self.assertIn("access", response.json())
+
+    def test_set_password_while_verifying(self, send_otp_email):
+        response = self.sign_in_with_otp(send_otp_email, password="short")
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("password", response.json())
+
+        response = self.sign_in_with_otp(
+            send_otp_email, password="a-long-enough-passphrase"
+        )
+        self.assertEqual(response.status_code, 200)
+        response = self.client.post(
+            reverse("token_obtain_pair"),
+            {"email": "ada@example.com", "password": "a-long-enough-passphrase"},
+        )
+        self.assertEqual(response.status_code, 200)
+
+        # With a password set, the OTP flow is closed again.
+        response = self.client.post(reverse("resend_otp"), {"email": "ada@example.com"})
+        self.assertEqual(response.status_code, 400)
@@ -0,0 +1,159 @@
+# users/throttling.py
+
+import hashlib
+import time
+from abc import ABC, abstractmethod
+from datetime import timedelta
+
+from django.core.cache import cache as default_cache
+from django.db import connection
+from django.utils import timezone
+from rest_framework.settings import api_settings
+from rest_framework.throttling import SimpleRateThrottle
+
+from .cache import cache_is_shared
+from .models import ThrottleCounter
+
+# Throttles for the unauthenticated auth endpoints (register, OTP, login),
+# which trigger Brevo sends and password hashing. Views set `throttle_scope`
+# and the rates come from REST_FRAMEWORK["DEFAULT_THROTTLE_RATES"] under
+# "<scope>_ip" and "<scope>_email"; a scope without a rate isn't throttled.
+#
+# Counters must be seen by every worker, or the real limit is the rate times
+# the number of processes. They live in the cache when it is shared
+# (CACHE_IS_SHARED) and in the ThrottleCounter table otherwise.
+#
+# DRF checks throttles in APIView.initial(), before the handler runs, so a
+# rejected request never reaches the password hasher or the view, and with
+# a shared cache not the database either.
+
+
+class CacheCounters:
+    def __init__(self, cache):
+        self.cache = cache
+
+    def get_many(self, keys):
+        return self.cache.get_many(keys)
+
+    def incr(self, key, timeout):
+        self.cache.add(key, 0, timeout=timeout)
+        try:
+            self.cache.incr(key)
+        except ValueError:  # evicted between add() and incr()
+            self.cache.set(key, 1, timeout=timeout)
+
+
+class DatabaseCounters:
+    """
+    One SELECT to read the counters, one upsert to count a request. Expired
+    rows are removed by the purge_throttle_counters job.
+    """
+
+    def get_many(self, keys):
+        return dict(
+            ThrottleCounter.objects.filter(key__in=keys).values_list("key", "count")
+        )
+
+    def incr(self, key, timeout):
+        table = ThrottleCounter._meta.db_table
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"""
+                INSERT INTO "{table}" (key, count, expires_at) VALUES (%s, 1, %s)
+                ON CONFLICT (key) DO UPDATE SET count = "{table}".count + 1
+                """,
+                [key, timezone.now() + timedelta(seconds=timeout)],
+            )
+
+
+class SlidingWindowThrottle(SimpleRateThrottle, ABC):
+    """
+    Sliding-window counter: the count in the current fixed window plus the
+    previous window's count weighted by how much of it still overlaps the
+    sliding window. Two atomic counters per key instead of DRF's list of
+    timestamps, so concurrent requests can't overwrite each other.
+    Subclasses say what a client is keyed on.
+    """
+
+    cache = default_cache
+    ident_kind = None
+
+    def get_rate(self):
+        # Read at request time (not import time) so settings overrides apply.
+        if not self.scope:
+            return None
+        rates = api_settings.DEFAULT_THROTTLE_RATES
+        return rates.get(f"{self.scope}_{self.ident_kind}")
+
+    def get_counters(self):
+        return CacheCounters(self.cache) if cache_is_shared() else DatabaseCounters()
+
+    def allow_request(self, request, view):
+        self.scope = getattr(view, "throttle_scope", None)
+        self.rate = self.get_rate()
+        if self.rate is None:
+            return True
+        self.num_requests, self.duration = self.parse_rate(self.rate)
+        ident = self.get_ident_value(request)
+        if ident is None:
+            return True
+
+        self.now = self.timer()
+        window = int(self.now // self.duration)
+        key = self.cache_format % {"scope": self.scope, "ident": ident}
+        current_key, previous_key = f"{key}:{window}", f"{key}:{window - 1}"
+        counters = self.get_counters()
+        counts = counters.get_many([current_key, previous_key])
+        elapsed = (self.now % self.duration) / self.duration
+        self.estimate = counts.get(previous_key, 0) * (1 - elapsed) + counts.get(
+            current_key, 0
+        )
+        if self.estimate >= self.num_requests:
+            return self.throttle_failure()
+
+        # Windows are kept for two durations: as current, then as previous.
+        counters.incr(current_key, timeout=self.duration * 2)
+        return True
+
+    def wait(self):
+        # Time until the estimate drops below the limit, assuming no new
+        # requests: the previous window's weight shrinks linearly.
+        remaining = self.duration - (self.now % self.duration)
+        return max(1, min(remaining, self.duration / self.num_requests))
+
+    def timer(self):
+        return time.time()
+
+    @abstractmethod
+    def get_ident_value(self, request):
+        """
+        The client identity to count requests against, or None to let the
+        request through unthrottled.
+        """
+
+
+class IPRateThrottle(SlidingWindowThrottle):
+    ident_kind = "ip"
+    cache_format = "throttle:%(scope)s:ip:%(ident)s"
+
+    def get_ident_value(self, request):
+        return self.get_ident(request)
+
+
+class EmailRateThrottle(SlidingWindowThrottle):
+    """
+    Keyed on the `email` in the request body (hashed, so no addresses end up
+    in the cache). Requests without one are left to the view to reject.
+    """
+
+    ident_kind = "email"
+    cache_format = "throttle:%(scope)s:email:%(ident)s"
+
+    def get_ident_value(self, request):
+        email = request.data.get("email") if hasattr(request.data, "get") else None
+        if not isinstance(email, str) or not email.strip():
+            return None
+        return hashlib.sha256(email.strip().lower().encode()).hexdigest()[:32]
+
+
+AUTH_THROTTLES = [IPRateThrottle, EmailRateThrottle]
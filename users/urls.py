@@ -1,7 +1,16 @@
 # users/urls.py
 from django.urls import path
-from .views import RegisterView, UserProfileView, VerifyOTPView, ResendOTPView
-from rest_framework_simplejwt.views import TokenObtainPairView, TokenRefreshView
+from .views import (
+    RegisterView,
+    UserProfileView,
+    VerifyOTPView,
+    ResendOTPView,
+    ProfilePictureUploadSignatureView,
+    ProfilePictureConfirmView,
+    BulkImportView,
+    LoginView,
+)
+from rest_framework_simplejwt.views import TokenRefreshView
 
 urlpatterns = [
     # Auth flow
@@ -9,9 +18,22 @@ urlpatterns = [
     path("verify-otp/", VerifyOTPView.as_view(), name="verify_otp"),
     path("resend-otp/", ResendOTPView.as_view(), name="resend_otp"),
     path(
-        "login/", TokenObtainPairView.as_view(), name="token_obtain_pair"
+        "login/", LoginView.as_view(), name="token_obtain_pair"
     ),  # Standard login is still available
     path("login/refresh/", TokenRefreshView.as_view(), name="token_refresh"),
     # User data
     path("profile/", UserProfileView.as_view(), name="user_profile"),
+    # Direct-to-Cloudinary profile picture uploads
+    path(
+        "profile/picture/sign/",
+        ProfilePictureUploadSignatureView.as_view(),
+        name="profile_picture_sign",
+    ),
+    path(
+        "profile/picture/confirm/",
+        ProfilePictureConfirmView.as_view(),
+        name="profile_picture_confirm",
+    ),
+    # Staff: partner-university cohort import
+    path("cohorts/import/", BulkImportView.as_view(), name="cohort_import"),
 ]
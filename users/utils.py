@@ -1,9 +1,6 @@
 # users/utils.py
 
-import sib_api_v3_sdk
-from sib_api_v3_sdk.rest import ApiException
 from django.conf import settings
-import os
 
 # --- Complete and robust implementation for sending OTP emails ---
 
@@ -20,6 +17,11 @@ def send_otp_email(user, otp_code):
         print("!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!")
         return
 
+    # The Brevo SDK is large, so it's imported on first send rather than
+    # whenever users/views.py is loaded.
+    import sib_api_v3_sdk
+    from sib_api_v3_sdk.rest import ApiException
+
     # 2. Configure the Brevo API client
     configuration = sib_api_v3_sdk.Configuration()
     configuration.api_key["api-key"] = settings.BREVO_API_KEY
@@ -83,3 +85,63 @@ def send_otp_email(user, otp_code):
         print(f"!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!")
         print(f"!!! Brevo API Exception when calling send_transac_email: {e} !!!")
         print(f"!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!")
+
+
+# Brevo sends one templated email per "message version"; batching keeps a
+# cohort import to a few API calls, well under the per-request limit.
+INVITATION_BATCH_SIZE = 500
+
+
+def send_invitation_emails(users):
+    """
+    Invites users created by a bulk import to verify their email in the app.
+    Sends in batches, one Brevo API call per batch.
+    """
+    if not settings.BREVO_API_KEY:
+        print("!!! WARNING: BREVO_API_KEY is not set. Invitations not sent. !!!")
+        return
+
+    import sib_api_v3_sdk
+    from sib_api_v3_sdk.rest import ApiException
+
+    configuration = sib_api_v3_sdk.Configuration()
+    configuration.api_key["api-key"] = settings.BREVO_API_KEY
+    api_instance = sib_api_v3_sdk.TransactionalEmailsApi(
+        sib_api_v3_sdk.ApiClient(configuration)
+    )
+
+    sender = {"name": "QuivixCareers", "email": "noreply@quivixdigital.com"}
+    html_content = """
+    <!DOCTYPE html>
+    <html lang="en">
+    <body style="font-family: Arial, sans-serif; line-height: 1.6; color: #333;">
+        <p>Hello {{ params.full_name }},</p>
+        <p>Your university has enrolled you on QuivixCareers.</p>
+        <p>To get started, open the app, choose "Verify email" and enter
+        <strong>{{ params.email }}</strong>. We'll send you a one-time code
+        that signs you in, and you can choose a password at the same step.
+        Until you do, a new code signs you in each time.</p>
+        <p>Best Regards,</p>
+        <p>The QuivixCareers Team</p>
+    </body>
+    </html>
+    """
+
+    for start in range(0, len(users), INVITATION_BATCH_SIZE):
+        batch = users[start : start + INVITATION_BATCH_SIZE]
+        email_to_send = sib_api_v3_sdk.SendSmtpEmail(
+            sender=sender,
+            subject="You're invited to QuivixCareers",
+            html_content=html_content,
+            message_versions=[
+                {
+                    "to": [{"email": user.email, "name": user.full_name}],
+                    "params": {"full_name": user.full_name, "email": user.email},
+                }
+                for user in batch
+            ],
+        )
+        try:
+            api_instance.send_transac_email(email_to_send)
+        except ApiException as e:
+            print(f"!!! Brevo API Exception when sending invitations: {e} !!!")
@@ -6,9 +6,20 @@ from rest_framework.views import APIView
 from .serializers import RegisterSerializer, UserSerializer, UserProfileSerializer
 from .models import CustomUser, OTP, UserProfile
 from .utils import send_otp_email
+from django.contrib.auth.password_validation import validate_password
+from django.core.exceptions import ValidationError
 from django.utils import timezone
+from django.utils.decorators import method_decorator
+from django.views.decorators.cache import cache_control
+import csv
+import io
 import random
 from rest_framework_simplejwt.tokens import RefreshToken
+from rest_framework_simplejwt.views import TokenObtainPairView
+from quivix_internships.uploads import UploadConfirmSerializer, sign_upload
+from .bulk_import import import_cohort, read_csv
+from .cache import get_user_version, version_datetime, versioned_condition
+from .throttling import AUTH_THROTTLES
 
 
 class RegisterView(generics.CreateAPIView):
@@ -19,6 +30,8 @@ class RegisterView(generics.CreateAPIView):
 
     serializer_class = RegisterSerializer
     permission_classes = [permissions.AllowAny]
+    throttle_classes = AUTH_THROTTLES
+    throttle_scope = "register"
 
     def perform_create(self, serializer):
         user = serializer.save()
@@ -31,13 +44,26 @@ class RegisterView(generics.CreateAPIView):
         send_otp_email(user, otp_code)
 
 
+def accepts_otp(user):
+    """
+    Whether `user` can sign in with an emailed OTP: unverified accounts, and
+    verified ones without a usable password (students from a cohort import,
+    until they set one), which have no other way to sign in.
+    """
+    return not user.is_verified or not user.has_usable_password()
+
+
 class VerifyOTPView(APIView):
     """
     Verify the OTP sent to the user's email.
     If successful, mark the user as verified and log them in by returning JWT tokens.
+    Users without a usable password may also send `password` to set one, so
+    they can use the regular login from then on.
     """
 
     permission_classes = [permissions.AllowAny]
+    throttle_classes = AUTH_THROTTLES
+    throttle_scope = "verify_otp"
 
     def post(self, request):
         email = request.data.get("email")
@@ -50,7 +76,7 @@ class VerifyOTPView(APIView):
             )
         try:
             user = CustomUser.objects.get(email=email)
-            if user.is_verified:
+            if not accepts_otp(user):
                 return Response(
                     {"error": "This account is already verified."},
                     status=status.HTTP_400_BAD_REQUEST,
@@ -63,6 +89,16 @@ class VerifyOTPView(APIView):
                     {"error": "OTP has expired."}, status=status.HTTP_400_BAD_REQUEST
                 )
 
+            password = request.data.get("password")
+            if password and not user.has_usable_password():
+                try:
+                    validate_password(password, user)
+                except ValidationError as e:
+                    return Response(
+                        {"password": e.messages}, status=status.HTTP_400_BAD_REQUEST
+                    )
+                user.set_password(password)
+
             user.is_verified = True
             user.save()
             OTP.objects.filter(user=user).delete()
@@ -94,10 +130,13 @@ class VerifyOTPView(APIView):
 
 class ResendOTPView(APIView):
     """
-    Resend a new OTP to a user's email if their previous one expired.
+    Resend a new OTP to a user's email if their previous one expired, or to
+    sign in a user who has no password (see accepts_otp).
     """
 
     permission_classes = [permissions.AllowAny]
+    throttle_classes = AUTH_THROTTLES
+    throttle_scope = "resend_otp"
 
     def post(self, request):
         email = request.data.get("email")
@@ -107,7 +146,7 @@ class ResendOTPView(APIView):
             )
         try:
             user = CustomUser.objects.get(email=email)
-            if user.is_verified:
+            if not accepts_otp(user):
                 return Response(
                     {"error": "This account is already verified."},
                     status=status.HTTP_400_BAD_REQUEST,
@@ -129,6 +168,32 @@ class ResendOTPView(APIView):
             )
 
 
+def _profile_version(request):
+    # The per-user version is bumped on every CustomUser/UserProfile save, so
+    # it is a validator for the profile payload that needs no query.
+    if not hasattr(request, "_profile_version"):
+        request._profile_version = get_user_version(request.user.pk)
+    return request._profile_version
+
+
+def profile_etag(request):
+    return f"user-{request.user.pk}-{_profile_version(request)}"
+
+
+def profile_last_modified(request):
+    return version_datetime(_profile_version(request))
+
+
+class LoginView(TokenObtainPairView):
+    """
+    simplejwt's token endpoint with the auth throttles applied, so guessing
+    passwords can't keep the password hasher busy.
+    """
+
+    throttle_classes = AUTH_THROTTLES
+    throttle_scope = "login"
+
+
 class UserProfileView(APIView):
     """
     Handles retrieving and updating the logged-in user's profile information.
@@ -138,7 +203,17 @@ class UserProfileView(APIView):
     permission_classes = [permissions.IsAuthenticated]
     serializer_class = UserSerializer
 
+    @method_decorator(cache_control(private=True, no_cache=True))
+    @method_decorator(
+        versioned_condition(
+            etag_func=profile_etag, last_modified_func=profile_last_modified
+        )
+    )
     def get(self, request):
+        """
+        Answers If-None-Match / If-Modified-Since with 304 Not Modified
+        without serializing (or querying) anything, when the cache is shared.
+        """
         serializer = self.serializer_class(request.user, context={"request": request})
         return Response(serializer.data)
 
@@ -178,3 +253,75 @@ class UserProfileView(APIView):
 
         # The 'raise_exception=True' handles the error case, but this is a fallback.
         return Response(profile_serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+
+
+class ProfilePictureUploadSignatureView(APIView):
+    """
+    Issues signed parameters so the client can upload a profile picture
+    directly to Cloudinary instead of through UserProfileView.put.
+    """
+
+    permission_classes = [permissions.IsAuthenticated]
+
+    def post(self, request):
+        return Response(sign_upload(profile_picture_prefix(request.user)))
+
+
+class ProfilePictureConfirmView(APIView):
+    """
+    Records the public_id of a finished direct upload on the user's profile.
+    """
+
+    permission_classes = [permissions.IsAuthenticated]
+
+    def post(self, request):
+        serializer = UploadConfirmSerializer(
+            data=request.data,
+            context={"prefix": profile_picture_prefix(request.user)},
+        )
+        serializer.is_valid(raise_exception=True)
+
+        profile = request.user.profile
+        profile.profile_picture = serializer.to_image()
+        profile.save(update_fields=["profile_picture"])
+
+        return Response(
+            UserSerializer(request.user, context={"request": request}).data,
+            status=status.HTTP_200_OK,
+        )
+
+
+def profile_picture_prefix(user):
+    return f"profile_pictures/user_{user.pk}"
+
+
+class BulkImportView(APIView):
+    """
+    Staff-only cohort import: multipart upload of a CSV (`file`) plus an
+    optional default `internship` id. The file is streamed, users, profiles
+    and enrollments are bulk-inserted, invitations are queued, and the
+    response reports totals and per-row errors. See users/bulk_import.py.
+    """
+
+    permission_classes = [permissions.IsAdminUser]
+
+    def post(self, request):
+        upload = request.FILES.get("file")
+        if upload is None:
+            return Response(
+                {"error": "A CSV file is required."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        internship_id = request.data.get("internship") or None
+        if internship_id is not None and not str(internship_id).isdigit():
+            return Response(
+                {"error": "internship must be an id."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        lines = io.TextIOWrapper(upload.file, encoding="utf-8-sig", newline="")
+        try:
+            report = import_cohort(read_csv(lines), internship_id=internship_id)
+        except (ValueError, UnicodeDecodeError, csv.Error) as e:
+            return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+        return Response(report, status=status.HTTP_200_OK)